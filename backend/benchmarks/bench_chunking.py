@@ -0,0 +1,69 @@
+"""
+청크 분할 처리량 벤치마크
+
+합성 한국어 페이지로 PDFProcessor.split_text_into_chunks를 코퍼스 크기별로 반복 실행하여
+처리량(문자/초, 페이지/초, 청크/초)을 측정합니다. 반복 중 가장 빠른 값과 중앙값을 함께 기록합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_chunking --pages 100,1000,5000 --repeat 5
+    python -m benchmarks.bench_chunking --chunk-size 800 --chunk-overlap 150 --output chunking.json
+"""
+import argparse
+import statistics
+import time
+
+from config import settings
+from services.pdf_processor import PDFProcessor
+from benchmarks.synthetic_corpus import make_pages, make_report, write_report
+
+def measure(pages: list, chunk_size: int, chunk_overlap: int, repeat: int) -> dict:
+    """같은 페이지 목록을 repeat번 분할하여 소요 시간을 측정합니다."""
+    PDFProcessor.split_text_into_chunks(pages[:10], chunk_size, chunk_overlap)  # 워밍업
+    
+    elapsed = []
+    chunks = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = PDFProcessor.split_text_into_chunks(pages, chunk_size, chunk_overlap)
+        elapsed.append(time.perf_counter() - started)
+    
+    total_chars = sum(len(page["content"]) for page in pages)
+    best = min(elapsed)
+    return {
+        "pages": len(pages),
+        "chars": total_chars,
+        "chunks": len(chunks),
+        "mean_chunk_chars": round(sum(len(chunk["content"]) for chunk in chunks) / max(len(chunks), 1), 1),
+        "best_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(elapsed) * 1000, 3),
+        "chars_per_sec": round(total_chars / best, 1),
+        "pages_per_sec": round(len(pages) / best, 1),
+        "chunks_per_sec": round(len(chunks) / best, 1)
+    }
+
+def main(args):
+    chunk_size = args.chunk_size or settings.CHUNK_SIZE
+    chunk_overlap = args.chunk_overlap if args.chunk_overlap is not None else settings.CHUNK_OVERLAP
+    
+    results = []
+    for page_count in args.pages:
+        pages = make_pages(page_count, args.chars_per_page, args.seed)
+        row = measure(pages, chunk_size, chunk_overlap, args.repeat)
+        results.append(row)
+        print(f"{page_count:>6} 페이지: {row['chunks']:>7}개 청크, best {row['best_ms']:>9.2f} ms, "
+              f"{row['chars_per_sec'] / 1e6:.2f} M문자/s, {row['chunks_per_sec']:.0f} 청크/s")
+    
+    report = make_report("chunking", args, results, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    write_report(report, args.output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="청크 분할 처리량 벤치마크")
+    parser.add_argument("--pages", type=lambda v: [int(x) for x in v.split(",")], default=[100, 1000, 5000],
+                        help="쉼표로 구분된 코퍼스 크기 (페이지 수)")
+    parser.add_argument("--chars-per-page", type=int, default=1800, help="페이지당 문자 수")
+    parser.add_argument("--chunk-size", type=int, default=None, help="청크 크기 (기본값: CHUNK_SIZE)")
+    parser.add_argument("--chunk-overlap", type=int, default=None, help="청크 중복 크기 (기본값: CHUNK_OVERLAP)")
+    parser.add_argument("--repeat", type=int, default=5, help="코퍼스 크기별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=42, help="코퍼스 생성 seed")
+    parser.add_argument("--output", type=str, default=None, help="JSON 결과 파일 경로")
+    main(parser.parse_args())
@@ -0,0 +1,70 @@
+"""
+청크 임베딩 처리량 벤치마크
+
+합성 한국어 청크를 TextEmbedder.encode_texts로 임베딩하여 모델 추론 배치 크기별
+처리량(docs/sec)을 측정합니다. encode_texts는 결과를 캐시하지 않으므로 반복 실행에도
+매번 모델 추론이 수행됩니다. 백엔드는 EMBEDDING_BACKEND 설정을 따릅니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_embedding --texts 1024 --batch-sizes 1,8,32,64,128
+    EMBEDDING_BACKEND=onnx_int8 python -m benchmarks.bench_embedding --output embedding_int8.json
+"""
+import argparse
+import statistics
+import time
+
+from config import settings
+from services.embedder import embedder
+from benchmarks.synthetic_corpus import make_chunks, make_report, write_report
+
+def measure(texts: list, batch_size: int, repeat: int) -> dict:
+    """texts 전체를 batch_size 배치로 repeat번 임베딩하여 처리량을 측정합니다."""
+    embedder.encode_texts(texts[:batch_size], show_progress_bar=False, batch_size=batch_size)  # 워밍업
+    
+    elapsed = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        embeddings = embedder.encode_texts(texts, show_progress_bar=False, batch_size=batch_size)
+        elapsed.append(time.perf_counter() - started)
+        if len(embeddings) != len(texts):
+            raise ValueError("임베딩 수가 입력 텍스트 수와 다릅니다.")
+    
+    best = min(elapsed)
+    return {
+        "batch_size": batch_size,
+        "texts": len(texts),
+        "best_ms": round(best * 1000, 2),
+        "median_ms": round(statistics.median(elapsed) * 1000, 2),
+        "docs_per_sec": round(len(texts) / best, 2),
+        "median_docs_per_sec": round(len(texts) / statistics.median(elapsed), 2)
+    }
+
+def main(args):
+    chars_per_chunk = args.chars_per_chunk or settings.CHUNK_SIZE
+    texts = [chunk["content"] for chunk in make_chunks(args.texts, chars_per_chunk, args.seed)]
+    
+    results = []
+    for batch_size in args.batch_sizes:
+        row = measure(texts, batch_size, args.repeat)
+        results.append(row)
+        print(f"batch {batch_size:>4}: {row['docs_per_sec']:>8.1f} docs/s (best {row['best_ms']:.1f} ms)")
+    
+    report = make_report(
+        "embedding", args, results,
+        model=settings.EMBEDDING_MODEL,
+        backend=settings.EMBEDDING_BACKEND,
+        dimension=embedder.get_embedding_dimension(),
+        chars_per_chunk=chars_per_chunk
+    )
+    write_report(report, args.output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="청크 임베딩 처리량 벤치마크")
+    parser.add_argument("--texts", type=int, default=512, help="임베딩할 합성 청크 수")
+    parser.add_argument("--chars-per-chunk", type=int, default=None, help="청크당 문자 수 (기본값: CHUNK_SIZE)")
+    parser.add_argument("--batch-sizes", type=lambda v: [int(x) for x in v.split(",")], default=[1, 8, 32, 64, 128],
+                        help="쉼표로 구분된 모델 추론 배치 크기")
+    parser.add_argument("--repeat", type=int, default=3, help="배치 크기별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=42, help="코퍼스 생성 seed")
+    parser.add_argument("--output", type=str, default=None, help="JSON 결과 파일 경로")
+    main(parser.parse_args())
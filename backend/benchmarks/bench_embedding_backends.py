@@ -0,0 +1,157 @@
+"""
+임베딩 백엔드 벤치마크 (PyTorch vs ONNX Runtime fp32 vs ONNX Runtime int8)
+
+같은 합성 한국어 코퍼스와 쿼리로 백엔드별 (1) 청크 인코딩 처리량, (2) 단일 쿼리 지연 시간,
+(3) PyTorch 결과 대비 벡터 코사인 유사도와 top-k 검색 결과 일치율을 측정합니다.
+ONNX 모델이 없으면 EMBEDDING_ONNX_DIR에 먼저 변환합니다 (onnxruntime 필요).
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_embedding_backends --chunks 2000 --queries 200
+    python -m benchmarks.bench_embedding_backends --backends torch,onnx_int8 --output backends.json
+"""
+import argparse
+import json
+import time
+import numpy as np
+
+from config import settings
+
+SENTENCES = [
+    "{}학기 출석수업 대체시험은 온라인으로 응시할 수 있습니다.",
+    "등록금 {}차 납부 기간을 놓치면 추가 납부 기간에 납부해야 합니다.",
+    "학기별 최대 {}학점까지 수강신청할 수 있으며 성적 우수자는 추가 신청이 가능합니다.",
+    "졸업논문 대체 과목 {}개를 이수하면 논문 심사를 면제받을 수 있습니다.",
+    "학생증 발급 신청 후 {}일 이내에 지역대학에서 수령하십시오.",
+    "별첨 {}의 서식을 작성하여 학과 사무실로 제출하시기 바랍니다.",
+]
+
+QUERY_TEMPLATES = [
+    "{}학기 대체시험 응시 방법",
+    "등록금 {}차 납부 기간이 언제인가요?",
+    "최대 {}학점 수강신청 기준",
+    "별첨 {} 서식 제출처",
+]
+
+def make_corpus(count: int) -> list:
+    """서로 다른 합성 청크를 생성합니다 (2~4문장)."""
+    corpus = []
+    for i in range(count):
+        sentences = [SENTENCES[(i + j) % len(SENTENCES)].format(i + j) for j in range(2 + i % 3)]
+        corpus.append(" ".join(sentences))
+    return corpus
+
+def make_queries(count: int) -> list:
+    """합성 쿼리를 생성합니다."""
+    return [QUERY_TEMPLATES[i % len(QUERY_TEMPLATES)].format(i) for i in range(count)]
+
+def load_encoder(backend: str):
+    """백엔드별 인코더를 로드합니다."""
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
+    
+    from services.onnx_embedder import OnnxSentenceEncoder
+    return OnnxSentenceEncoder(settings.EMBEDDING_MODEL, quantize=backend == "onnx_int8")
+
+def encode(encoder, texts: list, batch_size: int) -> np.ndarray:
+    """TextEmbedder와 같은 옵션으로 인코딩합니다."""
+    return np.asarray(encoder.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    ), dtype=np.float32)
+
+def measure(encoder, corpus: list, queries: list, batch_size: int) -> dict:
+    """처리량과 쿼리 지연 시간을 측정하고 임베딩을 반환합니다."""
+    encode(encoder, corpus[:batch_size], batch_size)  # 워밍업
+    
+    started = time.perf_counter()
+    corpus_embeddings = encode(encoder, corpus, batch_size)
+    corpus_elapsed = time.perf_counter() - started
+    
+    latencies = []
+    query_embeddings = []
+    for query in queries:
+        started = time.perf_counter()
+        query_embeddings.append(encode(encoder, [query], 1)[0])
+        latencies.append((time.perf_counter() - started) * 1000)
+    
+    return {
+        "chunks_per_sec": round(len(corpus) / corpus_elapsed, 2),
+        "query_p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "query_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "query_p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        "corpus_embeddings": corpus_embeddings,
+        "query_embeddings": np.vstack(query_embeddings)
+    }
+
+def agreement(reference: dict, candidate: dict, top_k: int) -> dict:
+    """기준 백엔드 대비 벡터 유사도와 top-k 검색 결과 일치율을 계산합니다."""
+    cosine = np.sum(reference["corpus_embeddings"] * candidate["corpus_embeddings"], axis=1)
+    
+    def top_ids(result: dict) -> np.ndarray:
+        scores = result["query_embeddings"] @ result["corpus_embeddings"].T
+        return np.argsort(-scores, axis=1)[:, :top_k]
+    
+    reference_ids, candidate_ids = top_ids(reference), top_ids(candidate)
+    overlap = [len(set(a) & set(b)) / top_k for a, b in zip(reference_ids, candidate_ids)]
+    top1 = np.mean(reference_ids[:, 0] == candidate_ids[:, 0])
+    
+    return {
+        "mean_cosine": round(float(cosine.mean()), 6),
+        "min_cosine": round(float(cosine.min()), 6),
+        f"overlap_at_{top_k}": round(float(np.mean(overlap)), 4),
+        "top1_agreement": round(float(top1), 4)
+    }
+
+def main(args):
+    corpus = make_corpus(args.chunks)
+    queries = make_queries(args.queries)
+    
+    results = {}
+    for backend in args.backends:
+        encoder = load_encoder(backend)
+        results[backend] = measure(encoder, corpus, queries, args.batch_size)
+        row = results[backend]
+        print(f"{backend:>10}: {row['chunks_per_sec']:>8.1f} chunks/s, "
+              f"query p50 {row['query_p50_ms']:.2f} ms, p95 {row['query_p95_ms']:.2f} ms")
+    
+    reference = results.get("torch") or results[args.backends[0]]
+    report_rows = []
+    for backend, row in results.items():
+        report_row = {
+            "backend": backend,
+            **{key: value for key, value in row.items() if not key.endswith("_embeddings")}
+        }
+        if row is not reference:
+            report_row["agreement"] = agreement(reference, row, args.top_k)
+            print(f"{backend:>10}: 기준 대비 {report_row['agreement']}")
+        report_rows.append(report_row)
+    
+    report = {
+        "benchmark": "embedding_backends",
+        "model": settings.EMBEDDING_MODEL,
+        "chunks": args.chunks,
+        "queries": args.queries,
+        "batch_size": args.batch_size,
+        "onnx_threads": settings.EMBEDDING_ONNX_THREADS,
+        "results": report_rows
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--backends", type=lambda v: v.split(","), default=["torch", "onnx", "onnx_int8"],
+                        help="쉼표로 구분된 백엔드 목록 (torch, onnx, onnx_int8)")
+    parser.add_argument("--chunks", type=int, default=2000, help="인코딩할 합성 청크 수")
+    parser.add_argument("--queries", type=int, default=200, help="지연 시간/일치율 측정용 쿼리 수")
+    parser.add_argument("--batch-size", type=int, default=32, help="청크 인코딩 배치 크기")
+    parser.add_argument("--top-k", type=int, default=5, help="검색 결과 일치율 기준 k")
+    parser.add_argument("--output", type=str, default=None, help="JSON 결과 파일 경로")
+    main(parser.parse_args())
@@ -0,0 +1,124 @@
+"""
+쿼리 임베딩 마이크로 배처 벤치마크
+
+동시 요청 수별로 (1) 요청마다 encode_single_text를 워커 스레드에서 호출하는 방식과
+(2) EmbeddingBatcher를 거치는 방식의 처리량(QPS)과 지연 시간을 비교합니다.
+캐시 효과를 배제하기 위해 모든 쿼리는 서로 다른 텍스트로 생성합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_embedding_batcher --requests 256 --concurrency 1,4,16,64
+"""
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+
+from config import settings
+from services.embedder import embedder
+from services.embedding_batcher import EmbeddingBatcher
+
+QUERY_TEMPLATES = [
+    "{}학기 시험 일정은 언제인가요?",
+    "등록금 납부 기간 {}차는 언제까지인가요?",
+    "{}번 과목 출석수업 대체시험 신청 방법",
+    "졸업 요건 중 {}학점 이수 기준이 궁금합니다",
+]
+
+def make_queries(count: int, offset: int) -> list:
+    """캐시에 걸리지 않도록 서로 다른 쿼리를 생성합니다."""
+    return [QUERY_TEMPLATES[i % len(QUERY_TEMPLATES)].format(offset + i) for i in range(count)]
+
+async def run_direct(queries: list, concurrency: int) -> list:
+    """요청마다 개별 인코딩 (배치 크기 1)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    
+    async def one(query: str):
+        async with semaphore:
+            started = time.perf_counter()
+            await asyncio.to_thread(embedder.encode_texts, [query], False)
+            latencies.append(time.perf_counter() - started)
+    
+    await asyncio.gather(*(one(query) for query in queries))
+    return latencies
+
+async def run_batched(queries: list, concurrency: int, batcher: EmbeddingBatcher) -> list:
+    """마이크로 배처를 통한 인코딩"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    
+    async def one(query: str):
+        async with semaphore:
+            started = time.perf_counter()
+            await batcher.encode(query)
+            latencies.append(time.perf_counter() - started)
+    
+    await asyncio.gather(*(one(query) for query in queries))
+    return latencies
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    """지연 시간 목록을 요약합니다."""
+    values = np.array(latencies) * 1000
+    return {
+        "qps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2)
+    }
+
+async def main(args):
+    settings.EMBEDDING_CACHE_SIZE = 0  # 캐시 비활성화
+    settings.EMBEDDING_BATCHING_ENABLED = True
+    batcher = EmbeddingBatcher(max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    
+    # 모델 워밍업
+    embedder.encode_texts(make_queries(8, -8), False)
+    
+    results = []
+    offset = 0
+    for concurrency in args.concurrency:
+        row = {"concurrency": concurrency}
+        
+        for mode in ("direct", "batched"):
+            queries = make_queries(args.requests, offset)
+            offset += args.requests
+            
+            started = time.perf_counter()
+            if mode == "direct":
+                latencies = await run_direct(queries, concurrency)
+            else:
+                latencies = await run_batched(queries, concurrency, batcher)
+            row[mode] = summarize(latencies, time.perf_counter() - started)
+        
+        row["speedup"] = round(row["batched"]["qps"] / row["direct"]["qps"], 2)
+        results.append(row)
+        print(f"동시성 {concurrency:>3}: direct {row['direct']['qps']:>8.1f} QPS, "
+              f"batched {row['batched']['qps']:>8.1f} QPS (x{row['speedup']})")
+    
+    await batcher.aclose()
+    
+    report = {
+        "benchmark": "embedding_batcher",
+        "model": settings.EMBEDDING_MODEL,
+        "requests_per_level": args.requests,
+        "max_batch_size": batcher.max_batch_size,
+        "max_wait_ms": batcher.max_wait_ms,
+        "batcher": batcher.get_statistics(),
+        "results": results
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="쿼리 임베딩 마이크로 배처 벤치마크")
+    parser.add_argument("--requests", type=int, default=256, help="동시성 단계별 요청 수")
+    parser.add_argument("--concurrency", type=lambda v: [int(x) for x in v.split(",")], default=[1, 4, 16, 64],
+                        help="쉼표로 구분된 동시 요청 수 목록")
+    parser.add_argument("--max-batch-size", type=int, default=None, help="배처 최대 배치 크기")
+    parser.add_argument("--max-wait-ms", type=float, default=None, help="배처 최대 대기 시간 (ms)")
+    parser.add_argument("--output", type=str, default=None, help="JSON 결과 파일 경로")
+    asyncio.run(main(parser.parse_args()))
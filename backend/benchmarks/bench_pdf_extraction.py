@@ -0,0 +1,116 @@
+"""
+PDF 페이지 텍스트 추출 벤치마크 (직렬 vs 병렬)
+
+PDFProcessor.extract_text_from_pdf를 워커 수별로 실행하여 처리량(pages/sec)을 비교하고,
+병렬 결과가 직렬 결과와 페이지 순서까지 동일한지 검증합니다.
+PDF를 지정하지 않으면 한국어 텍스트로 채운 합성 PDF를 생성해 사용합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_pdf_extraction --pages 400 --workers 1,2,4,8
+    python -m benchmarks.bench_pdf_extraction --pdf ./handbook.pdf
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from config import settings
+from services.pdf_processor import PDFProcessor
+
+SAMPLE_LINES = [
+    "2025학년도 2학기 출석수업 및 대체시험 일정 안내",
+    "등록금 납부 기간 내 미납 시 제적 처리될 수 있으니 유의하시기 바랍니다.",
+    "학기별 최대 신청 가능 학점은 18학점이며, 성적 우수자는 21학점까지 신청할 수 있습니다.",
+    "졸업을 위해서는 전공 학점과 교양 학점을 포함하여 총 130학점 이상을 이수해야 합니다.",
+    "자세한 사항은 별첨 자료를 참고하거나 학과 사무실로 문의하십시오.",
+]
+
+def make_synthetic_pdf(path: Path, pages: int, lines_per_page: int = 40):
+    """한국어 텍스트로 채운 합성 PDF를 생성합니다."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        text = "\n".join(
+            f"{page_num + 1}-{line_num + 1}. {SAMPLE_LINES[(page_num + line_num) % len(SAMPLE_LINES)]}"
+            for line_num in range(lines_per_page)
+        )
+        page.insert_text((36, 36), text, fontname="korea", fontsize=8)
+    doc.save(path)
+    doc.close()
+
+def measure(pdf_path: Path, workers: int, repeat: int):
+    """지정한 워커 수로 추출을 반복 실행하여 최단 시간과 결과를 반환합니다."""
+    best = float("inf")
+    pages_content = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        pages_content = PDFProcessor.extract_text_from_pdf(pdf_path, workers=workers)
+        best = min(best, time.perf_counter() - started)
+    return best, pages_content
+
+def main(args):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.pdf:
+            pdf_path = Path(args.pdf)
+        else:
+            pdf_path = Path(temp_dir) / "synthetic.pdf"
+            make_synthetic_pdf(pdf_path, args.pages)
+        
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
+        
+        # 작은 PDF에서도 병렬 경로를 타도록 임계값 해제
+        settings.PDF_PARALLEL_MIN_PAGES = 0
+        # 공유 풀은 한 번만 생성되므로 측정할 최대 워커 수로 크기 지정
+        settings.PDF_EXTRACT_WORKERS = max(args.workers)
+        
+        results = []
+        baseline_time, baseline_content = None, None
+        for workers in args.workers:
+            # 프로세스 풀 생성 비용은 워밍업으로 제외
+            if workers > 1:
+                PDFProcessor.extract_text_from_pdf(pdf_path, workers=workers)
+            
+            elapsed, pages_content = measure(pdf_path, workers, args.repeat)
+            if baseline_content is None:
+                baseline_time, baseline_content = elapsed, pages_content
+            
+            row = {
+                "workers": workers,
+                "seconds": round(elapsed, 4),
+                "pages_per_sec": round(page_count / elapsed, 1),
+                "speedup": round(baseline_time / elapsed, 2),
+                "identical_output": pages_content == baseline_content
+            }
+            results.append(row)
+            print(f"워커 {workers:>2}: {row['pages_per_sec']:>8.1f} pages/sec "
+                  f"(x{row['speedup']}, 동일 결과: {row['identical_output']})")
+        
+        PDFProcessor.shutdown_pool()
+    
+    report = {
+        "benchmark": "pdf_extraction",
+        "pdf": str(args.pdf) if args.pdf else "synthetic",
+        "pages": page_count,
+        "cpu_count": os.cpu_count(),
+        "results": results
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF 페이지 텍스트 추출 벤치마크")
+    parser.add_argument("--pdf", type=str, default=None, help="측정할 PDF 경로 (미지정 시 합성 PDF)")
+    parser.add_argument("--pages", type=int, default=400, help="합성 PDF 페이지 수")
+    parser.add_argument("--workers", type=lambda v: [int(x) for x in v.split(",")], default=[1, 2, 4, 8],
+                        help="쉼표로 구분된 워커 수 목록 (첫 값이 기준)")
+    parser.add_argument("--repeat", type=int, default=3, help="설정별 반복 횟수 (최단 시간 사용)")
+    parser.add_argument("--output", type=str, default=None, help="JSON 결과 파일 경로")
+    main(parser.parse_args())
@@ -0,0 +1,187 @@
+"""
+벡터 검색 지연 시간 및 인덱스 로드 시간 벤치마크
+
+합성 문서(무작위 단위 벡터 + 합성 한국어 청크)를 실제 수집 경로(VectorStoreManager,
+문서 카탈로그)로 하나씩 추가하면서, 문서 수 체크포인트마다 다음을 측정합니다.
+
+- VectorStoreManager.search_all_documents 지연 시간 (검색 방식별)
+- VectorStore.search 지연 시간 (문서 하나)
+- VectorStore.load_index 시간 (힙 / mmap)
+- 통합 레지스트리 콜드 로드 시간 (디스크의 모든 문서)
+
+실제 데이터와 섞이지 않도록 config를 불러오기 전에 임시 데이터 디렉터리를 지정합니다
+(BENCH_DATA_DIR 환경 변수로 경로를 정하면 실행 후에도 남겨 둡니다).
+인덱스 종류 등은 평소처럼 VECTOR_INDEX_TYPE, VECTOR_INDEX_MMAP 환경 변수로 바꿀 수 있습니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_search --documents 1,10,50 --chunks-per-doc 200
+    VECTOR_INDEX_TYPE=hnsw python -m benchmarks.bench_search --modes dense --output search_hnsw.json
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+KEEP_DATA_DIR = bool(os.environ.get("BENCH_DATA_DIR"))
+BENCH_DATA_DIR = Path(os.environ.get("BENCH_DATA_DIR") or tempfile.mkdtemp(prefix="asknou-bench-"))
+BENCH_DATA_DIR.mkdir(parents=True, exist_ok=True)
+os.environ["DATA_DIR"] = str(BENCH_DATA_DIR)
+os.environ["PDF_DIR"] = str(BENCH_DATA_DIR / "pdfs")
+os.environ["VECTORSTORE_DIR"] = str(BENCH_DATA_DIR / "vectorstore")
+os.environ["DOCUMENT_CATALOG_PATH"] = str(BENCH_DATA_DIR / "documents.sqlite3")
+
+from config import settings
+from utils.file_utils import FileManager
+from utils.document_catalog import document_catalog
+from services.vector_store import VectorStore, VectorStoreManager, VectorStoreRegistry, vector_registry
+from benchmarks.synthetic_corpus import make_chunks, make_queries, latency_summary, make_report, write_report
+
+def unit_vectors(rng: np.random.Generator, count: int, dimension: int) -> np.ndarray:
+    """무작위 단위 벡터를 생성합니다."""
+    vectors = rng.standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def add_document(index: int, rng: np.random.Generator, args) -> tuple:
+    """합성 문서 하나를 수집 경로와 같은 방식으로 인덱싱하고 카탈로그에 등록합니다."""
+    doc_id = FileManager.generate_doc_id()
+    filename = f"bench_{index:04d}.pdf"
+    chunks = make_chunks(args.chunks_per_doc, args.chars_per_chunk, seed=args.seed + index)
+    vectors = unit_vectors(rng, len(chunks), args.dimension)
+    
+    document_catalog.add(doc_id, filename, 0)
+    vector_store = VectorStoreManager.create_document_index(doc_id, vectors, chunks, filename)
+    document_catalog.mark_indexed(
+        doc_id,
+        chunks[-1]["page"],
+        len(chunks),
+        vector_count=len(chunks),
+        dimension=int(vector_store.dimension),
+        disk_bytes=FileManager.get_document_disk_bytes(doc_id)
+    )
+    return doc_id, vectors
+
+def make_query_embeddings(rng: np.random.Generator, corpus: np.ndarray, count: int, noise: float) -> np.ndarray:
+    """코퍼스 벡터 근처의 쿼리 벡터를 생성합니다 (실제 질문처럼 가까운 청크가 존재)."""
+    base = corpus[rng.integers(0, len(corpus), count)]
+    queries = base + noise * rng.standard_normal(base.shape).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+def time_calls(function, inputs: list) -> dict:
+    """입력마다 함수를 호출하여 지연 시간을 요약합니다 (첫 호출은 워밍업)."""
+    function(inputs[0])
+    latencies = []
+    for value in inputs:
+        started = time.perf_counter()
+        function(value)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latency_summary(latencies)
+
+def measure_load(doc_ids: list, sample: int) -> dict:
+    """문서별 인덱스 로드 시간과 통합 레지스트리 콜드 로드 시간을 측정합니다."""
+    load_ms = {"heap": [], "mmap": []}
+    for doc_id in doc_ids[:sample]:
+        for mode in load_ms:
+            vector_store = VectorStore(doc_id)
+            started = time.perf_counter()
+            if not vector_store.load_index(mmap=mode == "mmap"):
+                raise RuntimeError(f"인덱스 로드 실패: {doc_id}")
+            load_ms[mode].append((time.perf_counter() - started) * 1000)
+            vector_store.chunks.close()
+    
+    registry = VectorStoreRegistry()
+    started = time.perf_counter()
+    registry.index_info()  # 최초 사용 시 디스크의 모든 문서를 로드
+    registry_ms = (time.perf_counter() - started) * 1000
+    registry.invalidate()
+    
+    return {
+        "document_load_heap_ms": round(float(np.mean(load_ms["heap"])), 3),
+        "document_load_mmap_ms": round(float(np.mean(load_ms["mmap"])), 3),
+        "registry_cold_load_ms": round(registry_ms, 3)
+    }
+
+def measure_checkpoint(doc_ids: list, corpus: np.ndarray, rng: np.random.Generator, args) -> dict:
+    """현재 코퍼스에서 검색 지연 시간과 로드 시간을 측정합니다."""
+    query_embeddings = make_query_embeddings(rng, corpus, args.queries, args.noise)
+    query_texts = make_queries(args.queries, seed=args.seed)
+    inputs = list(zip(query_embeddings, query_texts))
+    
+    row = {
+        "documents": len(doc_ids),
+        "vectors": vector_registry.total_vectors,
+        "index_type": vector_registry.index_info()["active_type"],
+        "search_all_documents": {}
+    }
+    
+    for mode in args.modes:
+        row["search_all_documents"][mode] = time_calls(
+            lambda query: VectorStoreManager.search_all_documents(
+                query[0], args.top_k, query_text=query[1], retrieval_mode=mode
+            ),
+            inputs
+        )
+    
+    vector_store = VectorStore(doc_ids[-1])
+    vector_store.load_index(mmap=False)
+    row["vector_store_search"] = time_calls(lambda query: vector_store.search(query[0], args.top_k), inputs)
+    vector_store.chunks.close()
+    
+    row.update(measure_load(doc_ids, args.load_sample))
+    return row
+
+def main(args):
+    print(f"벤치마크 데이터 디렉터리: {BENCH_DATA_DIR}")
+    rng = np.random.default_rng(args.seed)
+    doc_ids = []
+    vectors = []
+    results = []
+    
+    try:
+        for checkpoint in sorted(args.documents):
+            while len(doc_ids) < checkpoint:
+                doc_id, doc_vectors = add_document(len(doc_ids), rng, args)
+                doc_ids.append(doc_id)
+                vectors.append(doc_vectors)
+            
+            row = measure_checkpoint(doc_ids, np.vstack(vectors), rng, args)
+            results.append(row)
+            summary = ", ".join(
+                f"{mode} p50 {stats['p50_ms']:.2f} ms / p99 {stats['p99_ms']:.2f} ms"
+                for mode, stats in row["search_all_documents"].items()
+            )
+            print(f"{row['documents']:>5}개 문서 ({row['vectors']}개 벡터): {summary}, "
+                  f"레지스트리 로드 {row['registry_cold_load_ms']:.1f} ms")
+        
+        report = make_report(
+            "search", args, results,
+            index_type=settings.VECTOR_INDEX_TYPE,
+            vector_index_mmap=settings.VECTOR_INDEX_MMAP
+        )
+        write_report(report, args.output)
+    
+    finally:
+        vector_registry.invalidate()
+        document_catalog.close()
+        if not KEEP_DATA_DIR:
+            shutil.rmtree(BENCH_DATA_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벡터 검색 지연 시간 및 인덱스 로드 시간 벤치마크")
+    parser.add_argument("--documents", type=lambda v: [int(x) for x in v.split(",")], default=[1, 10, 50],
+                        help="쉼표로 구분된 문서 수 체크포인트")
+    parser.add_argument("--chunks-per-doc", type=int, default=200, help="문서당 청크(벡터) 수")
+    parser.add_argument("--chars-per-chunk", type=int, default=500, help="청크당 문자 수")
+    parser.add_argument("--dimension", type=int, default=768, help="벡터 차원")
+    parser.add_argument("--queries", type=int, default=200, help="체크포인트별 쿼리 수")
+    parser.add_argument("--top-k", type=int, default=5, help="검색 결과 수")
+    parser.add_argument("--modes", type=lambda v: v.split(","), default=["dense", "hybrid"],
+                        help="쉼표로 구분된 검색 방식 (dense, sparse, hybrid)")
+    parser.add_argument("--noise", type=float, default=0.05, help="쿼리 벡터에 더할 잡음 크기")
+    parser.add_argument("--load-sample", type=int, default=10, help="로드 시간을 잴 문서 수")
+    parser.add_argument("--seed", type=int, default=42, help="코퍼스 생성 seed")
+    parser.add_argument("--output", type=str, default=None, help="JSON 결과 파일 경로")
+    main(parser.parse_args())
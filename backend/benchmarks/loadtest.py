@@ -0,0 +1,235 @@
+"""
+백엔드 종단 간 부하 테스트
+
+실행 중인 백엔드의 /ask/, /ask/stream, /ask/search, /upload/pdf에 동시 요청을 보내
+엔드포인트와 동시 사용자 수별로 처리량(req/s)과 지연 시간 p50/p95/p99를 측정합니다.
+Gemini 호출은 benchmarks.mock_gemini 서버로 대체하여 실제 API 비용 없이 생성 대기 시간을 재현합니다.
+
+- ask: 응답의 usage로 답변 캐시 적중 수를 함께 기록합니다 (전체 경로를 재려면 ANSWER_CACHE_ENABLED=False)
+- stream: 첫 token 이벤트까지의 시간(TTFT)을 따로 기록합니다
+- upload: 요청마다 내용이 다른 합성 PDF를 올리며, --wait-ingest면 수집 완료까지의 시간도 기록합니다
+  (업로드된 문서가 쌓이므로 임시 DATA_DIR로 띄운 백엔드에서 실행하십시오)
+
+실행 (backend 디렉터리에서, 각각 다른 터미널):
+    python -m benchmarks.mock_gemini --port 8090 --latency-ms 800 --tokens-per-sec 80
+    GEMINI_USE_OAUTH=False GEMINI_API_BASE=http://127.0.0.1:8090/v1 ANSWER_CACHE_ENABLED=False \\
+        uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.loadtest --endpoints ask,search --concurrency 1,8,32 --requests 200
+    python -m benchmarks.loadtest --endpoints upload --concurrency 1,4 --requests 20 --wait-ingest
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from benchmarks.synthetic_corpus import make_queries, make_text, latency_summary, make_report, write_report
+
+ENDPOINTS = ("ask", "stream", "search", "upload")
+
+def make_questions(count: int, seed: int) -> list:
+    """요청마다 다른 질문을 만듭니다 (같은 문장 반복으로 인한 캐시 적중 완화)."""
+    return [f"{query} ({i + 1}번째 문의)" for i, query in enumerate(make_queries(count, seed))]
+
+def make_pdfs(count: int, pages: int, seed: int) -> list:
+    """업로드용 합성 PDF를 미리 만듭니다 (중복 업로드로 처리되지 않도록 내용을 모두 다르게)."""
+    import fitz  # PyMuPDF
+    
+    rng = random.Random(seed)
+    pdfs = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i in range(count):
+            path = Path(temp_dir) / f"loadtest_{i}.pdf"
+            doc = fitz.open()
+            for page_num in range(pages):
+                page = doc.new_page()
+                text = f"부하 테스트 문서 {seed}-{i} / {page_num + 1}쪽\n" + make_text(rng, 1200)
+                page.insert_textbox(fitz.Rect(36, 36, 559, 806), text, fontname="korea", fontsize=9)
+            doc.save(path)
+            doc.close()
+            pdfs.append((path.name, path.read_bytes()))
+    return pdfs
+
+class LoadTester:
+    """엔드포인트별 요청을 보내고 결과를 기록하는 클래스"""
+    
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+    
+    def _question_body(self, question: str) -> dict:
+        body = {"question": question}
+        if self.args.top_k:
+            body["top_k"] = self.args.top_k
+        if self.args.retrieval_mode:
+            body["retrieval_mode"] = self.args.retrieval_mode
+        return body
+    
+    async def ask(self, question: str) -> dict:
+        """/ask/ 요청 (답변 캐시 적중 여부 포함)"""
+        response = await self.client.post("/ask/", json=self._question_body(question))
+        result = {"status": response.status_code, "ok": False}
+        if response.status_code == 200:
+            body = response.json()
+            usage = body.get("usage") or {}
+            result["ok"] = not body.get("error")
+            stages = usage.get("stages_ms", {})
+            result["cache_hit"] = "cache_lookup" in stages and "search" not in stages  # 캐시 적중 시 검색 단계 없음
+        return result
+    
+    async def stream(self, question: str) -> dict:
+        """/ask/stream 요청 (첫 token 이벤트까지의 시간 포함)"""
+        started = time.perf_counter()
+        result = {"status": 0, "ok": False}
+        async with self.client.stream("POST", "/ask/stream", json=self._question_body(question)) as response:
+            result["status"] = response.status_code
+            if response.status_code != 200:
+                await response.aread()
+                return result
+            
+            async for line in response.aiter_lines():
+                if line.startswith("event: token") and "ttft_ms" not in result:
+                    result["ttft_ms"] = (time.perf_counter() - started) * 1000
+                elif line.startswith("event: done"):
+                    result["ok"] = True
+                elif line.startswith("event: error"):
+                    result["ok"] = False
+        return result
+    
+    async def search(self, question: str) -> dict:
+        """/ask/search 요청"""
+        response = await self.client.post("/ask/search", json=self._question_body(question))
+        return {"status": response.status_code, "ok": response.status_code == 200}
+    
+    async def upload(self, pdf: tuple) -> dict:
+        """/upload/pdf 요청 (--wait-ingest면 수집 완료까지 상태를 조회)"""
+        filename, content = pdf
+        started = time.perf_counter()
+        response = await self.client.post("/upload/pdf", files={"file": (filename, content, "application/pdf")})
+        result = {"status": response.status_code, "ok": False}
+        if response.status_code != 200:
+            return result
+        
+        body = response.json()
+        result["ok"] = bool(body.get("success"))
+        if not (self.args.wait_ingest and result["ok"]):
+            return result
+        
+        # 상태 조회가 실패하거나 --timeout 안에 끝나지 않으면 실패로 집계
+        deadline = started + self.args.timeout
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.args.poll_interval)
+            status_response = await self.client.get(body["status_url"])
+            if status_response.status_code != 200:
+                return {"status": status_response.status_code, "ok": False}
+            stage = (status_response.json().get("ingestion") or {}).get("stage")
+            if stage in ("completed", "failed"):
+                result["ok"] = stage == "completed"
+                result["ingest_ms"] = (time.perf_counter() - started) * 1000
+                return result
+        
+        return {"status": "IngestTimeout", "ok": False}
+    
+    async def run(self, endpoint: str, inputs: list, concurrency: int) -> dict:
+        """concurrency명의 가상 사용자가 inputs를 나누어 요청하고 결과를 요약합니다."""
+        request = getattr(self, endpoint)
+        pending = iter(inputs)
+        records = []
+        
+        async def user():
+            for value in pending:
+                started = time.perf_counter()
+                try:
+                    result = await request(value)
+                except httpx.HTTPError as e:
+                    result = {"status": type(e).__name__, "ok": False}
+                result["latency_ms"] = (time.perf_counter() - started) * 1000
+                records.append(result)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        
+        succeeded = [record for record in records if record["ok"]]
+        row = {
+            "endpoint": endpoint,
+            "concurrency": concurrency,
+            "requests": len(records),
+            "succeeded": len(succeeded),
+            "failed": len(records) - len(succeeded),
+            "status_codes": dict(Counter(str(record["status"]) for record in records)),
+            "elapsed_sec": round(elapsed, 3),
+            "throughput_rps": round(len(succeeded) / elapsed, 3),
+            "latency": latency_summary([record["latency_ms"] for record in succeeded]) if succeeded else None
+        }
+        if endpoint == "ask":
+            row["cache_hits"] = sum(1 for record in succeeded if record.get("cache_hit"))
+        if endpoint == "stream":
+            ttft = [record["ttft_ms"] for record in succeeded if "ttft_ms" in record]
+            row["ttft"] = latency_summary(ttft) if ttft else None
+        if endpoint == "upload" and self.args.wait_ingest:
+            ingest = [record["ingest_ms"] for record in succeeded if "ingest_ms" in record]
+            row["ingest"] = latency_summary(ingest) if ingest else None
+        return row
+
+def make_inputs(endpoint: str, count: int, seed: int, args) -> list:
+    """엔드포인트별 요청 입력을 만듭니다."""
+    if endpoint == "upload":
+        return make_pdfs(count, args.upload_pages, seed)
+    return make_questions(count, seed)
+
+async def run_all(args) -> list:
+    max_concurrency = max(args.concurrency)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        health = await client.get("/health")
+        print(f"백엔드 상태: {health.status_code} {health.json().get('status')}")
+        
+        tester = LoadTester(client, args)
+        results = []
+        for endpoint in args.endpoints:
+            if args.warmup:
+                await tester.run(endpoint, make_inputs(endpoint, args.warmup, args.seed - 1, args), 1)
+            
+            for level, concurrency in enumerate(args.concurrency):
+                # 레벨마다 다른 입력을 사용 (앞 레벨의 캐시/중복 업로드 영향 배제)
+                inputs = make_inputs(endpoint, args.requests, args.seed + level * 1000, args)
+                row = await tester.run(endpoint, inputs, concurrency)
+                results.append(row)
+                
+                latency = row["latency"] or {}
+                print(f"{endpoint:>7} x{concurrency:<4} {row['throughput_rps']:>8.2f} req/s, "
+                      f"p50 {latency.get('p50_ms', 0):>9.1f} ms, p95 {latency.get('p95_ms', 0):>9.1f} ms, "
+                      f"p99 {latency.get('p99_ms', 0):>9.1f} ms, 실패 {row['failed']}")
+        return results
+
+def main(args):
+    unknown = [endpoint for endpoint in args.endpoints if endpoint not in ENDPOINTS]
+    if unknown:
+        raise SystemExit(f"지원하지 않는 엔드포인트입니다: {', '.join(unknown)} (가능: {', '.join(ENDPOINTS)})")
+    
+    results = asyncio.run(run_all(args))
+    write_report(make_report("loadtest", args, results), args.output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="백엔드 종단 간 부하 테스트")
+    parser.add_argument("--base-url", type=str, default="http://127.0.0.1:8000", help="백엔드 주소")
+    parser.add_argument("--endpoints", type=lambda v: v.split(","), default=["ask", "search"],
+                        help="쉼표로 구분된 엔드포인트 (ask, stream, search, upload)")
+    parser.add_argument("--concurrency", type=lambda v: [int(x) for x in v.split(",")], default=[1, 8, 32],
+                        help="쉼표로 구분된 동시 사용자 수")
+    parser.add_argument("--requests", type=int, default=100, help="동시 사용자 수별 요청 수")
+    parser.add_argument("--warmup", type=int, default=3, help="엔드포인트별 워밍업 요청 수")
+    parser.add_argument("--top-k", type=int, default=None, help="검색 결과 수 (기본값: 서버 설정)")
+    parser.add_argument("--retrieval-mode", type=str, default=None, help="검색 방식 (dense, sparse, hybrid)")
+    parser.add_argument("--upload-pages", type=int, default=5, help="업로드용 합성 PDF 페이지 수")
+    parser.add_argument("--wait-ingest", action="store_true", help="업로드 후 수집 완료까지 대기하여 시간 측정")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="수집 상태 조회 간격 (초)")
+    parser.add_argument("--timeout", type=float, default=120, help="요청 제한 시간 (초, --wait-ingest의 수집 대기 시간에도 적용)")
+    parser.add_argument("--seed", type=int, default=42, help="입력 생성 seed")
+    parser.add_argument("--output", type=str, default=None, help="JSON 결과 파일 경로")
+    main(parser.parse_args())
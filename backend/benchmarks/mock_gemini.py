@@ -0,0 +1,228 @@
+"""
+부하 테스트용 로컬 Gemini mock 서버
+
+Gemini REST API의 generateContent / streamGenerateContent(SSE) 응답 형식을 흉내 내며,
+첫 토큰까지의 지연 시간과 초당 생성 토큰 수를 설정해 실제 모델 호출과 비슷한 대기 시간을
+만듭니다. 응답에는 usageMetadata(토큰 사용량)도 포함됩니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.mock_gemini --port 8090 --latency-ms 800 --tokens-per-sec 80
+
+백엔드는 OAuth를 끄고 mock 서버를 바라보도록 실행합니다:
+    GEMINI_USE_OAUTH=False GEMINI_API_BASE=http://127.0.0.1:8090/v1 uvicorn main:app --port 8000
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+from typing import Dict, Any, List
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from services.context_builder import ContextBuilder
+
+ANSWER_TOKENS = [
+    "## ", "안내 ", "사항\n\n", "방송통신대학교 ", "학사 ", "일정에 ", "따르면 ", "**신청 ", "기간**은 ",
+    "학기 ", "시작 ", "전에 ", "공지됩니다. ", "자세한 ", "내용은 ", "`학사 공지` ", "게시판에서 ",
+    "확인하실 ", "수 ", "있습니다.\n\n", "- ", "지역대학 ", "학생지원팀에 ", "문의하세요.\n"
+]
+
+class MockGemini:
+    """설정한 지연 시간과 토큰 생성 속도로 Gemini 응답을 흉내 내는 클래스"""
+    
+    def __init__(
+        self,
+        latency_ms: float = 800,
+        jitter_ms: float = 200,
+        output_tokens: int = 300,
+        tokens_per_sec: float = 80,
+        chunk_tokens: int = 10,
+        error_rate: float = 0.0,
+        seed: int = 42
+    ):
+        """
+        mock 서버 동작을 설정합니다.
+        
+        Args:
+            latency_ms: 첫 토큰까지의 평균 지연 시간
+            jitter_ms: 지연 시간의 무작위 편차 (±)
+            output_tokens: 응답 하나의 생성 토큰 수
+            tokens_per_sec: 초당 생성 토큰 수
+            chunk_tokens: 스트리밍 이벤트 하나에 담을 토큰 수
+            error_rate: 503(과부하) 오류를 반환할 비율
+            seed: 지연 시간/오류 난수 seed
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.output_tokens = output_tokens
+        self.tokens_per_sec = tokens_per_sec
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.statistics = {"generate": 0, "stream": 0, "errors": 0, "active": 0, "max_active": 0}
+    
+    def _first_token_delay(self) -> float:
+        """첫 토큰까지의 지연 시간(초)을 뽑습니다."""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+    
+    def _should_fail(self) -> bool:
+        """이번 요청에 오류를 낼지 결정합니다."""
+        with self._lock:
+            return self._random.random() < self.error_rate
+    
+    def _track(self, key: str, delta: int):
+        """요청 수와 동시 처리 수를 집계합니다."""
+        with self._lock:
+            if delta > 0:
+                self.statistics[key] += 1
+            self.statistics["active"] += delta
+            self.statistics["max_active"] = max(self.statistics["max_active"], self.statistics["active"])
+    
+    @staticmethod
+    def _prompt_text(body: Dict[str, Any]) -> str:
+        """요청 본문에서 프롬프트 텍스트를 꺼냅니다."""
+        return "".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+    
+    @staticmethod
+    def _usage(prompt_tokens: int, output_tokens: int) -> Dict[str, int]:
+        """Gemini usageMetadata 형식의 토큰 사용량을 만듭니다."""
+        return {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens
+        }
+    
+    def _answer_tokens(self, count: int) -> List[str]:
+        """답변 토큰 목록을 만듭니다."""
+        return [ANSWER_TOKENS[i % len(ANSWER_TOKENS)] for i in range(count)]
+    
+    @staticmethod
+    def _error_response() -> JSONResponse:
+        """Gemini 과부하 오류 응답을 만듭니다."""
+        return JSONResponse(
+            status_code=503,
+            content={"error": {"code": 503, "message": "The model is overloaded.", "status": "UNAVAILABLE"}}
+        )
+    
+    def _max_output_tokens(self, body: Dict[str, Any]) -> int:
+        """요청의 maxOutputTokens를 넘지 않는 생성 토큰 수를 반환합니다."""
+        limit = body.get("generationConfig", {}).get("maxOutputTokens")
+        return min(self.output_tokens, limit) if limit else self.output_tokens
+    
+    async def generate(self, model: str, body: Dict[str, Any]):
+        """generateContent: 전체 생성 시간만큼 기다린 뒤 한 번에 응답합니다."""
+        if self._should_fail():
+            with self._lock:
+                self.statistics["errors"] += 1
+            return self._error_response()
+        
+        self._track("generate", 1)
+        try:
+            output_tokens = self._max_output_tokens(body)
+            await asyncio.sleep(self._first_token_delay() + output_tokens / self.tokens_per_sec)
+            
+            return {
+                "candidates": [{
+                    "content": {"role": "model", "parts": [{"text": "".join(self._answer_tokens(output_tokens))}]},
+                    "finishReason": "STOP",
+                    "index": 0
+                }],
+                "usageMetadata": self._usage(ContextBuilder.estimate_tokens(self._prompt_text(body)), output_tokens),
+                "modelVersion": model
+            }
+        finally:
+            self._track("generate", -1)
+    
+    async def stream(self, model: str, body: Dict[str, Any]):
+        """streamGenerateContent(alt=sse): chunk_tokens개씩 생성 속도에 맞춰 이벤트를 보냅니다."""
+        if self._should_fail():
+            with self._lock:
+                self.statistics["errors"] += 1
+            return self._error_response()
+        
+        output_tokens = self._max_output_tokens(body)
+        prompt_tokens = ContextBuilder.estimate_tokens(self._prompt_text(body))
+        tokens = self._answer_tokens(output_tokens)
+        
+        async def events():
+            self._track("stream", 1)
+            try:
+                await asyncio.sleep(self._first_token_delay())
+                for start in range(0, len(tokens), self.chunk_tokens):
+                    if start:
+                        await asyncio.sleep(self.chunk_tokens / self.tokens_per_sec)
+                    end = min(start + self.chunk_tokens, len(tokens))
+                    event = {
+                        "candidates": [{
+                            "content": {"role": "model", "parts": [{"text": "".join(tokens[start:end])}]},
+                            "index": 0,
+                            **({"finishReason": "STOP"} if end == len(tokens) else {})
+                        }],
+                        "usageMetadata": self._usage(prompt_tokens, end),
+                        "modelVersion": model
+                    }
+                    yield f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n"
+            finally:
+                self._track("stream", -1)
+        
+        return StreamingResponse(events(), media_type="text/event-stream")
+    
+    def create_app(self) -> FastAPI:
+        """mock 서버 FastAPI 앱을 생성합니다."""
+        app = FastAPI(title="Mock Gemini API")
+        
+        @app.post("/{version}/models/{model_method}")
+        async def models(version: str, model_method: str, request: Request):
+            model, _, method = model_method.partition(":")
+            body = await request.json()
+            if method == "generateContent":
+                return await self.generate(model, body)
+            if method == "streamGenerateContent":
+                return await self.stream(model, body)
+            raise HTTPException(status_code=404, detail=f"지원하지 않는 메서드입니다: {method}")
+        
+        @app.get("/stats")
+        async def stats():
+            with self._lock:
+                return dict(self.statistics)
+        
+        return app
+
+def main(args):
+    mock = MockGemini(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        output_tokens=args.output_tokens,
+        tokens_per_sec=args.tokens_per_sec,
+        chunk_tokens=args.chunk_tokens,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    generation_sec = args.latency_ms / 1000 + args.output_tokens / args.tokens_per_sec
+    print(f"Mock Gemini 서버: http://{args.host}:{args.port}/v1 "
+          f"(첫 토큰 {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, {args.tokens_per_sec:.0f} 토큰/s, "
+          f"응답당 약 {generation_sec:.1f}초)")
+    uvicorn.run(mock.create_app(), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="부하 테스트용 Gemini mock 서버")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8090, help="포트")
+    parser.add_argument("--latency-ms", type=float, default=800, help="첫 토큰까지의 평균 지연 시간 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=200, help="지연 시간 편차 (± ms)")
+    parser.add_argument("--output-tokens", type=int, default=300, help="응답당 생성 토큰 수")
+    parser.add_argument("--tokens-per-sec", type=float, default=80, help="초당 생성 토큰 수")
+    parser.add_argument("--chunk-tokens", type=int, default=10, help="스트리밍 이벤트당 토큰 수")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 오류 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 seed")
+    main(parser.parse_args())
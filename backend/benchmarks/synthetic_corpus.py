@@ -0,0 +1,113 @@
+"""
+벤치마크 공용 합성 한국어 코퍼스와 결과(JSON) 유틸리티
+
+같은 seed로 항상 같은 코퍼스를 만들어 버전 간 결과를 비교할 수 있도록 하고,
+결과 파일에는 커밋/파이썬/플랫폼 정보와 실행 인자를 함께 기록합니다.
+"""
+import json
+import platform
+import random
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+
+SUBJECTS = [
+    "출석수업", "대체시험", "등록금", "수강신청", "졸업논문", "학생증", "성적 이의신청", "장학금",
+    "전공 학점", "교양 과목", "계절학기", "휴학 신청", "복학 신청", "학점 교류", "온라인 강의", "지역대학"
+]
+
+DETAILS = [
+    "{}학기 일정에 따라", "별첨 {}의 서식으로", "최대 {}학점까지", "{}일 이내에",
+    "{}차 납부 기간에", "학과 사무실 {}번 창구에서", "{}주차 강의 이후", "{}개 과목 이수 후"
+]
+
+PREDICATES = [
+    "신청할 수 있습니다.", "온라인으로 응시할 수 있습니다.", "반드시 제출해야 합니다.",
+    "변경할 수 없으니 유의하시기 바랍니다.", "학사 공지사항에서 확인하십시오.",
+    "지역대학에서 수령할 수 있습니다.", "추가 납부 기간에 처리됩니다.", "성적에 반영됩니다."
+]
+
+QUERY_TEMPLATES = [
+    "{} 신청 방법이 궁금합니다",
+    "{} 기간은 언제인가요?",
+    "{} 관련 서식은 어디에 제출하나요?",
+    "{} 기준을 알려주세요"
+]
+
+def make_sentence(rng: random.Random) -> str:
+    """주제 + 세부 조건 + 서술부로 이루어진 한국어 문장 하나를 생성합니다."""
+    detail = rng.choice(DETAILS).format(rng.randint(1, 30))
+    return f"{rng.choice(SUBJECTS)}은(는) {detail} {rng.choice(PREDICATES)}"
+
+def make_text(rng: random.Random, length: int) -> str:
+    """length자 이상이 될 때까지 문장을 이어 붙입니다 (문단마다 줄바꿈)."""
+    parts = []
+    size = 0
+    while size < length:
+        sentence = make_sentence(rng)
+        separator = "\n" if parts and rng.random() < 0.2 else " "
+        parts.append(separator + sentence if parts else sentence)
+        size += len(parts[-1])
+    return "".join(parts)
+
+def make_pages(page_count: int, chars_per_page: int = 1800, seed: int = 42) -> list:
+    """PDFProcessor.iter_pages와 같은 형식의 합성 페이지를 생성합니다."""
+    rng = random.Random(seed)
+    return [{"page": i + 1, "content": make_text(rng, chars_per_page)} for i in range(page_count)]
+
+def make_chunks(count: int, chars_per_chunk: int = 500, seed: int = 42) -> list:
+    """청크 메타데이터 형식의 서로 다른 합성 청크를 생성합니다."""
+    rng = random.Random(seed)
+    return [
+        {"chunk_id": i, "page": i // 4 + 1, "content": f"[{i}] {make_text(rng, chars_per_chunk)}"}
+        for i in range(count)
+    ]
+
+def make_queries(count: int, seed: int = 7) -> list:
+    """합성 검색어를 생성합니다."""
+    rng = random.Random(seed)
+    return [rng.choice(QUERY_TEMPLATES).format(rng.choice(SUBJECTS)) for _ in range(count)]
+
+def latency_summary(latencies_ms: list) -> dict:
+    """밀리초 단위 지연 시간 목록을 요약합니다."""
+    values = np.asarray(latencies_ms, dtype=np.float64)
+    return {
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3)
+    }
+
+def git_commit() -> str:
+    """현재 커밋 해시를 반환합니다 (git이 없으면 None)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def make_report(benchmark: str, args, results: list, **extra) -> dict:
+    """버전 간 비교를 위한 환경 정보와 실행 인자를 포함한 결과 딕셔너리를 만듭니다."""
+    return {
+        "benchmark": benchmark,
+        "git_commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        **extra,
+        "results": results
+    }
+
+def write_report(report: dict, output: str):
+    """결과를 JSON 파일로 저장합니다 (경로가 없으면 저장하지 않음)."""
+    if not output:
+        return
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
@@ -13,6 +13,16 @@ class Settings:
     # Google OAuth 설정 (API Key 방식 제거)
     GOOGLE_CREDENTIALS: str = os.getenv("GOOGLE_CREDENTIALS", "")
     
+    # Gemini API 호출 설정
+    GEMINI_API_BASE: str = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1")
+    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    GEMINI_USE_OAUTH: bool = os.getenv("GEMINI_USE_OAUTH", "True").lower() == "true"  # 로컬 mock 서버는 False
+    GEMINI_TIMEOUT: float = float(os.getenv("GEMINI_TIMEOUT", "30"))
+    GEMINI_CONNECT_TIMEOUT: float = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+    GEMINI_MAX_CONNECTIONS: int = int(os.getenv("GEMINI_MAX_CONNECTIONS", "20"))
+    GEMINI_MAX_KEEPALIVE: int = int(os.getenv("GEMINI_MAX_KEEPALIVE", "10"))
+    GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "10"))
+    
     # 서버 설정
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
@@ -25,11 +35,68 @@ class Settings:
     
     # 임베딩 모델 설정
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "jhgan/ko-sbert-sts")
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch").lower()  # torch, onnx, onnx_int8 (onnxruntime 필요)
+    EMBEDDING_ONNX_DIR: str = os.getenv("EMBEDDING_ONNX_DIR", "./data/onnx")  # ONNX 변환 결과 저장 경로
+    EMBEDDING_ONNX_THREADS: int = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))  # 0이면 런타임 기본값
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))  # 0이면 쿼리 임베딩 캐시 비활성화
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "")  # 지정 시 재시작 후에도 캐시 유지 (.npz)
+    EMBEDDING_BATCHING_ENABLED: bool = os.getenv("EMBEDDING_BATCHING_ENABLED", "True").lower() == "true"
+    EMBEDDING_BATCH_MAX_SIZE: int = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+    EMBEDDING_STORE_ENABLED: bool = os.getenv("EMBEDDING_STORE_ENABLED", "True").lower() == "true"  # 청크 임베딩 재사용 (내용 해시 기준)
+    EMBEDDING_STORE_PATH: str = os.getenv("EMBEDDING_STORE_PATH", "./data/embedding_store.sqlite3")
+    DOCUMENT_CATALOG_PATH: str = os.getenv("DOCUMENT_CATALOG_PATH", "./data/documents.sqlite3")  # 문서 목록/상태 카탈로그
     
     # 검색 설정
     TOP_K_RESULTS: int = int(os.getenv("TOP_K_RESULTS", "5"))
+    RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "dense").lower()  # dense, sparse(BM25), hybrid(RRF)
+    BM25_NGRAM: int = int(os.getenv("BM25_NGRAM", "2"))  # 한국어 문자 n-gram 크기
+    BM25_K1: float = float(os.getenv("BM25_K1", "1.2"))
+    BM25_B: float = float(os.getenv("BM25_B", "0.75"))
+    HYBRID_CANDIDATES: int = int(os.getenv("HYBRID_CANDIDATES", "50"))  # 융합 전 검색 방식별 후보 수
+    RRF_K: int = int(os.getenv("RRF_K", "60"))
+    RERANK_ENABLED: bool = os.getenv("RERANK_ENABLED", "False").lower() == "true"  # 크로스 인코더 재정렬
+    RERANK_MODEL: str = os.getenv("RERANK_MODEL", "bongsoo/klue-cross-encoder-v1")
+    RERANK_CANDIDATES: int = int(os.getenv("RERANK_CANDIDATES", "20"))  # 재정렬 전 벡터 검색 후보 수
+    RERANK_TOP_K: int = int(os.getenv("RERANK_TOP_K", "3"))  # 재정렬 후 프롬프트에 넣을 청크 수
+    RERANK_BATCH_SIZE: int = int(os.getenv("RERANK_BATCH_SIZE", "8"))
+    RERANK_MAX_LENGTH: int = int(os.getenv("RERANK_MAX_LENGTH", "512"))
+    RERANK_TIMEOUT_MS: float = float(os.getenv("RERANK_TIMEOUT_MS", "300"))  # 초과 시 벡터 검색 순서 사용
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "600"))
     CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "100"))
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))  # 프롬프트 참고 자료 최대 추정 토큰 수 (0이면 제한 없음)
+    CONTEXT_DEDUP_THRESHOLD: float = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.9"))  # 근접 중복 청크 제외 기준 (문자 3-gram 자카드)
+    
+    # 문서 수집(업로드 처리) 작업 설정
+    PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", "0"))  # 0이면 CPU 코어 수, 1이면 직렬
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "64"))
+    PDF_PAGE_BATCH_SIZE: int = int(os.getenv("PDF_PAGE_BATCH_SIZE", "16"))
+    UPLOAD_READ_CHUNK_SIZE: int = int(os.getenv("UPLOAD_READ_CHUNK_SIZE", str(1024 * 1024)))
+    INGEST_MAX_WORKERS: int = int(os.getenv("INGEST_MAX_WORKERS", "1"))
+    INGEST_EMBED_BATCH_SIZE: int = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+    INGEST_JOB_RETENTION_SECONDS: int = int(os.getenv("INGEST_JOB_RETENTION_SECONDS", "3600"))
+    
+    # 벡터 인덱스 설정 (flat, hnsw, ivf_flat, ivf_pq)
+    VECTOR_INDEX_TYPE: str = os.getenv("VECTOR_INDEX_TYPE", "flat").lower()
+    IVF_NLIST: int = int(os.getenv("IVF_NLIST", "256"))
+    IVF_NPROBE: int = int(os.getenv("IVF_NPROBE", "16"))
+    IVF_MIN_TRAIN_PER_LIST: int = int(os.getenv("IVF_MIN_TRAIN_PER_LIST", "39"))
+    PQ_M: int = int(os.getenv("PQ_M", "16"))
+    PQ_NBITS: int = int(os.getenv("PQ_NBITS", "8"))
+    HNSW_M: int = int(os.getenv("HNSW_M", "32"))
+    HNSW_EF_CONSTRUCTION: int = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+    HNSW_EF_SEARCH: int = int(os.getenv("HNSW_EF_SEARCH", "64"))
+    HNSW_COMPACT_RATIO: float = float(os.getenv("HNSW_COMPACT_RATIO", "0.2"))  # 삭제 표시된 벡터가 이 비율을 넘으면 HNSW 재구성
+    VECTOR_INDEX_MMAP: bool = os.getenv("VECTOR_INDEX_MMAP", "False").lower() == "true"  # 인덱스 파일을 mmap으로 로드 (워커 간 페이지 캐시 공유)
+    
+    # 답변 캐시 설정 (질문 임베딩 코사인 유사도 기반)
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "True").lower() == "true"
+    ANSWER_CACHE_THRESHOLD: float = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+    ANSWER_CACHE_MAX_ENTRIES: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+    ANSWER_CACHE_TTL_SECONDS: int = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+    
+    # 메트릭 설정 (Prometheus /metrics 엔드포인트)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
     
     # 관리자 계정 설정
     ADMIN_ID: str = os.getenv("ADMIN_ID", "admin")
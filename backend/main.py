@@ -1,6 +1,7 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+import time
 import uvicorn
 from contextlib import asynccontextmanager
 
@@ -44,10 +45,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"❌ 임베딩 모델 오류: {e}")
     
+    # 재정렬 모델은 첫 요청의 시간 예산을 쓰지 않도록 미리 로드
+    try:
+        from services.reranker import reranker
+        if reranker.enabled:
+            reranker.load_model()
+            print(f"🎯 재정렬 모델 로드 성공: {reranker.model_name}")
+    except Exception as e:
+        print(f"❌ 재정렬 모델 오류: {e}")
+    
     # Gemini API 연결 테스트
     try:
         from services.qa_chain import qa_chain
-        test_result = qa_chain.test_connection()
+        test_result = await qa_chain.test_connection()
         if test_result["status"] == "success":
             print("✅ Gemini API 연결 성공")
         else:
@@ -60,6 +70,44 @@ async def lifespan(app: FastAPI):
     yield
     
     # 종료 시 실행
+    try:
+        from services.ingestion import ingestion_queue
+        from services.pdf_processor import PDFProcessor
+        ingestion_queue.shutdown()
+        PDFProcessor.shutdown_pool()
+    except Exception as e:
+        print(f"❌ 수집 작업 큐 종료 오류: {e}")
+    
+    try:
+        from services.embedding_batcher import embedding_batcher
+        await embedding_batcher.aclose()
+    except Exception as e:
+        print(f"❌ 임베딩 배처 종료 오류: {e}")
+    
+    try:
+        from services.embedder import embedder
+        embedder.save_cache()
+    except Exception as e:
+        print(f"❌ 임베딩 캐시 저장 오류: {e}")
+    
+    try:
+        from services.embedding_store import chunk_embedding_store
+        chunk_embedding_store.close()
+    except Exception as e:
+        print(f"❌ 청크 임베딩 저장소 종료 오류: {e}")
+    
+    try:
+        from utils.document_catalog import document_catalog
+        document_catalog.close()
+    except Exception as e:
+        print(f"❌ 문서 카탈로그 종료 오류: {e}")
+    
+    try:
+        from services.qa_chain import qa_chain
+        await qa_chain.aclose()
+    except Exception as e:
+        print(f"❌ Gemini 클라이언트 종료 오류: {e}")
+    
     print("🛑 asKNOU 백엔드 서버 종료")
 
 # FastAPI 앱 생성
@@ -91,6 +139,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 처리 시간 측정 (경로 템플릿 기준으로 집계하여 레이블 수를 제한)
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    if not settings.METRICS_ENABLED:
+        return await call_next(request)
+    
+    from utils.metrics import http_request_seconds
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        http_request_seconds.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=status
+        )
+
 # 라우터 등록
 app.include_router(upload.router)
 app.include_router(ask.router)
@@ -111,7 +181,8 @@ async def root():
             "ask_question": "/ask/",
             "admin_documents": "/admin/documents",
             "api_docs": "/docs",
-            "health_check": "/health"
+            "health_check": "/health",
+            "metrics": "/metrics"
         }
     }
 
@@ -124,22 +195,27 @@ async def health_check():
     try:
         # 기본 시스템 체크
         from utils.file_utils import FileManager
-        documents = FileManager.list_documents()
+        document_summary = FileManager.get_document_summary()
         
         # 임베딩 모델 체크
         from services.embedder import embedder
+        from services.embedding_batcher import embedding_batcher
+        from services.reranker import reranker
         embedding_status = embedder.model is not None
         
         # Gemini API 체크
         from services.qa_chain import qa_chain
-        gemini_test = qa_chain.test_connection()
+        gemini_test = await qa_chain.test_connection()
         
         return {
             "status": "healthy",
             "timestamp": str(settings.DATA_DIR.stat().st_ctime),
             "system": {
-                "documents_count": len(documents),
+                "documents_count": document_summary["total_documents"],
                 "embedding_model_loaded": embedding_status,
+                "embedding_cache": embedder.get_cache_statistics(),
+                "embedding_batcher": embedding_batcher.get_statistics(),
+                "reranker": reranker.get_statistics(),
                 "gemini_api_status": gemini_test["status"],
                 "data_directory_exists": settings.DATA_DIR.exists(),
                 "pdf_directory_exists": settings.PDF_DIR.exists(),
@@ -155,6 +231,18 @@ async def health_check():
             }
         )
 
+# 메트릭 엔드포인트
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """
+    단계별 지연 시간 히스토그램과 토큰 사용량 카운터를 Prometheus 텍스트 형식으로 반환
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="메트릭이 비활성화되어 있습니다.")
+    
+    from utils.metrics import metrics
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # 전역 예외 처리
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List, Any
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, List, Any, Optional
 from datetime import datetime
+import asyncio
 
 from config import settings
 from utils.file_utils import FileManager
-from services.vector_store import VectorStoreManager
+from utils.document_catalog import document_catalog
+from utils.system_utils import ProcessMonitor
+from services.vector_store import VectorStoreManager, vector_registry
+from services.ingestion import ingestion_queue
+from services.chunk_store import ChunkStore, write_metadata_header
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -37,6 +42,11 @@ async def list_documents() -> Dict[str, Any]:
                 "filename": doc["filename"],
                 "file_size_mb": round(size_mb, 2),
                 "created_at": created_at,
+                "page_count": doc["page_count"],
+                "chunk_count": doc["chunk_count"],
+                "vector_count": doc["vector_count"],
+                "dimension": doc["dimension"],
+                "disk_size_mb": round((doc["disk_bytes"] or 0) / (1024 * 1024), 2),
                 "status": {
                     "pdf_exists": True,  # list에서 나온 것은 항상 존재
                     "vector_exists": doc["has_vector"],
@@ -125,12 +135,17 @@ async def delete_document(doc_id: str) -> Dict[str, Any]:
         if not pdf_path.exists():
             raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
         
+        # 수집 작업이 끝나기 전에 지우면 작업이 인덱스를 다시 등록하므로 거부
+        if ingestion_queue.is_active(doc_id):
+            raise HTTPException(status_code=409, detail="처리 중인 문서는 삭제할 수 없습니다. 처리가 끝난 뒤 다시 시도해주세요.")
+        
         # 삭제 전 정보 수집
         file_size = pdf_path.stat().st_size
         filename = pdf_path.name
         
         # 파일 삭제
         success = FileManager.delete_document_files(doc_id)
+        await asyncio.to_thread(VectorStoreManager.remove_document_index, doc_id)
         
         if success:
             return {
@@ -168,6 +183,10 @@ async def preview_cleanup() -> Dict[str, Any]:
         for doc in documents:
             doc_id = doc["doc_id"]
             
+            # 아직 수집 작업이 진행 중인 문서는 제외
+            if ingestion_queue.is_active(doc_id):
+                continue
+            
             # PDF는 있지만 벡터 저장소나 메타데이터가 없는 경우
             if not doc["has_vector"] or not doc["has_metadata"]:
                 cleanup_targets.append({
@@ -209,9 +228,14 @@ async def cleanup_orphaned_files() -> Dict[str, Any]:
         for doc in documents:
             doc_id = doc["doc_id"]
             
+            # 아직 수집 작업이 진행 중인 문서는 제외
+            if ingestion_queue.is_active(doc_id):
+                continue
+            
             # PDF는 있지만 벡터 저장소나 메타데이터가 없는 경우
             if not doc["has_vector"] or not doc["has_metadata"]:
                 success = FileManager.delete_document_files(doc_id)
+                await asyncio.to_thread(VectorStoreManager.remove_document_index, doc_id)
                 if success:
                     cleaned_files.append({
                         "doc_id": doc_id,
@@ -231,6 +255,28 @@ async def cleanup_orphaned_files() -> Dict[str, Any]:
             detail=f"파일 정리 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.post("/catalog/rebuild")
+async def rebuild_document_catalog() -> Dict[str, Any]:
+    """
+    디스크의 파일로 문서 카탈로그를 다시 만듭니다 (파일을 직접 옮기거나 지운 경우).
+    
+    Returns:
+        재구성 결과
+    """
+    try:
+        count = document_catalog.rebuild()
+        return {
+            "success": True,
+            "message": f"문서 카탈로그를 다시 만들었습니다 ({count}개 문서).",
+            "total_documents": count
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"문서 카탈로그 재구성 중 오류가 발생했습니다: {str(e)}"
+        )
+
 @router.put("/documents/{doc_id}/filename")
 async def update_document_filename(doc_id: str, new_filename: str) -> Dict[str, Any]:
     """
@@ -254,10 +300,12 @@ async def update_document_filename(doc_id: str, new_filename: str) -> Dict[str,
         if not metadata_path.exists():
             raise HTTPException(status_code=404, detail="메타데이터를 찾을 수 없습니다.")
         
-        # 메타데이터 로드
-        import json
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
+        # 진행 중인 개정 작업이 자신의 스냅샷으로 헤더를 덮어써 변경을 되돌리지 않도록 거부
+        if ingestion_queue.is_active(doc_id):
+            raise HTTPException(status_code=409, detail="처리 중인 문서는 이름을 변경할 수 없습니다. 처리가 끝난 뒤 다시 시도해주세요.")
+        
+        # 메타데이터 헤더 로드 (구 JSON 형식이면 바이너리 청크 파일로 변환)
+        metadata = ChunkStore.migrate_json_metadata(doc_id)
         
         # 새 파일명 검증
         if not new_filename.strip():
@@ -268,23 +316,15 @@ async def update_document_filename(doc_id: str, new_filename: str) -> Dict[str,
             new_filename += '.pdf'
         
         # 기존 파일명 저장
-        old_filename = metadata.get("original_filename", "Unknown")
+        old_filename = metadata.get("original_filename") or "Unknown"
         
-        # 메타데이터 업데이트
-        if isinstance(metadata, dict):
-            metadata["original_filename"] = new_filename
-        else:
-            # 구 형식인 경우 새 형식으로 변환
-            metadata = {
-                "original_filename": new_filename,
-                "doc_id": doc_id,
-                "total_chunks": len(metadata) if isinstance(metadata, list) else 0,
-                "chunks": metadata if isinstance(metadata, list) else []
-            }
+        # 메타데이터 업데이트 및 저장
+        metadata["original_filename"] = new_filename
+        write_metadata_header(metadata_path, metadata)
         
-        # 메타데이터 파일 저장
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        # 문서 카탈로그와 상주 중인 레지스트리의 파일명 갱신
+        document_catalog.rename(doc_id, new_filename)
+        vector_registry.rename(doc_id, new_filename)
         
         return {
             "success": True,
@@ -332,12 +372,20 @@ async def delete_selected_documents(doc_ids: List[str]) -> Dict[str, Any]:
                     })
                     continue
                 
+                if ingestion_queue.is_active(doc_id):
+                    failed_files.append({
+                        "doc_id": doc_id,
+                        "reason": "처리 중인 문서입니다."
+                    })
+                    continue
+                
                 # 삭제 전 정보 수집
                 file_size = pdf_path.stat().st_size
                 original_filename = FileManager.get_original_filename(doc_id) or pdf_path.name
                 
                 # 파일 삭제
                 success = FileManager.delete_document_files(doc_id)
+                await asyncio.to_thread(VectorStoreManager.remove_document_index, doc_id)
                 
                 if success:
                     deleted_files.append({
@@ -385,28 +433,11 @@ async def get_system_statistics() -> Dict[str, Any]:
         시스템 통계 정보
     """
     try:
-        documents = FileManager.list_documents()
-        
-        # 기본 통계
-        total_docs = len(documents)
-        processed_docs = sum(1 for doc in documents if doc["has_vector"] and doc["has_metadata"])
-        total_size = sum(doc["file_size"] for doc in documents)
-        
-        # 벡터 저장소 통계
-        total_vectors = 0
-        total_chunks = 0
-        embedding_dims = set()
-        
-        for doc in documents:
-            if doc["has_vector"]:
-                vector_store = VectorStoreManager.get_document_store(doc["doc_id"])
-                if vector_store:
-                    stats = vector_store.get_statistics()
-                    if "total_vectors" in stats:
-                        total_vectors += stats["total_vectors"]
-                        total_chunks += stats.get("total_chunks", 0)
-                        if stats.get("dimension"):
-                            embedding_dims.add(stats["dimension"])
+        # 수집 시점에 기록된 문서별 통계를 집계 (인덱스 파일을 열지 않음)
+        summary = document_catalog.summary()
+        total_docs = summary["total_documents"]
+        processed_docs = summary["processed_documents"]
+        total_chunks = summary["total_chunks"]
         
         # 시스템 상태 확인
         from services.embedder import embedder
@@ -416,25 +447,43 @@ async def get_system_statistics() -> Dict[str, Any]:
         }
         
         from services.qa_chain import qa_chain
-        gemini_status = qa_chain.test_connection()
+        from services.answer_cache import answer_cache
+        from services.embedding_store import chunk_embedding_store
+        from services.reranker import reranker
+        gemini_status = await qa_chain.test_connection()
+        
+        # 통합 인덱스 정보는 이 워커가 이미 로드한 경우에만 포함 (통계 조회로 전체 인덱스를 로드하지 않음)
+        registry_loaded = vector_registry.is_loaded
         
         return {
             "document_statistics": {
                 "total_documents": total_docs,
                 "processed_documents": processed_docs,
                 "pending_documents": total_docs - processed_docs,
-                "total_size_mb": round(total_size / (1024 * 1024), 2)
+                "total_pages": summary["total_pages"],
+                "total_size_mb": round(summary["total_size"] / (1024 * 1024), 2),
+                "disk_usage_mb": round(summary["disk_bytes"] / (1024 * 1024), 2)
             },
             "vector_statistics": {
-                "total_vectors": total_vectors,
+                "total_vectors": summary["total_vectors"],
                 "total_chunks": total_chunks,
-                "embedding_dimensions": list(embedding_dims),
-                "average_chunks_per_doc": round(total_chunks / max(processed_docs, 1), 2)
+                "embedding_dimensions": summary["embedding_dimensions"],
+                "average_chunks_per_doc": round(total_chunks / max(processed_docs, 1), 2),
+                "corpus_index": vector_registry.index_info() if registry_loaded else None
             },
             "system_status": {
                 "embedding_model": embedding_model_status,
                 "gemini_api": gemini_status["status"],
-                "gemini_message": gemini_status.get("message", "")
+                "gemini_message": gemini_status.get("message", ""),
+                "answer_cache": answer_cache.get_statistics(),
+                "embedding_store": chunk_embedding_store.get_statistics(),
+                "reranker": reranker.get_statistics(),
+                "ingestion_queue": ingestion_queue.get_statistics()
+            },
+            # 응답한 워커 프로세스 기준 (워커가 여러 개면 요청마다 다른 워커가 응답할 수 있음)
+            "worker_memory": {
+                **ProcessMonitor.get_memory_usage(),
+                "vector_store": vector_registry.memory_info() if registry_loaded else None
             }
         }
         
@@ -442,4 +491,44 @@ async def get_system_statistics() -> Dict[str, Any]:
         raise HTTPException(
             status_code=500,
             detail=f"통계 조회 중 오류가 발생했습니다: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.get("/index/recall")
+async def get_index_recall_report(
+    num_queries: int = Query(100, ge=1), 
+    top_k: int = Query(10, ge=1), 
+    nprobe: Optional[str] = None, 
+    ef_search: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    통합 벡터 인덱스의 recall@k를 flat(정확 검색)과 비교한 리포트를 반환합니다.
+    
+    Args:
+        num_queries: 평가에 사용할 쿼리 수
+        top_k: recall 계산 기준 k
+        nprobe: 비교할 IVF nprobe 값 목록 (쉼표 구분, 예: "1,8,32")
+        ef_search: 비교할 HNSW efSearch 값 목록 (쉼표 구분, 예: "16,64,256")
+        
+    Returns:
+        파라미터별 recall 및 평균 검색 지연 시간
+    """
+    try:
+        nprobe_values = [int(value) for value in nprobe.split(",")] if nprobe else None
+        ef_search_values = [int(value) for value in ef_search.split(",")] if ef_search else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="nprobe / ef_search는 쉼표로 구분된 정수여야 합니다.")
+    
+    try:
+        return await asyncio.to_thread(
+            vector_registry.evaluate_recall,
+            num_queries=num_queries,
+            top_k=top_k,
+            nprobe_values=nprobe_values,
+            ef_search_values=ef_search_values
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"인덱스 recall 평가 중 오류가 발생했습니다: {str(e)}"
+        )
\ No newline at end of file
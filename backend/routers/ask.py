@@ -1,6 +1,9 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Literal
+import asyncio
+import json
 
 from services.qa_chain import qa_chain
 
@@ -10,6 +13,9 @@ class QuestionRequest(BaseModel):
     """질문 요청 모델"""
     question: str
     top_k: Optional[int] = None
+    nprobe: Optional[int] = None  # IVF 인덱스 탐색 클러스터 수
+    ef_search: Optional[int] = None  # HNSW 인덱스 탐색 폭
+    retrieval_mode: Optional[Literal["dense", "sparse", "hybrid"]] = None  # 기본값: RETRIEVAL_MODE 설정
 
 class QuestionResponse(BaseModel):
     """질문 응답 모델"""
@@ -18,6 +24,7 @@ class QuestionResponse(BaseModel):
     retrieved_chunks: int
     question: str
     error: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None  # 프롬프트 크기, Gemini 토큰 사용량, 단계별 소요 시간
 
 @router.post("/", response_model=QuestionResponse)
 async def ask_question(request: QuestionRequest) -> QuestionResponse:
@@ -40,7 +47,10 @@ async def ask_question(request: QuestionRequest) -> QuestionResponse:
         # QA 체인을 통해 답변 생성
         result = await qa_chain.answer_question(
             question=request.question.strip(),
-            top_k=request.top_k
+            top_k=request.top_k,
+            nprobe=request.nprobe,
+            ef_search=request.ef_search,
+            retrieval_mode=request.retrieval_mode
         )
         
         return QuestionResponse(**result)
@@ -51,6 +61,41 @@ async def ask_question(request: QuestionRequest) -> QuestionResponse:
             detail=f"답변 생성 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.post("/stream")
+async def ask_question_stream(request: QuestionRequest) -> StreamingResponse:
+    """
+    사용자의 질문에 대한 답변을 SSE(Server-Sent Events)로 스트리밍합니다.
+    
+    이벤트 순서: sources → token (여러 번) → done, 오류 시 error
+    
+    Args:
+        request: 질문 요청 데이터
+        
+    Returns:
+        text/event-stream 응답
+    """
+    if not request.question.strip():
+        raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
+    
+    if len(request.question) > 1000:
+        raise HTTPException(status_code=400, detail="질문은 1000자를 초과할 수 없습니다.")
+    
+    async def event_stream():
+        async for event in qa_chain.stream_answer(
+            question=request.question.strip(),
+            top_k=request.top_k,
+            nprobe=request.nprobe,
+            ef_search=request.ef_search,
+            retrieval_mode=request.retrieval_mode
+        ):
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/test")
 async def test_qa_system() -> Dict[str, Any]:
     """
@@ -61,7 +106,7 @@ async def test_qa_system() -> Dict[str, Any]:
     """
     try:
         # Gemini API 연결 테스트
-        gemini_test = qa_chain.test_connection()
+        gemini_test = await qa_chain.test_connection()
         
         # 임베딩 모델 상태 확인
         from services.embedder import embedder
@@ -73,11 +118,11 @@ async def test_qa_system() -> Dict[str, Any]:
         
         # 문서 상태 확인
         from utils.file_utils import FileManager
-        documents = FileManager.list_documents()
+        document_summary = FileManager.get_document_summary()
         doc_status = {
-            "total_documents": len(documents),
-            "documents_with_vectors": sum(1 for doc in documents if doc["has_vector"]),
-            "documents_with_metadata": sum(1 for doc in documents if doc["has_metadata"])
+            "total_documents": document_summary["total_documents"],
+            "documents_with_vectors": document_summary["documents_with_vectors"],
+            "documents_with_metadata": document_summary["documents_with_metadata"]
         }
         
         return {
@@ -109,16 +154,21 @@ async def search_documents(request: QuestionRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
     
     try:
-        from services.embedder import embedder
+        from services.embedding_batcher import embedding_batcher
         from services.vector_store import VectorStoreManager
         
         # 질문을 임베딩으로 변환
-        question_embedding = embedder.encode_single_text(request.question.strip())
+        question_embedding = await embedding_batcher.encode(request.question.strip())
         
-        # 문서 검색
-        search_results = VectorStoreManager.search_all_documents(
+        # 문서 검색 (FAISS/BM25 검색은 이벤트 루프 밖에서 실행)
+        search_results = await asyncio.to_thread(
+            VectorStoreManager.search_all_documents,
             question_embedding, 
-            request.top_k
+            request.top_k,
+            nprobe=request.nprobe,
+            ef_search=request.ef_search,
+            query_text=request.question.strip(),
+            retrieval_mode=request.retrieval_mode
         )
         
         # 결과 정리
@@ -131,6 +181,9 @@ async def search_documents(request: QuestionRequest) -> Dict[str, Any]:
                 "page": chunk.get("page", "Unknown"),
                 "chunk_id": chunk.get("chunk_id", "Unknown"),
                 "score": result["score"],
+                "retrieval_mode": result.get("retrieval_mode"),
+                "dense_score": result.get("dense_score"),
+                "sparse_score": result.get("sparse_score"),
                 "content_preview": chunk["content"][:300] + "..." if len(chunk["content"]) > 300 else chunk["content"],
                 "rank": result["rank"]
             })
@@ -141,6 +194,8 @@ async def search_documents(request: QuestionRequest) -> Dict[str, Any]:
             "results": formatted_results
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -4,81 +4,173 @@ from typing import Dict, Any
 import asyncio
 
 from utils.file_utils import FileManager
-from services.pdf_processor import PDFProcessor
-from services.embedder import embedder
+from utils.document_catalog import document_catalog
 from services.vector_store import VectorStoreManager
+from services.ingestion import ingestion_queue
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+
 @router.post("/pdf")
 async def upload_pdf(file: UploadFile = File(...)) -> Dict[str, Any]:
     """
-    PDF 파일을 업로드하고 처리합니다.
+    PDF 파일을 업로드하고 백그라운드 처리 작업을 등록합니다.
+    
+    텍스트 추출, 분할, 임베딩, 인덱싱은 수집 워커 풀에서 진행되며,
+    진행 상황은 /upload/status/{doc_id}로 확인합니다.
     
     Args:
         file: 업로드할 PDF 파일
         
     Returns:
-        처리 결과 정보
+        등록된 작업 정보
     """
     # 파일 형식 검증
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
     
-    if file.size > 50 * 1024 * 1024:  # 50MB 제한
+    if file.size is not None and file.size > MAX_UPLOAD_SIZE:  # 50MB 제한
         raise HTTPException(status_code=400, detail="파일 크기는 50MB를 초과할 수 없습니다.")
     
+    doc_id = None
     try:
-        # 1. 문서 ID 생성 및 파일 저장
+        # 1. 문서 ID 생성 및 파일 저장 (본문을 메모리에 올리지 않고 청크 단위로 기록)
         doc_id = FileManager.generate_doc_id()
-        file_content = await file.read()
-        file_path = await FileManager.save_uploaded_file(file_content, doc_id)
-        
-        # 2. PDF 처리 (텍스트 추출 및 분할)
-        chunks = PDFProcessor.process_pdf(file_path)
-        
-        if not chunks:
-            # 빈 PDF인 경우 파일 삭제
-            FileManager.delete_document_files(doc_id)
-            raise HTTPException(status_code=400, detail="PDF에서 텍스트를 추출할 수 없습니다.")
-        
-        # 3. 임베딩 생성
-        chunk_texts = [chunk["content"] for chunk in chunks]
-        embeddings = embedder.encode_texts(chunk_texts)
+        try:
+            file_path, file_size, file_hash = await FileManager.save_upload_stream(file, doc_id, MAX_UPLOAD_SIZE)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        if len(embeddings) == 0:
-            # 임베딩 실패시 파일 삭제
-            FileManager.delete_document_files(doc_id)
-            raise HTTPException(status_code=500, detail="임베딩 생성에 실패했습니다.")
+        # 2. 바이트 단위로 동일한 PDF가 이미 있으면 추출/임베딩 없이 기존 문서로 연결
+        #    (해시 조회와 카탈로그 등록이 한 트랜잭션이므로 동시에 올라온 동일 파일은 한 번만 처리)
+        existing_doc_id = document_catalog.claim_hash(doc_id, file.filename, file_size, file_hash)
+        if existing_doc_id:
+            file_path.unlink()
+            doc_id = None
+            return _duplicate_upload_response(existing_doc_id, file.filename, file_size)
         
-        # 4. 벡터 저장소에 저장 (원본 파일명 포함)
-        vector_store = VectorStoreManager.create_document_index(doc_id, embeddings, chunks, original_filename=file.filename)
+        # 3. 수집 작업 등록 (추출 → 분할 → 임베딩 → 인덱싱)
+        job = ingestion_queue.submit(doc_id, file_path, file.filename, file_size)
         
-        # 5. 결과 반환
         return {
             "success": True,
-            "message": "PDF 업로드 및 처리가 완료되었습니다.",
+            "message": "PDF 업로드가 완료되어 처리 대기열에 등록되었습니다.",
             "doc_id": doc_id,
             "filename": file.filename,
-            "file_size": len(file_content),
-            "total_chunks": len(chunks),
-            "total_pages": max([chunk["page"] for chunk in chunks]) if chunks else 0,
-            "embedding_dimension": embeddings.shape[1] if len(embeddings) > 0 else 0
+            "file_size": file_size,
+            "status": job["stage"],
+            "status_url": f"/upload/status/{doc_id}"
         }
         
     except HTTPException:
         raise
     except Exception as e:
         # 오류 발생시 생성된 파일들 정리
+        if doc_id:
+            try:
+                FileManager.delete_document_files(doc_id)
+            except:
+                pass
+        
+        raise HTTPException(
+            status_code=500, 
+            detail=f"파일 처리 중 오류가 발생했습니다: {str(e)}"
+        )
+
+def _duplicate_upload_response(doc_id: str, filename: str, file_size: int, reserved: bool = False) -> Dict[str, Any]:
+    """
+    이미 업로드된 동일 파일에 대한 응답을 만듭니다 (기존 문서의 처리 상태 포함).
+    
+    reserved가 참이면 이 요청이 확보해 둔 작업 자리는 실제 작업이 아니므로 카탈로그 상태를 사용합니다.
+    """
+    # 다른 워커가 처리 중일 수 있으므로 이 워커의 작업이 없으면 카탈로그 상태를 사용
+    job = None if reserved else ingestion_queue.get_job(doc_id)
+    if job:
+        status = job["stage"]
+    else:
+        document = document_catalog.get(doc_id)
+        status = document["status"] if document else "processing"
+        if status == "indexed":
+            status = "completed"
+    
+    return {
+        "success": True,
+        "message": "동일한 파일이 이미 업로드되어 있어 기존 문서를 사용합니다.",
+        "doc_id": doc_id,
+        "filename": FileManager.get_original_filename(doc_id) or filename,
+        "file_size": file_size,
+        "duplicate": True,
+        "status": status,
+        "status_url": f"/upload/status/{doc_id}"
+    }
+
+@router.put("/pdf/{doc_id}")
+async def update_pdf(doc_id: str, file: UploadFile = File(...)) -> Dict[str, Any]:
+    """
+    기존 문서를 개정된 PDF로 갱신하는 백그라운드 작업을 등록합니다.
+    
+    doc_id는 그대로 유지되며, 내용이 바뀐 청크만 다시 임베딩됩니다.
+    진행 상황은 /upload/status/{doc_id}로 확인합니다.
+    
+    Args:
+        doc_id: 갱신할 문서 ID
+        file: 개정된 PDF 파일
+        
+    Returns:
+        등록된 작업 정보
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
+    
+    if file.size is not None and file.size > MAX_UPLOAD_SIZE:  # 50MB 제한
+        raise HTTPException(status_code=400, detail="파일 크기는 50MB를 초과할 수 없습니다.")
+    
+    if not FileManager.get_pdf_path(doc_id).exists() or not FileManager.get_vectorstore_path(doc_id).exists():
+        raise HTTPException(status_code=404, detail="갱신할 문서를 찾을 수 없습니다.")
+    
+    # 저장을 시작하기 전에 작업 자리를 확보 (같은 문서에 대한 동시 개정 요청은 하나만 진행)
+    if not ingestion_queue.try_reserve(doc_id, file.filename):
+        raise HTTPException(status_code=409, detail="이미 처리 중인 문서입니다.")
+    
+    submitted = False
+    try:
+        # 개정본은 요청별 임시 경로에 저장 (처리 완료 후 기존 PDF와 교체)
         try:
-            FileManager.delete_document_files(doc_id)
-        except:
-            pass
+            file_path, file_size, file_hash = await FileManager.save_upload_stream(
+                file, doc_id, MAX_UPLOAD_SIZE, FileManager.get_pending_pdf_path(doc_id)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # 현재 PDF와 바이트 단위로 같으면 바뀐 내용이 없으므로 처리 생략
+        if FileManager.find_document_by_hash(file_hash) == doc_id:
+            file_path.unlink()
+            return _duplicate_upload_response(doc_id, file.filename, file_size, reserved=True)
+        
+        job = ingestion_queue.submit_update(doc_id, file_path, file.filename, file_size)
+        submitted = True
         
+        return {
+            "success": True,
+            "message": "개정본 업로드가 완료되어 처리 대기열에 등록되었습니다.",
+            "doc_id": doc_id,
+            "filename": file.filename,
+            "file_size": file_size,
+            "status": job["stage"],
+            "status_url": f"/upload/status/{doc_id}"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"파일 처리 중 오류가 발생했습니다: {str(e)}"
         )
+    finally:
+        if not submitted:
+            ingestion_queue.release(doc_id)
 
 @router.get("/status/{doc_id}")
 async def get_upload_status(doc_id: str) -> Dict[str, Any]:
@@ -92,6 +184,27 @@ async def get_upload_status(doc_id: str) -> Dict[str, Any]:
         문서 상태 정보
     """
     try:
+        # 수집 작업 진행 상황 (단계, 진행률)
+        job = ingestion_queue.get_job(doc_id)
+        ingestion = {
+            "mode": job["mode"],
+            "stage": job["stage"],
+            "percent": job["percent"],
+            "processed": job["processed"],
+            "total": job["total"],
+            "message": job["message"],
+            "error": job["error"],
+            "result": job["result"]
+        } if job else None
+        
+        # 처리 중이거나 실패한 작업은 파일 상태 대신 작업 상태만 반환
+        if job and job["stage"] != "completed":
+            return {
+                "doc_id": doc_id,
+                "filename": job["filename"],
+                "ingestion": ingestion
+            }
+        
         # 파일 존재 확인
         pdf_path = FileManager.get_pdf_path(doc_id)
         vector_path = FileManager.get_vectorstore_path(doc_id)
@@ -109,6 +222,7 @@ async def get_upload_status(doc_id: str) -> Dict[str, Any]:
         
         return {
             "doc_id": doc_id,
+            "ingestion": ingestion or {"stage": "completed", "percent": 100},
             "pdf_exists": pdf_path.exists(),
             "vector_exists": vector_path.exists(),
             "metadata_exists": metadata_path.exists(),
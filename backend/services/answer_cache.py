@@ -0,0 +1,157 @@
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from config import settings
+
+class SemanticAnswerCache:
+    """질문 임베딩의 코사인 유사도로 이전 답변을 재사용하는 캐시 클래스"""
+    
+    def __init__(self, max_entries: int = None, threshold: float = None, ttl_seconds: int = None):
+        """
+        답변 캐시를 초기화합니다.
+        
+        Args:
+            max_entries: 최대 캐시 항목 수 (LRU로 제거)
+            threshold: 캐시 적중으로 볼 최소 코사인 유사도
+            ttl_seconds: 항목 유효 시간 (초)
+        """
+        self.max_entries = max_entries or settings.ANSWER_CACHE_MAX_ENTRIES
+        self.threshold = threshold if threshold is not None else settings.ANSWER_CACHE_THRESHOLD
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.ANSWER_CACHE_TTL_SECONDS
+        
+        self._lock = threading.Lock()
+        self._matrix = None  # [max_entries, dim] 정규화된 질문 임베딩 (슬롯 단위)
+        self._valid = np.zeros(self.max_entries, dtype=bool)
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()  # 슬롯 → 항목 (LRU 순서)
+        self._document_version = None
+        self.hits = 0
+        self.misses = 0
+    
+    def _reset(self):
+        """모든 항목을 제거합니다."""
+        self._valid[:] = False
+        self._entries.clear()
+    
+    def _check_version(self, document_version: int):
+        """문서 집합이 더 새 버전으로 바뀌었으면 캐시 전체를 무효화합니다 (버전은 앞으로만 이동)."""
+        if self._document_version is None or document_version > self._document_version:
+            self._reset()
+            self._document_version = document_version
+    
+    def _evict(self, slot: int):
+        """슬롯의 항목을 제거합니다."""
+        self._valid[slot] = False
+        self._entries.pop(slot, None)
+    
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """코사인 유사도 계산을 위해 임베딩을 정규화합니다."""
+        embedding = embedding.astype(np.float32).reshape(-1)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+    
+    def lookup(self, embedding: np.ndarray, params: Tuple, document_version: int) -> Optional[Dict[str, Any]]:
+        """
+        유사한 이전 질문의 답변을 찾습니다.
+        
+        Args:
+            embedding: 질문 임베딩
+            params: 검색 파라미터 (top_k 등, 일치해야 적중)
+            document_version: 현재 문서 집합 버전
+        
+        Returns:
+            캐시된 답변 결과 또는 None
+        """
+        query = self._normalize(embedding)
+        
+        with self._lock:
+            self._check_version(document_version)
+            
+            if not self._entries or self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+            
+            scores = self._matrix @ query
+            scores[~self._valid] = -np.inf
+            
+            # 유사도 순으로 파라미터가 일치하는 첫 항목 선택
+            for slot in np.argsort(-scores):
+                slot = int(slot)
+                if scores[slot] < self.threshold:
+                    break
+                
+                entry = self._entries[slot]
+                if time.time() - entry["created_at"] > self.ttl_seconds:
+                    self._evict(slot)
+                    continue
+                
+                if entry["params"] != params:
+                    continue
+                
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return entry["result"]
+            
+            self.misses += 1
+            return None
+    
+    def store(self, embedding: np.ndarray, params: Tuple, document_version: int, result: Dict[str, Any]):
+        """
+        답변 결과를 캐시에 저장합니다.
+        
+        Args:
+            embedding: 질문 임베딩
+            params: 검색 파라미터
+            document_version: 답변 생성 시점의 문서 집합 버전
+            result: 답변 결과
+        """
+        vector = self._normalize(embedding)
+        
+        with self._lock:
+            # 생성 도중 문서가 바뀐 답변은 이전 코퍼스 기준이므로 저장하지 않음 (버전도 되돌리지 않음)
+            if document_version != self._document_version:
+                return
+            
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._reset()
+            
+            # 빈 슬롯이 없으면 가장 오래 사용되지 않은 항목을 제거
+            free_slots = np.flatnonzero(~self._valid)
+            if len(free_slots) > 0:
+                slot = int(free_slots[0])
+            else:
+                slot = next(iter(self._entries))
+                self._evict(slot)
+            
+            self._matrix[slot] = vector
+            self._valid[slot] = True
+            self._entries[slot] = {
+                "params": params,
+                "result": result,
+                "created_at": time.time()
+            }
+    
+    def clear(self):
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._reset()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """캐시 통계 정보를 반환합니다."""
+        total = self.hits + self.misses
+        return {
+            "enabled": settings.ANSWER_CACHE_ENABLED,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+# 글로벌 답변 캐시 인스턴스
+answer_cache = SemanticAnswerCache()
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+from utils.file_utils import FileManager
+
+class ChunkStore:
+    """
+    청크 메타데이터를 열 단위 바이너리 파일로 저장하고 메모리 매핑으로 조회하는 클래스
+    
+    - {doc_id}_chunks.npy: 고정 폭 레코드 배열 (offset, length, chunk_id, page)
+    - {doc_id}_chunks.bin: 모든 청크 본문을 이어 붙인 UTF-8 블롭
+    
+    두 파일 모두 메모리 매핑으로 열기 때문에 로드는 파일 크기와 무관하게 O(1)이며,
+    실제로 조회된 청크의 본문만 디코딩됩니다.
+    """
+    
+    FORMAT = "chunkstore-v1"
+    RECORD_DTYPE = np.dtype([
+        ("offset", "<i8"),
+        ("length", "<i4"),
+        ("chunk_id", "<i4"),
+        ("page", "<i4")
+    ])
+    
+    def __init__(self, doc_id: str):
+        """
+        문서별 청크 저장소를 초기화합니다.
+        
+        Args:
+            doc_id: 문서 ID
+        """
+        self.doc_id = doc_id
+        self.table_path = FileManager.get_chunk_table_path(doc_id)
+        self.text_path = FileManager.get_chunk_text_path(doc_id)
+        self._records = None
+        self._text_file = None
+        self._text = None
+    
+    def exists(self) -> bool:
+        """청크 파일이 모두 존재하는지 확인합니다."""
+        return self.table_path.exists() and self.text_path.exists()
+    
+    def open(self) -> bool:
+        """
+        청크 파일을 메모리 매핑으로 엽니다.
+        
+        Returns:
+            열기 성공 여부
+        """
+        if not self.exists():
+            return False
+        
+        self.close()
+        try:
+            self._records = np.load(self.table_path, mmap_mode="r")
+        except ValueError:
+            # 청크가 없는 빈 배열은 mmap할 수 없으므로 일반 로드
+            self._records = np.load(self.table_path)
+        
+        # 빈 파일은 mmap할 수 없으므로 빈 바이트열로 대체
+        if self.text_path.stat().st_size > 0:
+            self._text_file = open(self.text_path, "rb")
+            self._text = mmap.mmap(self._text_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._text = b""
+        return True
+    
+    def close(self):
+        """메모리 매핑을 해제합니다."""
+        if isinstance(self._text, mmap.mmap):
+            self._text.close()
+        if self._text_file is not None:
+            self._text_file.close()
+        self._records = None
+        self._text_file = None
+        self._text = None
+    
+    def __len__(self) -> int:
+        return len(self._records) if self._records is not None else 0
+    
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        """청크 하나를 디코딩하여 {"chunk_id", "page", "content"} 형태로 반환합니다."""
+        if self._records is None:
+            raise IndexError("청크 저장소가 열려있지 않습니다.")
+        
+        record = self._records[idx]
+        offset = int(record["offset"])
+        length = int(record["length"])
+        return {
+            "chunk_id": int(record["chunk_id"]),
+            "page": int(record["page"]),
+            "content": self._text[offset:offset + length].decode("utf-8")
+        }
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for idx in range(len(self)):
+            yield self[idx]
+    
+    @property
+    def pages(self) -> np.ndarray:
+        """청크별 페이지 번호 열을 반환합니다 (본문 디코딩 없음)."""
+        return np.asarray(self._records["page"]) if self._records is not None else np.array([], dtype=np.int32)
+    
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """청크 본문의 내용 해시(SHA-256)를 반환합니다."""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    def size_bytes(self) -> int:
+        """청크 파일의 디스크 사용량(바이트)을 반환합니다."""
+        return sum(path.stat().st_size for path in (self.table_path, self.text_path) if path.exists())
+    
+    @staticmethod
+    def write(doc_id: str, chunks: Iterable[Dict[str, Any]]) -> int:
+        """
+        청크 리스트를 바이너리 형식으로 저장합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            chunks: 청크 메타데이터 이터러블
+        
+        Returns:
+            저장된 청크 수
+        """
+        writer = ChunkStoreWriter(doc_id)
+        try:
+            writer.append(chunks)
+            return writer.finalize()
+        except Exception:
+            writer.abort()
+            raise
+    
+    @staticmethod
+    def migrate_json_metadata(doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        청크 본문이 들어 있는 구 형식 JSON 메타데이터를 바이너리 청크 파일로 변환합니다.
+        
+        변환 후 {doc_id}_metadata.json에는 청크를 제외한 헤더만 남습니다.
+        이미 새 형식이면 아무 작업도 하지 않습니다.
+        
+        Args:
+            doc_id: 문서 ID
+        
+        Returns:
+            헤더 메타데이터 또는 None (메타데이터 파일이 없는 경우)
+        """
+        metadata_path = FileManager.get_metadata_path(doc_id)
+        if not metadata_path.exists():
+            return None
+        
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        
+        # 가장 오래된 형식은 청크 리스트만 저장되어 있음
+        if isinstance(metadata, list):
+            metadata = {"original_filename": None, "doc_id": doc_id, "chunks": metadata}
+        
+        if "chunks" not in metadata:
+            return metadata
+        
+        chunks = metadata.pop("chunks")
+        total_chunks = ChunkStore.write(doc_id, chunks)
+        metadata["total_chunks"] = total_chunks
+        metadata["format"] = ChunkStore.FORMAT
+        write_metadata_header(metadata_path, metadata)
+        
+        print(f"메타데이터 변환 완료: {doc_id} ({total_chunks}개 청크)")
+        return metadata
+
+class ChunkStoreWriter:
+    """청크를 스트리밍으로 받아 바이너리 청크 파일을 기록하는 클래스"""
+    
+    def __init__(self, doc_id: str):
+        """
+        청크 파일 기록을 시작합니다. 본문은 바로 임시 파일에 기록되고
+        레코드(청크당 20바이트)만 메모리에 모았다가 finalize 시 저장합니다.
+        
+        Args:
+            doc_id: 문서 ID
+        """
+        self.doc_id = doc_id
+        self.table_path = FileManager.get_chunk_table_path(doc_id)
+        self.text_path = FileManager.get_chunk_text_path(doc_id)
+        self._temp_table_path = _temp_path(self.table_path)
+        self._temp_text_path = _temp_path(self.text_path)
+        self._records: List[tuple] = []
+        self._offset = 0
+        self._text_file = open(self._temp_text_path, 'wb')
+    
+    def append(self, chunks: Iterable[Dict[str, Any]]):
+        """청크 메타데이터를 추가합니다."""
+        for chunk in chunks:
+            data = chunk["content"].encode("utf-8")
+            self._text_file.write(data)
+            self._records.append((
+                self._offset, len(data), chunk.get("chunk_id", len(self._records)), chunk.get("page", 0)
+            ))
+            self._offset += len(data)
+    
+    def finalize(self) -> int:
+        """
+        기록을 마치고 청크 파일을 확정합니다.
+        
+        Returns:
+            저장된 청크 수
+        """
+        self._text_file.close()
+        
+        records = np.array(self._records, dtype=ChunkStore.RECORD_DTYPE)
+        with open(self._temp_table_path, 'wb') as f:
+            np.save(f, records)
+        
+        self._temp_table_path.replace(self.table_path)
+        self._temp_text_path.replace(self.text_path)
+        return len(records)
+    
+    def abort(self):
+        """기록을 취소하고 임시 파일을 정리합니다."""
+        if not self._text_file.closed:
+            self._text_file.close()
+        for path in (self._temp_table_path, self._temp_text_path):
+            if path.exists():
+                path.unlink()
+
+def _temp_path(path: Path) -> Path:
+    """여러 워커 프로세스·스레드가 동시에 기록해도 겹치지 않는 임시 파일 경로를 반환합니다."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def write_metadata_header(metadata_path: Path, metadata: Dict[str, Any]):
+    """청크를 제외한 메타데이터 헤더를 임시 파일을 거쳐 원자적으로 저장합니다."""
+    temp_path = _temp_path(metadata_path)
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    temp_path.replace(metadata_path)
\ No newline at end of file
@@ -0,0 +1,148 @@
+import math
+from typing import List, Dict, Any, Optional, Set
+from config import settings
+
+class ContextBuilder:
+    """
+    검색된 청크로 프롬프트의 참고 자료 블록을 구성하는 클래스
+    
+    같은 문서, 같은 페이지에서 연달아 검색된 청크는 CHUNK_OVERLAP으로 겹친 부분을 한 번만
+    남기고 하나의 블록으로 합치며, 거의 같은 내용의 블록은 제외합니다. 이후 검색 순위가 높은
+    블록부터 토큰 예산(CONTEXT_TOKEN_BUDGET) 안에 들어가는 만큼만 담습니다.
+    """
+    
+    SHINGLE_SIZE = 3
+    
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        텍스트의 토큰 수를 추정합니다.
+        
+        Gemini 토크나이저를 로컬에서 쓸 수 없으므로 영문/숫자는 약 4자, 한글 등은
+        약 1.5자를 1토큰으로 계산하는 보수적인 근사치를 사용합니다.
+        """
+        ascii_chars = sum(1 for char in text if char.isascii() and not char.isspace())
+        other_chars = sum(1 for char in text if not char.isascii())
+        return math.ceil(ascii_chars / 4 + other_chars / 1.5)
+    
+    @staticmethod
+    def _overlap_length(previous: str, following: str) -> int:
+        """previous의 끝과 following의 시작이 겹치는 길이를 반환합니다 (없으면 0)."""
+        max_overlap = min(len(previous), len(following))
+        probe = following[:min(max_overlap, 32)]
+        if not probe:
+            return 0
+        
+        # 겹침은 CHUNK_OVERLAP 이내이므로 previous의 끝부분만, 가장 짧은 겹침부터 확인
+        search_from = max(0, len(previous) - max(settings.CHUNK_OVERLAP, len(probe)) * 2)
+        index = previous.rfind(probe, search_from)
+        while index != -1:
+            if following.startswith(previous[index:]):
+                return len(previous) - index
+            index = previous.rfind(probe, search_from, index + len(probe) - 1)
+        return 0
+    
+    @staticmethod
+    def _shingles(text: str) -> Set[str]:
+        """근접 중복 판정용 문자 n-gram 집합을 반환합니다 (공백 무시)."""
+        compact = "".join(text.split())
+        size = ContextBuilder.SHINGLE_SIZE
+        if len(compact) <= size:
+            return {compact}
+        return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+    
+    @staticmethod
+    def _merge_blocks(retrieved_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """같은 문서/페이지의 인접한 청크를 겹침을 제거하여 블록으로 합칩니다."""
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for rank, chunk_data in enumerate(retrieved_chunks):
+            chunk = chunk_data["chunk"]
+            key = (chunk_data.get("doc_id"), chunk.get("page"))
+            groups.setdefault(key, []).append({**chunk_data, "_rank": rank})
+        
+        blocks = []
+        for (doc_id, page), members in groups.items():
+            members.sort(key=lambda item: item["chunk"].get("chunk_id", 0))
+            
+            current: Optional[Dict[str, Any]] = None
+            for item in members:
+                chunk = item["chunk"]
+                if current is not None:
+                    overlap = ContextBuilder._overlap_length(current["content"], chunk["content"])
+                    adjacent = chunk.get("chunk_id", 0) - current["last_chunk_id"] == 1
+                    if overlap or adjacent:
+                        separator = "" if overlap else "\n"
+                        current["content"] += separator + chunk["content"][overlap:]
+                        current["last_chunk_id"] = chunk.get("chunk_id", 0)
+                        current["score"] = max(current["score"], item["score"])
+                        current["rank"] = min(current["rank"], item["_rank"])
+                        current["merged"] += 1
+                        continue
+                    blocks.append(current)
+                
+                current = {
+                    "doc_id": doc_id,
+                    "page": page,
+                    "content": chunk["content"],
+                    "last_chunk_id": chunk.get("chunk_id", 0),
+                    "score": item["score"],
+                    "rank": item["_rank"],
+                    "merged": 1
+                }
+            if current is not None:
+                blocks.append(current)
+        
+        blocks.sort(key=lambda block: block["rank"])
+        return blocks
+    
+    @staticmethod
+    def build(
+        retrieved_chunks: List[Dict[str, Any]],
+        token_budget: int = None,
+        dedup_threshold: float = None
+    ) -> List[Dict[str, Any]]:
+        """
+        검색 결과를 병합/중복 제거 후 토큰 예산에 맞게 선택합니다.
+        
+        Args:
+            retrieved_chunks: 검색 결과 (순위 순)
+            token_budget: 참고 자료 전체의 최대 추정 토큰 수 (0 이하이면 제한 없음)
+            dedup_threshold: 이 값 이상의 자카드 유사도를 가진 블록은 중복으로 제외
+        
+        Returns:
+            [{"doc_id", "page", "content", "score", "merged", "tokens"}] 검색 순위 순
+        """
+        if token_budget is None:
+            token_budget = settings.CONTEXT_TOKEN_BUDGET
+        if dedup_threshold is None:
+            dedup_threshold = settings.CONTEXT_DEDUP_THRESHOLD
+        
+        selected = []
+        selected_shingles: List[Set[str]] = []
+        used_tokens = 0
+        
+        for block in ContextBuilder._merge_blocks(retrieved_chunks):
+            shingles = ContextBuilder._shingles(block["content"])
+            if any(
+                len(shingles & other) / len(shingles | other) >= dedup_threshold
+                or shingles <= other
+                for other in selected_shingles
+            ):
+                continue
+            
+            tokens = ContextBuilder.estimate_tokens(block["content"])
+            if token_budget > 0 and used_tokens + tokens > token_budget:
+                if selected:
+                    continue  # 더 짧은 하위 블록이 남은 예산에 들어갈 수 있음
+                
+                # 최상위 블록 하나가 예산보다 크면 예산만큼 잘라서라도 포함
+                keep_chars = max(1, int(len(block["content"]) * token_budget / tokens))
+                block["content"] = block["content"][:keep_chars]
+                tokens = ContextBuilder.estimate_tokens(block["content"])
+            
+            block["tokens"] = tokens
+            selected.append(block)
+            selected_shingles.append(shingles)
+            used_tokens += tokens
+        
+        return selected
\ No newline at end of file
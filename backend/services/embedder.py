@@ -1,6 +1,11 @@
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import List
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any
 from config import settings
 
 class TextEmbedder:
@@ -10,21 +15,36 @@ class TextEmbedder:
         """임베딩 모델을 초기화합니다."""
         self.model = None
         self._load_model()
+        
+        # 쿼리 임베딩 LRU 캐시 (정규화된 텍스트 → float32 벡터)
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._load_cache()
     
     def _load_model(self):
         """임베딩 모델을 로드합니다."""
         try:
-            self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
-            print(f"임베딩 모델 로드 완료: {settings.EMBEDDING_MODEL}")
+            if settings.EMBEDDING_BACKEND in ("onnx", "onnx_int8"):
+                from services.onnx_embedder import OnnxSentenceEncoder
+                self.model = OnnxSentenceEncoder(
+                    settings.EMBEDDING_MODEL, quantize=settings.EMBEDDING_BACKEND == "onnx_int8"
+                )
+            else:
+                self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
+            print(f"임베딩 모델 로드 완료: {settings.EMBEDDING_MODEL} ({settings.EMBEDDING_BACKEND})")
         except Exception as e:
             raise Exception(f"임베딩 모델 로드 실패: {str(e)}")
     
-    def encode_texts(self, texts: List[str]) -> np.ndarray:
+    def encode_texts(self, texts: List[str], show_progress_bar: bool = True, batch_size: int = 32) -> np.ndarray:
         """
         텍스트 리스트를 임베딩 벡터로 변환합니다.
         
         Args:
             texts: 임베딩할 텍스트 리스트
+            show_progress_bar: 진행률 표시 여부 (쿼리 배치에서는 끔)
+            batch_size: 모델 추론 배치 크기
             
         Returns:
             임베딩 벡터 배열 (shape: [len(texts), embedding_dim])
@@ -45,8 +65,8 @@ class TextEmbedder:
             # 임베딩 생성
             embeddings = self.model.encode(
                 valid_texts,
-                batch_size=32,
-                show_progress_bar=True,
+                batch_size=batch_size,
+                show_progress_bar=show_progress_bar,
                 convert_to_numpy=True,
                 normalize_embeddings=True  # 코사인 유사도 최적화
             )
@@ -69,8 +89,137 @@ class TextEmbedder:
         if not text.strip():
             raise ValueError("빈 텍스트는 임베딩할 수 없습니다.")
         
-        embeddings = self.encode_texts([text])
-        return embeddings[0] if len(embeddings) > 0 else np.array([])
+        cached = self.get_cached_embedding(text)
+        if cached is not None:
+            return cached
+        
+        embeddings = self.encode_texts([text], show_progress_bar=False)
+        if len(embeddings) == 0:
+            return np.array([])
+        
+        embedding = embeddings[0].astype(np.float32)
+        self.cache_embedding(text, embedding)
+        return embedding.copy()
+    
+    def get_cached_embedding(self, text: str):
+        """
+        캐시된 쿼리 임베딩을 반환합니다.
+        
+        Args:
+            text: 쿼리 텍스트
+            
+        Returns:
+            임베딩 벡터 복사본 또는 None
+        """
+        return self._cache_get(self._cache_key(text))
+    
+    def cache_embedding(self, text: str, embedding: np.ndarray):
+        """
+        쿼리 임베딩을 캐시에 저장합니다.
+        
+        Args:
+            text: 쿼리 텍스트
+            embedding: 임베딩 벡터
+        """
+        self._cache_put(self._cache_key(text), embedding.astype(np.float32))
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """캐시 키용으로 텍스트를 정규화합니다 (유니코드 NFC, 공백 정리)."""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+    
+    def _cache_get(self, key: str):
+        """캐시에서 벡터를 찾아 복사본을 반환합니다 (없으면 None)."""
+        if settings.EMBEDDING_CACHE_SIZE <= 0:
+            return None
+        
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is None:
+                self.cache_misses += 1
+                return None
+            
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return embedding.copy()
+    
+    def _cache_put(self, key: str, embedding: np.ndarray):
+        """벡터를 캐시에 저장하고 크기를 초과하면 가장 오래된 항목을 제거합니다."""
+        if settings.EMBEDDING_CACHE_SIZE <= 0:
+            return
+        
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > settings.EMBEDDING_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _load_cache(self):
+        """EMBEDDING_CACHE_PATH가 지정되어 있으면 디스크에서 캐시를 복원합니다."""
+        if not settings.EMBEDDING_CACHE_PATH or settings.EMBEDDING_CACHE_SIZE <= 0:
+            return
+        
+        cache_path = Path(settings.EMBEDDING_CACHE_PATH)
+        if not cache_path.exists():
+            return
+        
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                if "model" not in data.files or str(data["model"]) != self._cache_signature():
+                    # 다른 모델/백엔드/차원으로 만든 벡터는 재사용할 수 없음
+                    print("임베딩 캐시 무시: 모델 설정이 변경되었습니다.")
+                    return
+                keys = data["keys"]
+                vectors = data["vectors"]
+            
+            # 최근 항목이 뒤에 저장되어 있으므로 크기 제한 내에서 뒤쪽을 유지
+            for key, vector in list(zip(keys, vectors))[-settings.EMBEDDING_CACHE_SIZE:]:
+                self._cache[str(key)] = vector.astype(np.float32)
+            
+            print(f"임베딩 캐시 로드 완료: {len(self._cache)}개 항목")
+        except Exception as e:
+            print(f"임베딩 캐시 로드 실패: {str(e)}")
+    
+    def _cache_signature(self) -> str:
+        """캐시 벡터를 만든 모델 이름, 백엔드, 차원을 하나의 문자열로 반환합니다."""
+        return f"{settings.EMBEDDING_MODEL}|{settings.EMBEDDING_BACKEND}|{self.get_embedding_dimension()}"
+    
+    def save_cache(self):
+        """EMBEDDING_CACHE_PATH가 지정되어 있으면 캐시를 디스크에 저장합니다."""
+        if not settings.EMBEDDING_CACHE_PATH or settings.EMBEDDING_CACHE_SIZE <= 0:
+            return
+        
+        with self._cache_lock:
+            if not self._cache:
+                return
+            keys = np.array(list(self._cache.keys()))
+            vectors = np.vstack(list(self._cache.values())).astype(np.float32)
+        
+        try:
+            cache_path = Path(settings.EMBEDDING_CACHE_PATH)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # 저장 도중 종료되어도 기존 파일이 깨지지 않도록 임시 파일 후 교체
+            temp_path = cache_path.with_name(cache_path.name + ".tmp")
+            with open(temp_path, 'wb') as f:
+                np.savez(f, keys=keys, vectors=vectors, model=np.array(self._cache_signature()))
+            temp_path.replace(cache_path)
+            
+            print(f"임베딩 캐시 저장 완료: {len(keys)}개 항목")
+        except Exception as e:
+            print(f"임베딩 캐시 저장 실패: {str(e)}")
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """쿼리 임베딩 캐시 통계 정보를 반환합니다."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._cache),
+            "max_size": settings.EMBEDDING_CACHE_SIZE,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / total, 4) if total else 0.0,
+            "persistent": bool(settings.EMBEDDING_CACHE_PATH)
+        }
     
     def get_embedding_dimension(self) -> int:
         """임베딩 벡터의 차원을 반환합니다."""
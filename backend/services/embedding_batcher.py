@@ -0,0 +1,133 @@
+import asyncio
+import time
+import numpy as np
+from typing import Dict, List, Tuple, Optional
+from config import settings
+from services.embedder import embedder, TextEmbedder
+
+class EmbeddingBatcher:
+    """동시에 들어온 쿼리 임베딩 요청을 모아 한 번의 model.encode로 처리하는 마이크로 배처"""
+    
+    def __init__(self, text_embedder: TextEmbedder = None, max_batch_size: int = None, max_wait_ms: float = None):
+        """
+        마이크로 배처를 초기화합니다.
+        
+        Args:
+            text_embedder: 사용할 임베더 (기본값: 글로벌 임베더)
+            max_batch_size: 한 번에 인코딩할 최대 쿼리 수
+            max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 최대 시간 (밀리초)
+        """
+        self.embedder = text_embedder or embedder
+        self.max_batch_size = max_batch_size or settings.EMBEDDING_BATCH_MAX_SIZE
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.batched_requests = 0
+    
+    def _ensure_worker(self):
+        """현재 이벤트 루프에서 배치 워커를 시작합니다."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+    
+    async def encode(self, text: str) -> np.ndarray:
+        """
+        단일 쿼리를 임베딩합니다. 캐시에 없으면 배치 큐를 거쳐 인코딩됩니다.
+        
+        Args:
+            text: 임베딩할 텍스트
+        
+        Returns:
+            임베딩 벡터 (shape: [embedding_dim])
+        """
+        if not text.strip():
+            raise ValueError("빈 텍스트는 임베딩할 수 없습니다.")
+        
+        cached = self.embedder.get_cached_embedding(text)
+        if cached is not None:
+            return cached
+        
+        if not settings.EMBEDDING_BATCHING_ENABLED:
+            # 위에서 캐시를 이미 확인했으므로 캐시 확인 없이 인코딩 (미스가 두 번 집계되지 않도록)
+            vectors = await asyncio.to_thread(self._encode_and_cache, [text])
+            return vectors[text].copy()
+        
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    def _encode_and_cache(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """캐시 확인 없이 텍스트를 인코딩하고 결과를 캐시에 저장합니다 (워커 스레드에서 호출)."""
+        embeddings = self.embedder.encode_texts(texts, False)
+        vectors = {
+            text: embedding.astype(np.float32)
+            for text, embedding in zip(texts, embeddings)
+        }
+        for text, vector in vectors.items():
+            self.embedder.cache_embedding(text, vector)
+        return vectors
+    
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """첫 요청을 기다린 뒤 최대 대기 시간 또는 최대 배치 크기까지 요청을 모읍니다."""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _run(self):
+        """배치를 모아 워커 스레드에서 인코딩하고 각 요청의 future를 완료합니다."""
+        while True:
+            batch = await self._collect_batch()
+            
+            # 같은 배치 안의 중복 쿼리는 한 번만 인코딩
+            unique_texts = list(dict.fromkeys(text for text, _ in batch))
+            
+            try:
+                vectors = await asyncio.to_thread(self._encode_and_cache, unique_texts)
+                
+                for text, future in batch:
+                    if not future.done():
+                        future.set_result(vectors[text].copy())
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            
+            self.batches += 1
+            self.batched_requests += len(batch)
+    
+    async def aclose(self):
+        """배치 워커를 중지합니다."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+    
+    def get_statistics(self) -> dict:
+        """배치 처리 통계 정보를 반환합니다."""
+        return {
+            "enabled": settings.EMBEDDING_BATCHING_ENABLED,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "batched_requests": self.batched_requests,
+            "average_batch_size": round(self.batched_requests / self.batches, 2) if self.batches else 0.0
+        }
+
+# 글로벌 임베딩 배처 인스턴스
+embedding_batcher = EmbeddingBatcher()
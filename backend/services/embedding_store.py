@@ -0,0 +1,291 @@
+import sqlite3
+import threading
+import numpy as np
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterable
+from config import settings
+from services.chunk_store import ChunkStore
+
+class ChunkEmbeddingStore:
+    """
+    청크 본문 해시 → 임베딩을 영구 저장하는 내용 주소 기반 저장소
+    
+    여러 문서(학기 안내, 학과 공지 등)에 똑같이 들어 있는 문단은 한 번만 임베딩하고,
+    이후 수집에서는 모델 추론 없이 저장된 벡터를 재사용합니다. 키에 모델 이름이
+    포함되므로 임베딩 모델을 바꾸면 자동으로 새로 계산됩니다.
+    
+    각 임베딩은 참조하는 문서 수(청크 수)만큼의 참조 카운트를 가지며,
+    문서가 삭제되어 카운트가 0이 되면 제거됩니다.
+    """
+    
+    def __init__(self, db_path: Path = None, model_name: str = None, enabled: bool = None):
+        """
+        임베딩 저장소를 초기화합니다.
+        
+        Args:
+            db_path: SQLite 파일 경로 (기본값: 설정에서 가져옴)
+            model_name: 임베딩 모델 이름 (기본값: 설정에서 가져옴)
+            enabled: 사용 여부 (기본값: 설정에서 가져옴)
+        """
+        self.db_path = Path(db_path or settings.EMBEDDING_STORE_PATH)
+        # int8 양자화 모델의 벡터는 원본과 미세하게 다르므로 별도 키로 저장
+        default_model = settings.EMBEDDING_MODEL
+        if settings.EMBEDDING_BACKEND == "onnx_int8":
+            default_model = f"{default_model}@int8"
+        self.model_name = model_name or default_model
+        self.enabled = enabled if enabled is not None else settings.EMBEDDING_STORE_ENABLED
+        
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        """최초 사용 시 DB에 연결하고 테이블을 생성합니다."""
+        if self._conn is not None:
+            return self._conn
+        
+        # 여러 워커 프로세스가 같은 파일을 쓰므로 WAL 모드와 잠금 대기 시간 사용
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                refcount INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (model, content_hash)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS document_refs (
+                doc_id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (doc_id, model, content_hash)
+            )
+        """)
+        conn.commit()
+        
+        self._conn = conn
+        return conn
+    
+    def lookup(self, hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        저장된 임베딩을 조회합니다.
+        
+        Args:
+            hashes: 청크 본문 해시 목록
+        
+        Returns:
+            해시 → 임베딩 벡터 (저장된 것만)
+        """
+        unique_hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, np.ndarray] = {}
+        
+        with self._lock:
+            conn = self._connect()
+            # SQLite 바인딩 변수 수 제한을 피하기 위해 나누어 조회
+            for start in range(0, len(unique_hashes), 500):
+                batch = unique_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND content_hash IN ({placeholders})",
+                    [self.model_name, *batch]
+                ).fetchall()
+                for content_hash, vector in rows:
+                    found[content_hash] = np.frombuffer(vector, dtype=np.float32)
+        
+        return found
+    
+    def store(self, vectors: Dict[str, np.ndarray]):
+        """
+        새 임베딩을 저장합니다 (참조 카운트 0, 이미 있으면 무시).
+        
+        Args:
+            vectors: 해시 → 임베딩 벡터
+        """
+        rows = [
+            (self.model_name, content_hash, int(vector.shape[-1]), np.asarray(vector, dtype=np.float32).tobytes())
+            for content_hash, vector in vectors.items()
+        ]
+        
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, content_hash, dimension, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            conn.commit()
+    
+    def encode_texts(self, texts: List[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        저장소에 없는 텍스트만 모델로 임베딩하고, 결과를 입력 순서대로 반환합니다.
+        
+        Args:
+            texts: 임베딩할 청크 본문 리스트
+            encode: 텍스트 리스트를 임베딩 배열로 변환하는 함수 (저장소 미스에만 호출)
+        
+        Returns:
+            임베딩 벡터 배열 (shape: [len(texts), embedding_dim])
+        """
+        if not self.enabled:
+            return encode(texts)
+        
+        hashes = [ChunkStore.content_hash(text) for text in texts]
+        vectors = self.lookup(hashes)
+        
+        # 저장소 미스 (같은 배치 안의 중복은 한 번만 인코딩)
+        missing = {content_hash: text for content_hash, text in zip(hashes, texts) if content_hash not in vectors}
+        if missing:
+            embeddings = encode(list(missing.values()))
+            if len(embeddings) != len(missing):
+                raise ValueError("임베딩 생성에 실패했습니다.")
+            
+            new_vectors = {
+                content_hash: embedding.astype(np.float32)
+                for content_hash, embedding in zip(missing.keys(), embeddings)
+            }
+            self.store(new_vectors)
+            vectors.update(new_vectors)
+        
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        
+        return np.vstack([vectors[content_hash] for content_hash in hashes])
+    
+    def _apply_reference_delta(self, conn: sqlite3.Connection, doc_id: str, counts: Counter, sign: int):
+        """문서 참조와 임베딩 참조 카운트를 함께 증감합니다 (트랜잭션 안에서 호출)."""
+        for content_hash, count in counts.items():
+            conn.execute(
+                "UPDATE embeddings SET refcount = refcount + ? WHERE model = ? AND content_hash = ?",
+                (sign * count, self.model_name, content_hash)
+            )
+        
+        if sign > 0:
+            conn.executemany(
+                "INSERT INTO document_refs (doc_id, model, content_hash, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (doc_id, model, content_hash) DO UPDATE SET count = count + excluded.count",
+                [(doc_id, self.model_name, content_hash, count) for content_hash, count in counts.items()]
+            )
+        else:
+            conn.execute("DELETE FROM document_refs WHERE doc_id = ? AND model = ?", (doc_id, self.model_name))
+    
+    def _document_counts(self, conn: sqlite3.Connection, doc_id: str) -> Counter:
+        """문서가 참조 중인 해시별 청크 수를 반환합니다."""
+        rows = conn.execute(
+            "SELECT content_hash, count FROM document_refs WHERE doc_id = ? AND model = ?",
+            (doc_id, self.model_name)
+        ).fetchall()
+        return Counter(dict(rows))
+    
+    def _evict_unreferenced(self, conn: sqlite3.Connection, content_hashes: Iterable[str]) -> int:
+        """
+        이번 트랜잭션에서 참조를 줄인 해시 중 참조 카운트가 0 이하가 된 임베딩을 제거합니다.
+        
+        참조 카운트 0인 다른 임베딩은 진행 중인 수집 작업이 방금 저장하고 아직 참조를
+        추가하지 않은 것일 수 있으므로 건드리지 않습니다.
+        """
+        cursor = conn.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND content_hash = ? AND refcount <= 0",
+            [(self.model_name, content_hash) for content_hash in content_hashes]
+        )
+        return max(cursor.rowcount, 0)
+    
+    def add_references(self, doc_id: str, texts: List[str]):
+        """
+        문서가 사용하는 청크의 참조를 추가합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            texts: 문서에 새로 추가된 청크 본문 리스트
+        """
+        if not self.enabled or not texts:
+            return
+        
+        counts = Counter(ChunkStore.content_hash(text) for text in texts)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._apply_reference_delta(conn, doc_id, counts, 1)
+    
+    def set_references(self, doc_id: str, texts: List[str]) -> int:
+        """
+        문서의 참조를 새 청크 목록으로 교체합니다 (개정본 반영 시).
+        
+        Args:
+            doc_id: 문서 ID
+            texts: 문서의 전체 청크 본문 리스트
+        
+        Returns:
+            제거된 임베딩 수
+        """
+        if not self.enabled:
+            return 0
+        
+        counts = Counter(ChunkStore.content_hash(text) for text in texts)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                released = self._document_counts(conn, doc_id)
+                self._apply_reference_delta(conn, doc_id, released, -1)
+                self._apply_reference_delta(conn, doc_id, counts, 1)
+                return self._evict_unreferenced(conn, released)
+    
+    def release_document(self, doc_id: str) -> int:
+        """
+        삭제된 문서의 참조를 해제하고 더 이상 참조되지 않는 임베딩을 제거합니다.
+        
+        Args:
+            doc_id: 문서 ID
+        
+        Returns:
+            제거된 임베딩 수
+        """
+        if not self.enabled:
+            return 0
+        
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                released = self._document_counts(conn, doc_id)
+                self._apply_reference_delta(conn, doc_id, released, -1)
+                return self._evict_unreferenced(conn, released)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """임베딩 저장소 통계 정보를 반환합니다."""
+        if not self.enabled:
+            return {"enabled": False}
+        
+        with self._lock:
+            conn = self._connect()
+            entries, total_refs = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(refcount), 0) FROM embeddings WHERE model = ?",
+                (self.model_name,)
+            ).fetchone()
+        
+        total = self.hits + self.misses
+        return {
+            "enabled": True,
+            "path": str(self.db_path),
+            "entries": entries,
+            "total_references": total_refs,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+    
+    def close(self):
+        """DB 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# 글로벌 청크 임베딩 저장소 인스턴스
+chunk_embedding_store = ChunkEmbeddingStore()
\ No newline at end of file
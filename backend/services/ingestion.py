@@ -0,0 +1,396 @@
+import threading
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable, Iterator, List
+from config import settings
+from utils.file_utils import FileManager
+from utils.document_catalog import document_catalog
+from utils.metrics import StageTimer, ingest_stage_seconds, ingest_documents_total
+from services.pdf_processor import PDFProcessor
+from services.embedder import embedder
+from services.embedding_store import chunk_embedding_store
+from services.vector_store import VectorStoreManager
+
+class IngestionQueue:
+    """PDF 수집(추출 → 분할 → 임베딩 → 인덱싱) 작업을 백그라운드 워커 풀에서 처리하는 클래스"""
+    
+    # 단계별 진행률 구간 (시작 %, 끝 %)
+    STAGE_RANGES = {
+        "queued": (0, 0),
+        "extracting": (0, 5),
+        "embedding": (5, 95),  # 추출/분할/임베딩이 스트림으로 함께 진행 (페이지 기준)
+        "indexing": (95, 100),
+        "completed": (100, 100),
+        "failed": (100, 100)
+    }
+    
+    def __init__(self, max_workers: int = None):
+        """
+        작업 큐를 초기화합니다.
+        
+        Args:
+            max_workers: 동시에 처리할 최대 수집 작업 수 (기본값: 설정에서 가져옴)
+        """
+        self.max_workers = max_workers or settings.INGEST_MAX_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ingest")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, doc_id: str, file_path: Path, filename: str, file_size: int) -> Dict[str, Any]:
+        """
+        수집 작업을 등록하고 즉시 반환합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            file_path: 저장된 PDF 경로
+            filename: 원본 파일명
+            file_size: 파일 크기 (바이트)
+        
+        Returns:
+            등록된 작업 상태
+        """
+        self._register_job(doc_id, filename, file_size, "create")
+        self._executor.submit(self._process, doc_id, file_path, filename, file_size)
+        return self.get_job(doc_id)
+    
+    def submit_update(self, doc_id: str, file_path: Path, filename: str, file_size: int) -> Dict[str, Any]:
+        """
+        기존 문서의 개정본 반영 작업을 등록하고 즉시 반환합니다.
+        
+        Args:
+            doc_id: 갱신할 문서 ID
+            file_path: 개정본 PDF의 임시 경로
+            filename: 업로드된 파일명
+            file_size: 파일 크기 (바이트)
+        
+        Returns:
+            등록된 작업 상태
+        """
+        self._register_job(doc_id, filename, file_size, "update")
+        self._executor.submit(self._process_update, doc_id, file_path, filename, file_size)
+        return self.get_job(doc_id)
+    
+    def try_reserve(self, doc_id: str, filename: str, mode: str = "update") -> bool:
+        """
+        문서의 작업 자리를 미리 확보합니다 (업로드 저장 전에 호출).
+        
+        진행 중인 작업 확인과 등록을 한 번의 락 안에서 수행하므로, 같은 문서에 대한
+        동시 요청 중 하나만 성공합니다. 이후 submit/submit_update로 실제 작업을 등록하거나
+        release로 확보를 해제해야 합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            filename: 업로드된 파일명
+            mode: 작업 종류 (create, update)
+        
+        Returns:
+            확보 성공 여부 (이미 진행 중인 작업이 있으면 False)
+        """
+        self._prune_finished_jobs()
+        job = self._new_job(doc_id, filename, 0, mode, "업로드를 수신하고 있습니다.")
+        
+        with self._lock:
+            current = self._jobs.get(doc_id)
+            if current is not None and current["stage"] not in ("completed", "failed"):
+                return False
+            self._jobs[doc_id] = job
+            return True
+    
+    def release(self, doc_id: str):
+        """try_reserve로 확보한 뒤 작업을 등록하지 않은 자리를 해제합니다."""
+        with self._lock:
+            job = self._jobs.get(doc_id)
+            if job is not None and job["stage"] == "queued":
+                del self._jobs[doc_id]
+    
+    def _register_job(self, doc_id: str, filename: str, file_size: int, mode: str):
+        """대기 상태의 작업을 등록합니다."""
+        self._prune_finished_jobs()
+        job = self._new_job(doc_id, filename, file_size, mode, "처리 대기 중입니다.")
+        
+        with self._lock:
+            self._jobs[doc_id] = job
+    
+    @staticmethod
+    def _new_job(doc_id: str, filename: str, file_size: int, mode: str, message: str) -> Dict[str, Any]:
+        """대기 상태의 작업 상태를 만듭니다."""
+        return {
+            "doc_id": doc_id,
+            "mode": mode,
+            "filename": filename,
+            "file_size": file_size,
+            "stage": "queued",
+            "percent": 0,
+            "processed": 0,
+            "total": 0,
+            "message": message,
+            "error": None,
+            "result": None,
+            "created_at": time.time(),
+            "updated_at": time.time()
+        }
+    
+    def get_job(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태의 복사본을 반환합니다 (없으면 None)."""
+        with self._lock:
+            job = self._jobs.get(doc_id)
+            return dict(job) if job else None
+    
+    def is_active(self, doc_id: str) -> bool:
+        """작업이 아직 진행 중인지 확인합니다."""
+        job = self.get_job(doc_id)
+        return job is not None and job["stage"] not in ("completed", "failed")
+    
+    def _update(self, doc_id: str, stage: str, processed: int = 0, total: int = 0, message: str = None, **extra):
+        """작업 단계와 진행률을 갱신합니다."""
+        start, end = self.STAGE_RANGES[stage]
+        fraction = processed / total if total else 0
+        percent = round(start + (end - start) * fraction, 1)
+        
+        with self._lock:
+            job = self._jobs.get(doc_id)
+            if job is None:
+                return
+            job.update({
+                "stage": stage,
+                "percent": percent if stage not in ("completed", "failed") else 100,
+                "processed": processed,
+                "total": total,
+                "updated_at": time.time(),
+                **extra
+            })
+            if message:
+                job["message"] = message
+    
+    @staticmethod
+    def _batched(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+        """이터러블을 batch_size 크기의 리스트로 나눕니다."""
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    @staticmethod
+    def _encode(texts: List[str]) -> np.ndarray:
+        """임베딩 저장소에 없는 청크를 모델로 임베딩합니다."""
+        return embedder.encode_texts(texts, show_progress_bar=False)
+    
+    def _process(self, doc_id: str, file_path: Path, filename: str, file_size: int):
+        """
+        워커 스레드에서 수집 파이프라인을 실행합니다.
+        
+        페이지 → 청크 → 임베딩 배치 → 인덱스 추가가 제너레이터로 연결되어 있어,
+        메모리 사용량은 PDF 크기와 무관하게 INGEST_EMBED_BATCH_SIZE에 비례합니다.
+        단계별 소요 시간(extract, chunk, embed, index_write)은 StageTimer로 나누어 기록합니다.
+        """
+        timer = StageTimer()
+        try:
+            self._update(doc_id, "extracting", message="PDF에서 텍스트를 추출하고 있습니다.")
+            page_count = PDFProcessor.get_page_count(file_path)
+            progress = {"pages": 0, "chunks": 0}
+            
+            # 1. PDF에서 텍스트 추출 (페이지 스트림)
+            def pages():
+                for page in timer.timed(PDFProcessor.iter_pages(file_path), "extract"):
+                    progress["pages"] = page["page"]
+                    yield page
+            
+            # 2~3. 청크 분할 후 배치 단위 임베딩 (진행률 보고)
+            def embedding_batches():
+                chunks = timer.timed(PDFProcessor.iter_chunks(pages()), "chunk")
+                for chunk_batch in self._batched(chunks, settings.INGEST_EMBED_BATCH_SIZE):
+                    # 다른 문서에 이미 있는 청크는 저장된 임베딩을 재사용 (모델 추론 생략)
+                    texts = [chunk["content"] for chunk in chunk_batch]
+                    with timer.stage("embed"):
+                        embeddings = chunk_embedding_store.encode_texts(texts, self._encode)
+                    if len(embeddings) != len(chunk_batch):
+                        raise ValueError("임베딩 생성에 실패했습니다.")
+                    chunk_embedding_store.add_references(doc_id, texts)
+                    
+                    progress["chunks"] += len(chunk_batch)
+                    self._update(
+                        doc_id, "embedding", progress["pages"], page_count,
+                        f"임베딩 생성 중 ({progress['pages']}/{page_count} 페이지, {progress['chunks']}개 청크)"
+                    )
+                    yield embeddings, chunk_batch
+                
+                if progress["chunks"] == 0:
+                    raise ValueError("PDF에서 텍스트를 추출할 수 없습니다.")
+                
+                self._update(doc_id, "indexing", message="벡터 인덱스를 저장하고 있습니다.")
+            
+            # 4. 벡터 저장소에 배치 단위로 추가 (원본 파일명 포함)
+            #    (배치를 만드는 동안의 추출/분할/임베딩 시간은 각 단계로 따로 집계됨)
+            with timer.stage("index_write"):
+                vector_store = VectorStoreManager.create_document_index_from_batches(
+                    doc_id, embedding_batches(), original_filename=filename
+                )
+                
+                total = progress["chunks"]
+                # 문서 통계는 수집 시점에 한 번 기록 (통계 조회 시 인덱스 파일을 열지 않도록)
+                document_catalog.mark_indexed(
+                    doc_id, 
+                    page_count, 
+                    total, 
+                    vector_count=total, 
+                    dimension=int(vector_store.dimension), 
+                    disk_bytes=FileManager.get_document_disk_bytes(doc_id)
+                )
+            
+            timer.observe(ingest_stage_seconds, mode="create")
+            ingest_documents_total.inc(mode="create", outcome="completed")
+            result = {
+                "doc_id": doc_id,
+                "filename": filename,
+                "file_size": file_size,
+                "total_chunks": total,
+                "total_pages": page_count,
+                "embedding_dimension": int(vector_store.dimension),
+                "stages_ms": timer.as_dict()
+            }
+            self._update(doc_id, "completed", total, total, "PDF 업로드 및 처리가 완료되었습니다.", result=result)
+            print(f"문서 수집 완료: {filename} ({doc_id}), {total}개 청크")
+        
+        except Exception as e:
+            print(f"문서 수집 실패: {filename} ({doc_id}): {str(e)}")
+            ingest_documents_total.inc(mode="create", outcome="failed")
+            
+            # 오류 발생시 생성된 파일들 정리
+            try:
+                FileManager.delete_document_files(doc_id)
+                VectorStoreManager.remove_document_index(doc_id)
+            except Exception:
+                pass
+            
+            self._update(doc_id, "failed", message="파일 처리 중 오류가 발생했습니다.", error=str(e))
+    
+    def _process_update(self, doc_id: str, file_path: Path, filename: str, file_size: int):
+        """
+        워커 스레드에서 개정본 반영 파이프라인을 실행합니다.
+        
+        새 PDF의 청크를 기존 청크와 내용 해시로 비교하여 바뀐 청크만 임베딩합니다.
+        인덱스와 청크 파일은 제자리에서 갱신되므로 갱신 전 문서 파일을 보존해 두고,
+        카탈로그 기록까지 마치기 전에 실패하면 보존한 파일과 통합 인덱스를 되돌린 뒤
+        개정본 임시 파일을 삭제합니다.
+        """
+        timer = StageTimer()
+        backups = {}
+        try:
+            self._update(doc_id, "extracting", message="개정본에서 텍스트를 추출하고 있습니다.")
+            
+            # 1~2. 텍스트 추출 및 청크 분할 (비교를 위해 청크 목록만 보관, 임베딩은 하지 않음)
+            page_count = PDFProcessor.get_page_count(file_path)
+            chunks = list(timer.timed(
+                PDFProcessor.iter_chunks(timer.timed(PDFProcessor.iter_pages(file_path), "extract")), "chunk"
+            ))
+            if not chunks:
+                raise ValueError("PDF에서 텍스트를 추출할 수 없습니다.")
+            
+            # 3. 바뀐 청크만 배치 단위로 임베딩 (진행률 보고)
+            def encode(texts):
+                self._update(doc_id, "embedding", 0, len(texts), f"변경된 {len(texts)}개 청크 임베딩 생성 중")
+                embeddings = []
+                for batch in self._batched(texts, settings.INGEST_EMBED_BATCH_SIZE):
+                    with timer.stage("embed"):
+                        embeddings.append(chunk_embedding_store.encode_texts(batch, self._encode))
+                    processed = sum(len(e) for e in embeddings)
+                    self._update(doc_id, "embedding", processed, len(texts),
+                                 f"임베딩 생성 중 ({processed}/{len(texts)})")
+                return np.vstack(embeddings)
+            
+            # 4. 인덱스 증분 갱신 후 PDF 교체 (카탈로그 기록 전까지 실패하면 보존한 파일로 복구)
+            with timer.stage("index_write"):
+                backups = FileManager.backup_document_files(doc_id)
+                vector_store, diff = VectorStoreManager.update_document_index(doc_id, chunks, encode)
+                self._update(doc_id, "indexing", message="벡터 인덱스를 저장하고 있습니다.")
+                pdf_path = FileManager.get_pdf_path(doc_id)
+                file_path.replace(pdf_path)
+                document_catalog.mark_indexed(
+                    doc_id, 
+                    page_count, 
+                    len(chunks), 
+                    vector_count=len(chunks), 
+                    dimension=int(vector_store.dimension), 
+                    disk_bytes=FileManager.get_document_disk_bytes(doc_id), 
+                    file_size=file_size, 
+                    file_hash=FileManager.compute_file_hash(pdf_path)
+                )
+                FileManager.discard_backup(backups)
+                backups = {}
+            
+            # 공유 임베딩 참조는 정리 대상 판단에만 쓰이므로 실패해도 개정본 반영은 유지
+            try:
+                chunk_embedding_store.set_references(doc_id, [chunk["content"] for chunk in chunks])
+            except Exception as e:
+                print(f"청크 임베딩 참조 갱신 실패: {doc_id}: {str(e)}")
+            
+            timer.observe(ingest_stage_seconds, mode="update")
+            ingest_documents_total.inc(mode="update", outcome="completed")
+            result = {
+                "doc_id": doc_id,
+                "filename": vector_store.metadata.get("original_filename") or filename,
+                "file_size": file_size,
+                "total_chunks": len(chunks),
+                "total_pages": page_count,
+                "embedding_dimension": int(vector_store.dimension),
+                "stages_ms": timer.as_dict(),
+                **diff
+            }
+            self._update(doc_id, "completed", len(chunks), len(chunks), "개정본 반영이 완료되었습니다.", result=result)
+            print(f"문서 갱신 완료: {doc_id}, 재사용 {diff['reused_chunks']}개 / 임베딩 {diff['embedded_chunks']}개")
+        
+        except Exception as e:
+            print(f"문서 갱신 실패: {doc_id}: {str(e)}")
+            ingest_documents_total.inc(mode="update", outcome="failed")
+            
+            # 제자리 갱신된 인덱스/청크/PDF를 갱신 전 상태로 되돌리고 통합 인덱스에 다시 등록
+            if backups:
+                try:
+                    FileManager.restore_backup(backups)
+                    VectorStoreManager.reload_document_index(doc_id)
+                except Exception as restore_error:
+                    print(f"문서 복구 실패: {doc_id}: {str(restore_error)}")
+            
+            try:
+                if file_path.exists():
+                    file_path.unlink()
+            except Exception:
+                pass
+            
+            self._update(doc_id, "failed", message="개정본 처리 중 오류가 발생했습니다.", error=str(e))
+    
+    def _prune_finished_jobs(self):
+        """보관 기간이 지난 완료/실패 작업 상태를 정리합니다."""
+        expire_before = time.time() - settings.INGEST_JOB_RETENTION_SECONDS
+        
+        with self._lock:
+            for doc_id in [
+                doc_id for doc_id, job in self._jobs.items()
+                if job["stage"] in ("completed", "failed") and job["updated_at"] < expire_before
+            ]:
+                del self._jobs[doc_id]
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """작업 큐 통계 정보를 반환합니다."""
+        with self._lock:
+            stages = [job["stage"] for job in self._jobs.values()]
+        
+        return {
+            "max_workers": self.max_workers,
+            "queued": stages.count("queued"),
+            "running": sum(1 for stage in stages if stage not in ("queued", "completed", "failed")),
+            "completed": stages.count("completed"),
+            "failed": stages.count("failed")
+        }
+    
+    def shutdown(self):
+        """워커 풀을 종료합니다 (진행 중인 작업은 완료까지 대기하지 않음)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+# 글로벌 수집 작업 큐 인스턴스
+ingestion_queue = IngestionQueue()
@@ -0,0 +1,184 @@
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any
+from config import settings
+
+class OnnxSentenceEncoder:
+    """
+    SentenceTransformer 모델을 ONNX로 변환하여 ONNX Runtime(CPU)으로 실행하는 인코더
+    
+    TextEmbedder가 사용하는 encode / get_sentence_embedding_dimension 인터페이스를 그대로
+    제공하므로 EMBEDDING_BACKEND 설정만으로 PyTorch 경로와 바꿔 쓸 수 있습니다.
+    변환 결과는 EMBEDDING_ONNX_DIR 아래에 모델별로 저장되어 재시작 시 재사용됩니다.
+    """
+    
+    CONFIG_FILE = "encoder_config.json"
+    FP32_FILE = "model.onnx"
+    INT8_FILE = "model_int8.onnx"
+    
+    def __init__(self, model_name: str, quantize: bool = False, export_dir: Path = None, threads: int = None):
+        """
+        ONNX 인코더를 초기화합니다. 변환된 모델이 없으면 먼저 변환합니다.
+        
+        Args:
+            model_name: SentenceTransformer 모델 이름
+            quantize: int8 동적 양자화 모델 사용 여부
+            export_dir: 변환 결과 디렉터리 (기본값: EMBEDDING_ONNX_DIR/모델 이름)
+            threads: ONNX Runtime intra-op 스레드 수 (0이면 런타임 기본값)
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        
+        self.model_name = model_name
+        self.quantize = quantize
+        self.export_dir = Path(export_dir or OnnxSentenceEncoder.default_export_dir(model_name))
+        
+        if not (self.export_dir / OnnxSentenceEncoder.CONFIG_FILE).exists():
+            OnnxSentenceEncoder.export(model_name, self.export_dir)
+        if quantize and not (self.export_dir / OnnxSentenceEncoder.INT8_FILE).exists():
+            OnnxSentenceEncoder.quantize_model(self.export_dir)
+        
+        with open(self.export_dir / OnnxSentenceEncoder.CONFIG_FILE, 'r', encoding='utf-8') as f:
+            self.config: Dict[str, Any] = json.load(f)
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.export_dir))
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = settings.EMBEDDING_ONNX_THREADS if threads is None else threads
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        
+        model_file = OnnxSentenceEncoder.INT8_FILE if quantize else OnnxSentenceEncoder.FP32_FILE
+        self.session = ort.InferenceSession(
+            str(self.export_dir / model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+    
+    @staticmethod
+    def default_export_dir(model_name: str) -> Path:
+        """모델 이름별 변환 결과 디렉터리를 반환합니다."""
+        return Path(settings.EMBEDDING_ONNX_DIR) / model_name.replace("/", "__")
+    
+    @staticmethod
+    def export(model_name: str, export_dir: Path):
+        """
+        SentenceTransformer 모델의 트랜스포머 부분을 ONNX로 변환합니다.
+        
+        풀링과 정규화는 numpy로 수행하므로 그래프에는 토큰 임베딩 출력까지만 포함합니다.
+        
+        Args:
+            model_name: SentenceTransformer 모델 이름
+            export_dir: 저장할 디렉터리
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+        
+        export_dir = Path(export_dir)
+        export_dir.mkdir(parents=True, exist_ok=True)
+        
+        model = SentenceTransformer(model_name, device="cpu")
+        transformer = model[0]
+        pooling = next((module for module in model if type(module).__name__ == "Pooling"), None)
+        
+        auto_model = transformer.auto_model.eval()
+        auto_model.config.return_dict = False
+        transformer.tokenizer.save_pretrained(str(export_dir))
+        
+        sample = transformer.tokenizer(["임베딩 모델 변환용 예시 문장입니다."], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+        
+        print(f"ONNX 변환 시작: {model_name}")
+        temp_path = export_dir / f"{OnnxSentenceEncoder.FP32_FILE}.{os.getpid()}.tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                auto_model,
+                tuple(sample[name] for name in input_names),
+                str(temp_path),
+                input_names=input_names,
+                output_names=["token_embeddings"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+        temp_path.replace(export_dir / OnnxSentenceEncoder.FP32_FILE)
+        
+        config = {
+            "model_name": model_name,
+            "dimension": model.get_sentence_embedding_dimension(),
+            "max_seq_length": model.max_seq_length,
+            "pooling": "cls" if pooling is not None and pooling.pooling_mode_cls_token else "mean"
+        }
+        with open(export_dir / OnnxSentenceEncoder.CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        
+        print(f"ONNX 변환 완료: {export_dir}")
+    
+    @staticmethod
+    def quantize_model(export_dir: Path):
+        """변환된 ONNX 모델을 int8 동적 양자화합니다 (가중치만 int8, 활성값은 실행 시 양자화)."""
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        export_dir = Path(export_dir)
+        temp_path = export_dir / f"{OnnxSentenceEncoder.INT8_FILE}.{os.getpid()}.tmp"
+        quantize_dynamic(
+            str(export_dir / OnnxSentenceEncoder.FP32_FILE),
+            str(temp_path),
+            weight_type=QuantType.QInt8
+        )
+        temp_path.replace(export_dir / OnnxSentenceEncoder.INT8_FILE)
+        print(f"int8 양자화 완료: {export_dir / OnnxSentenceEncoder.INT8_FILE}")
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """배치 하나를 문장 임베딩으로 변환합니다 (풀링까지, 정규화 전)."""
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.config["max_seq_length"],
+            return_tensors="np"
+        )
+        feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+        token_embeddings = self.session.run(None, feeds)[0]
+        
+        if self.config["pooling"] == "cls":
+            return token_embeddings[:, 0]
+        
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    
+    def encode(
+        self,
+        sentences: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False
+    ) -> np.ndarray:
+        """
+        텍스트 리스트를 임베딩합니다 (SentenceTransformer.encode와 같은 시그니처).
+        
+        패딩을 줄이기 위해 길이순으로 정렬해 배치를 만들고 결과는 입력 순서로 되돌립니다.
+        
+        Returns:
+            임베딩 벡터 배열 (shape: [len(sentences), embedding_dim])
+        """
+        if not sentences:
+            return np.zeros((0, self.config["dimension"]), dtype=np.float32)
+        
+        order = np.argsort([-len(sentence) for sentence in sentences], kind="stable")
+        embeddings = np.empty((len(sentences), self.config["dimension"]), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch_ids = order[start:start + batch_size]
+            embeddings[batch_ids] = self._encode_batch([sentences[i] for i in batch_ids])
+        
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        """임베딩 벡터의 차원을 반환합니다."""
+        return self.config["dimension"]
\ No newline at end of file
@@ -1,45 +1,152 @@
 import fitz  # PyMuPDF
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 from config import settings
 
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[Dict[str, any]]:
+    """
+    지정한 페이지 구간의 텍스트를 추출합니다 (프로세스 풀 워커에서도 실행되는 최상위 함수).
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        start: 시작 페이지 인덱스 (0-based, 포함)
+        end: 끝 페이지 인덱스 (0-based, 미포함)
+        
+    Returns:
+        페이지별 텍스트 리스트 [{"page": int, "content": str}]
+    """
+    pages_content = []
+    
+    # 워커마다 자체 문서 핸들을 엶 (fitz 문서 객체는 프로세스 간 공유 불가)
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in range(start, end):
+            page = doc.load_page(page_num)
+            text = page.get_text()
+            
+            # 빈 페이지가 아닌 경우에만 추가
+            if text.strip():
+                pages_content.append({
+                    "page": page_num + 1,  # 1-based 페이지 번호
+                    "content": text.strip()
+                })
+    finally:
+        doc.close()
+    
+    return pages_content
+
 class PDFProcessor:
     """PDF 문서 처리 클래스"""
     
+    _pool = None
+    _pool_lock = threading.Lock()
+    
     @staticmethod
-    def extract_text_from_pdf(pdf_path: Path) -> List[Dict[str, any]]:
+    def _get_pool() -> ProcessPoolExecutor:
         """
-        PDF에서 텍스트를 추출합니다.
+        페이지 추출용 공유 프로세스 풀을 반환합니다 (필요 시 생성).
+        
+        풀 크기는 PDF_EXTRACT_WORKERS로 한 번만 정해지며, 작업별 병렬도는 동시에 제출하는
+        구간 수로 제한합니다. 다른 작업의 진행 중인 구간이 취소되지 않도록 풀을 다시 만들지 않습니다.
+        """
+        with PDFProcessor._pool_lock:
+            if PDFProcessor._pool is None:
+                # torch 등이 로드된 멀티스레드 프로세스에서 fork는 위험하므로 spawn 사용
+                PDFProcessor._pool = ProcessPoolExecutor(
+                    max_workers=settings.PDF_EXTRACT_WORKERS or os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return PDFProcessor._pool
+    
+    @staticmethod
+    def shutdown_pool():
+        """페이지 추출용 프로세스 풀을 종료합니다 (애플리케이션 종료 시에만 호출)."""
+        with PDFProcessor._pool_lock:
+            if PDFProcessor._pool is not None:
+                PDFProcessor._pool.shutdown(wait=False, cancel_futures=True)
+                PDFProcessor._pool = None
+    
+    @staticmethod
+    def get_page_count(pdf_path: Path) -> int:
+        """PDF의 전체 페이지 수를 반환합니다."""
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+    
+    @staticmethod
+    def iter_pages(pdf_path: Path, workers: int = None) -> Iterator[Dict[str, any]]:
+        """
+        PDF의 페이지 텍스트를 순서대로 하나씩 반환하는 제너레이터입니다.
+        
+        페이지 수가 PDF_PARALLEL_MIN_PAGES 이상이고 워커가 2개 이상이면 PDF_PAGE_BATCH_SIZE
+        단위의 페이지 구간을 공유 프로세스 풀에서 병렬로 추출합니다. 동시에 제출하는 구간은
+        워커 수로 제한되므로 PDF 크기와 무관하게 메모리 사용량이 일정합니다.
         
         Args:
             pdf_path: PDF 파일 경로
+            workers: 병렬 추출 워커 수 (기본값: 설정에서 가져옴, 1 이하면 직렬)
             
-        Returns:
-            페이지별 텍스트 리스트 [{"page": int, "content": str}]
+        Yields:
+            {"page": int, "content": str} (빈 페이지 제외)
         """
-        pages_content = []
+        if workers is None:
+            workers = settings.PDF_EXTRACT_WORKERS or os.cpu_count() or 1
         
         try:
-            # PDF 문서 열기
-            doc = fitz.open(pdf_path)
+            page_count = PDFProcessor.get_page_count(pdf_path)
             
-            for page_num in range(doc.page_count):
-                page = doc.load_page(page_num)
-                text = page.get_text()
-                
-                # 빈 페이지가 아닌 경우에만 추가
-                if text.strip():
-                    pages_content.append({
-                        "page": page_num + 1,  # 1-based 페이지 번호
-                        "content": text.strip()
-                    })
+            if workers <= 1 or page_count < settings.PDF_PARALLEL_MIN_PAGES:
+                for start in range(0, page_count, settings.PDF_PAGE_BATCH_SIZE):
+                    end = min(start + settings.PDF_PAGE_BATCH_SIZE, page_count)
+                    yield from _extract_page_range(str(pdf_path), start, end)
+                return
+            
+            # 연속된 페이지 구간을 순서대로 제출하고, 완료된 구간을 순서대로 반환
+            pool = PDFProcessor._get_pool()
+            ranges = iter(range(0, page_count, settings.PDF_PAGE_BATCH_SIZE))
+            in_flight = deque()
             
-            doc.close()
+            def submit_next() -> bool:
+                start = next(ranges, None)
+                if start is None:
+                    return False
+                end = min(start + settings.PDF_PAGE_BATCH_SIZE, page_count)
+                in_flight.append(pool.submit(_extract_page_range, str(pdf_path), start, end))
+                return True
+            
+            # 제출 구간 수로 이 작업의 병렬도를 제한 (공유 풀은 다른 작업과 함께 사용)
+            for _ in range(workers):
+                if not submit_next():
+                    break
+            
+            while in_flight:
+                range_content = in_flight.popleft().result()
+                submit_next()
+                yield from range_content
             
         except Exception as e:
             raise Exception(f"PDF 텍스트 추출 오류: {str(e)}")
+    
+    @staticmethod
+    def extract_text_from_pdf(pdf_path: Path, workers: int = None) -> List[Dict[str, any]]:
+        """
+        PDF에서 텍스트를 추출합니다.
+        
+        페이지 수가 PDF_PARALLEL_MIN_PAGES 이상이고 워커가 2개 이상이면 페이지 구간을
+        프로세스 풀에 나누어 병렬로 추출하며, 결과의 페이지 순서는 그대로 유지됩니다.
         
-        return pages_content
+        Args:
+            pdf_path: PDF 파일 경로
+            workers: 병렬 추출 워커 수 (기본값: 설정에서 가져옴, 1 이하면 직렬)
+            
+        Returns:
+            페이지별 텍스트 리스트 [{"page": int, "content": str}]
+        """
+        return list(PDFProcessor.iter_pages(pdf_path, workers))
     
     @staticmethod
     def split_text_into_chunks(
@@ -58,12 +165,30 @@ class PDFProcessor:
         Returns:
             분할된 텍스트 청크 리스트 [{"chunk_id": int, "page": int, "content": str}]
         """
+        return list(PDFProcessor.iter_chunks(pages_content, chunk_size, chunk_overlap))
+    
+    @staticmethod
+    def iter_chunks(
+        pages_content: Iterable[Dict[str, any]], 
+        chunk_size: int = None, 
+        chunk_overlap: int = None
+    ) -> Iterator[Dict[str, any]]:
+        """
+        페이지 스트림을 받아 청크를 하나씩 반환하는 제너레이터입니다.
+        
+        Args:
+            pages_content: 페이지별 텍스트 이터러블 (iter_pages 결과 등)
+            chunk_size: 청크 크기 (기본값: 설정에서 가져옴)
+            chunk_overlap: 청크 중복 크기 (기본값: 설정에서 가져옴)
+            
+        Yields:
+            {"chunk_id": int, "page": int, "content": str}
+        """
         if chunk_size is None:
             chunk_size = settings.CHUNK_SIZE
         if chunk_overlap is None:
             chunk_overlap = settings.CHUNK_OVERLAP
-            
-        chunks = []
+        
         chunk_id = 0
         
         for page_data in pages_content:
@@ -72,11 +197,11 @@ class PDFProcessor:
             
             # 텍스트가 청크 크기보다 작으면 그대로 사용
             if len(text) <= chunk_size:
-                chunks.append({
+                yield {
                     "chunk_id": chunk_id,
                     "page": page_num,
                     "content": text
-                })
+                }
                 chunk_id += 1
                 continue
             
@@ -103,17 +228,19 @@ class PDFProcessor:
                 chunk_text = text[start:end].strip()
                 
                 if chunk_text:
-                    chunks.append({
+                    yield {
                         "chunk_id": chunk_id,
                         "page": page_num,
                         "content": chunk_text
-                    })
+                    }
                     chunk_id += 1
                 
+                # 텍스트 끝까지 담았으면 종료 (겹침 구간만 남은 꼬리 청크 방지)
+                if end >= len(text):
+                    break
+                
                 # 다음 시작점 설정 (중복 고려)
                 start = max(start + 1, end - chunk_overlap)
-        
-        return chunks
     
     @staticmethod
     def process_pdf(pdf_path: Path) -> List[Dict[str, any]]:
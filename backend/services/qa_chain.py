@@ -1,19 +1,39 @@
-import requests
+import asyncio
 import json
-from typing import List, Dict, Any
+import httpx
+from typing import List, Dict, Any, Optional, AsyncIterator
 from config import settings
-from services.embedder import embedder
-from services.vector_store import VectorStoreManager
+from services.embedding_batcher import embedding_batcher
+from services.vector_store import VectorStoreManager, vector_registry
+from services.answer_cache import answer_cache
+from services.reranker import reranker
+from services.context_builder import ContextBuilder
+from utils.metrics import (
+    StageTimer, qa_stage_seconds, qa_requests_total, prompt_chars, 
+    gemini_tokens_total, gemini_request_tokens
+)
 
 class QAChain:
     """질문 응답 체인 클래스"""
     
+    # 검색 방식별 점수 표기 (dense만 코사인 유사도)
+    SCORE_LABELS = {"dense": "유사도", "sparse": "BM25 점수", "hybrid": "RRF 점수"}
+    
     def __init__(self):
         """OAuth를 사용하여 Gemini API를 초기화합니다."""
+        self.credentials = None
+        self.access_token = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
         self._configure_gemini()
     
     def _configure_gemini(self):
         """OAuth를 사용하여 Gemini API를 설정합니다."""
+        if not settings.GEMINI_USE_OAUTH:
+            print(f"⚠️ Gemini OAuth 비활성화 (GEMINI_API_BASE: {settings.GEMINI_API_BASE})")
+            return
+        
         credentials = settings.get_google_credentials()
         if not credentials:
             raise Exception("Google OAuth credentials를 로드할 수 없습니다.")
@@ -31,29 +51,57 @@ class QAChain:
             print(f"❌ OAuth 설정 실패: {e}")
             raise Exception(f"OAuth 설정 실패: {e}")
     
-    def _ensure_valid_token(self):
-        """토큰이 만료되었으면 갱신합니다."""
-        if self.credentials.expired:
+    def _get_client(self) -> httpx.AsyncClient:
+        """keep-alive 커넥션 풀을 공유하는 비동기 HTTP 클라이언트를 반환합니다."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=settings.GEMINI_API_BASE,
+                timeout=httpx.Timeout(settings.GEMINI_TIMEOUT, connect=settings.GEMINI_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.GEMINI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GEMINI_MAX_KEEPALIVE
+                )
+            )
+            self._token_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+        return self._client
+    
+    async def aclose(self):
+        """HTTP 클라이언트의 커넥션 풀을 닫습니다."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    async def _ensure_valid_token(self):
+        """토큰이 만료되었으면 이벤트 루프를 막지 않고 갱신합니다."""
+        if self.credentials is None or not self.credentials.expired:
+            return
+        
+        async with self._token_lock:
+            # 대기 중에 다른 요청이 이미 갱신했을 수 있음
+            if not self.credentials.expired:
+                return
+            
             try:
                 from google.auth.transport.requests import Request
-                self.credentials.refresh(Request())
+                await asyncio.to_thread(self.credentials.refresh, Request())
                 self.access_token = self.credentials.token
                 print("🔄 Access token 갱신 완료")
             except Exception as e:
                 print(f"❌ 토큰 갱신 실패: {e}")
                 raise Exception(f"토큰 갱신 실패: {e}")
     
-    def _generate_content_oauth(self, prompt: str) -> str:
-        """OAuth를 사용하여 직접 REST API로 콘텐츠를 생성합니다."""
-        # 토큰이 만료되었으면 갱신 (효율적!)
-        self._ensure_valid_token()
-        
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
-        
-        data = {
+    def _request_headers(self) -> Dict[str, str]:
+        """Gemini API 요청 헤더를 생성합니다."""
+        headers = {"Content-Type": "application/json"}
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+        return headers
+    
+    @staticmethod
+    def _request_body(prompt: str) -> Dict[str, Any]:
+        """Gemini API 요청 본문을 생성합니다."""
+        return {
             "contents": [{"role": "user", "parts": [{"text": prompt}]}],
             "generationConfig": {
                 "temperature": 0.3,
@@ -62,28 +110,162 @@ class QAChain:
                 "topK": 40
             }
         }
+    
+    @staticmethod
+    def _parse_usage(usage_metadata: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Gemini 응답의 usageMetadata를 토큰 사용량 딕셔너리로 변환합니다."""
+        usage_metadata = usage_metadata or {}
+        return {
+            "prompt_tokens": int(usage_metadata.get("promptTokenCount", 0)),
+            "output_tokens": int(usage_metadata.get("candidatesTokenCount", 0)),
+            "total_tokens": int(usage_metadata.get("totalTokenCount", 0))
+        }
+    
+    async def _generate_content_oauth(self, prompt: str, usage: Dict[str, int] = None) -> str:
+        """
+        OAuth를 사용하여 직접 REST API로 콘텐츠를 생성합니다 (비동기, 커넥션 풀 재사용).
         
-        response = requests.post(
-            "https://generativelanguage.googleapis.com/v1/models/gemini-1.5-flash:generateContent",
-            headers=headers,
-            json=data,
-            timeout=30
-        )
+        usage 딕셔너리를 넘기면 응답의 토큰 사용량(usageMetadata)을 채워 넣습니다.
+        """
+        client = self._get_client()
+        
+        # 토큰이 만료되었으면 갱신 (효율적!)
+        await self._ensure_valid_token()
+        
+        async with self._semaphore:
+            response = await client.post(
+                f"/models/{settings.GEMINI_MODEL}:generateContent",
+                headers=self._request_headers(),
+                json=self._request_body(prompt)
+            )
         
         if response.status_code != 200:
             raise Exception(f"Gemini API 호출 실패: {response.status_code} - {response.text}")
         
         result = response.json()
+        if usage is not None and "usageMetadata" in result:
+            usage.update(self._parse_usage(result["usageMetadata"]))
+        
         if "candidates" in result and len(result["candidates"]) > 0:
             content = result["candidates"][0]["content"]["parts"][0]["text"]
             return content
         else:
             raise Exception("Gemini API 응답에서 콘텐츠를 찾을 수 없습니다.")
     
+    async def _stream_content_oauth(self, prompt: str, usage: Dict[str, int] = None) -> AsyncIterator[str]:
+        """
+        streamGenerateContent(SSE)로 생성되는 텍스트 조각을 순서대로 반환합니다.
+        
+        usage 딕셔너리를 넘기면 이벤트마다 갱신되는 누적 토큰 사용량으로 채워 넣습니다.
+        """
+        client = self._get_client()
+        await self._ensure_valid_token()
+        
+        async with self._semaphore:
+            async with client.stream(
+                "POST",
+                f"/models/{settings.GEMINI_MODEL}:streamGenerateContent",
+                params={"alt": "sse"},
+                headers=self._request_headers(),
+                json=self._request_body(prompt)
+            ) as response:
+                if response.status_code != 200:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise Exception(f"Gemini API 호출 실패: {response.status_code} - {body}")
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    
+                    result = json.loads(line[len("data:"):].strip())
+                    if usage is not None and "usageMetadata" in result:
+                        usage.update(self._parse_usage(result["usageMetadata"]))
+                    for candidate in result.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            if part.get("text"):
+                                yield part["text"]
+    
+    async def _retrieve(
+        self, 
+        question: str, 
+        question_embedding, 
+        top_k: int = None, 
+        nprobe: int = None, 
+        ef_search: int = None, 
+        retrieval_mode: str = None, 
+        timer: StageTimer = None
+    ) -> List[Dict[str, Any]]:
+        """
+        관련 청크를 검색하고, 재정렬이 켜져 있으면 넓은 후보군을 크로스 인코더로 재정렬합니다.
+        
+        Returns:
+            프롬프트에 넣을 검색 결과 리스트
+        """
+        timer = timer or StageTimer()
+        if not reranker.enabled:
+            with timer.stage("search"):
+                return await asyncio.to_thread(
+                    VectorStoreManager.search_all_documents,
+                    question_embedding, top_k, nprobe=nprobe, ef_search=ef_search, 
+                    query_text=question, retrieval_mode=retrieval_mode
+                )
+        
+        final_k = top_k or settings.RERANK_TOP_K
+        with timer.stage("search"):
+            candidates = await asyncio.to_thread(
+                VectorStoreManager.search_all_documents,
+                question_embedding, reranker.candidate_count(final_k), nprobe=nprobe, ef_search=ef_search, 
+                query_text=question, retrieval_mode=retrieval_mode
+            )
+        with timer.stage("rerank"):
+            return await reranker.rerank(question, candidates, final_k)
+    
+    @staticmethod
+    def _record_request(
+        timer: StageTimer, 
+        mode: str, 
+        outcome: str, 
+        prompt: str = None, 
+        usage: Dict[str, int] = None
+    ) -> Dict[str, Any]:
+        """
+        요청 하나의 단계별 소요 시간, 프롬프트 크기, 토큰 사용량을 메트릭에 기록합니다.
+        
+        Args:
+            timer: 요청의 단계별 타이머
+            mode: 요청 방식 (answer, stream)
+            outcome: 처리 결과 (answered, cache_hit, no_results, error)
+            prompt: Gemini에 전달한 프롬프트
+            usage: Gemini 토큰 사용량
+            
+        Returns:
+            응답에 포함할 사용량 정보 (프롬프트 크기, 토큰 수, 단계별 소요 시간)
+        """
+        timer.observe(qa_stage_seconds, mode=mode)
+        qa_requests_total.inc(mode=mode, outcome=outcome)
+        
+        request_usage = {"stages_ms": timer.as_dict()}
+        if prompt is not None:
+            prompt_chars.observe(len(prompt))
+            request_usage["prompt_chars"] = len(prompt)
+            request_usage["prompt_tokens_estimated"] = ContextBuilder.estimate_tokens(prompt)
+        
+        if usage:
+            for kind, tokens in usage.items():
+                kind = kind[:-len("_tokens")]
+                gemini_tokens_total.inc(tokens, kind=kind)
+                gemini_request_tokens.observe(tokens, kind=kind)
+            request_usage.update(usage)
+        
+        return request_usage
+    
     def create_prompt(self, question: str, retrieved_chunks: List[Dict[str, Any]]) -> str:
         """
         질문과 검색된 문서를 바탕으로 프롬프트를 생성합니다.
         
+        인접/중복 청크는 하나로 합치거나 제외하고, CONTEXT_TOKEN_BUDGET 안에서 검색 순위가
+        높은 자료부터 담습니다.
+        
         Args:
             question: 사용자 질문
             retrieved_chunks: 검색된 문서 청크 리스트
@@ -91,19 +273,19 @@ class QAChain:
         Returns:
             Gemini에게 전달할 프롬프트
         """
-        # 검색된 문서들을 정리
+        # 검색된 문서들을 정리 (hybrid의 RRF, sparse의 BM25 점수는 유사도가 아니므로 따로 표기)
+        retrieval_mode = retrieved_chunks[0].get("retrieval_mode", "dense") if retrieved_chunks else "dense"
+        score_label = self.SCORE_LABELS.get(retrieval_mode, "유사도")
         context_parts = []
-        for i, chunk_data in enumerate(retrieved_chunks, 1):
-            chunk = chunk_data["chunk"]
-            score = chunk_data["score"]
-            page = chunk.get("page", "Unknown")
+        for block in ContextBuilder.build(retrieved_chunks):
+            page = block["page"] if block["page"] is not None else "Unknown"
             
             # 시연용 하드코딩된 파일명 사용
             clean_filename = "2025년도 2학기 대학생활 길라잡이"
             
             context_parts.append(
-                f"[{clean_filename} p.{page}] (유사도: {score:.3f})\n"
-                f"{chunk['content']}\n"
+                f"[{clean_filename} p.{page}] ({score_label}: {block['score']:.3f})\n"
+                f"{block['content']}\n"
             )
         
         context = "\n".join(context_parts)
@@ -154,24 +336,46 @@ class QAChain:
         
         return prompt
     
-    async def answer_question(self, question: str, top_k: int = None) -> Dict[str, Any]:
+    async def answer_question(
+        self, 
+        question: str, 
+        top_k: int = None, 
+        nprobe: int = None, 
+        ef_search: int = None, 
+        retrieval_mode: str = None
+    ) -> Dict[str, Any]:
         """
         질문에 대한 답변을 생성합니다.
         
         Args:
             question: 사용자 질문
             top_k: 검색할 상위 문서 수
+            nprobe: IVF 인덱스의 탐색 클러스터 수
+            ef_search: HNSW 인덱스의 탐색 폭
+            retrieval_mode: 검색 방식 (dense, sparse, hybrid)
             
         Returns:
             답변 정보 딕셔너리
         """
+        timer = StageTimer()
         try:
             # 1. 질문을 임베딩으로 변환
-            question_embedding = embedder.encode_single_text(question)
+            with timer.stage("embed"):
+                question_embedding = await embedding_batcher.encode(question)
             
-            # 2. 관련 문서 검색
-            retrieved_chunks = VectorStoreManager.search_all_documents(
-                question_embedding, top_k
+            # 2. 유사한 이전 질문의 답변이 캐시에 있으면 재사용
+            cache_params = (top_k, nprobe, ef_search, retrieval_mode)
+            document_version = vector_registry.version
+            if settings.ANSWER_CACHE_ENABLED:
+                with timer.stage("cache_lookup"):
+                    cached = answer_cache.lookup(question_embedding, cache_params, document_version)
+                if cached is not None:
+                    usage = self._record_request(timer, "answer", "cache_hit")
+                    return {**cached, "question": question, "usage": usage}
+            
+            # 3. 관련 문서 검색
+            retrieved_chunks = await self._retrieve(
+                question, question_embedding, top_k, nprobe, ef_search, retrieval_mode, timer
             )
             
             if not retrieved_chunks:
@@ -179,35 +383,36 @@ class QAChain:
                     "answer": "죄송합니다. 현재 업로드된 문서에서 관련 정보를 찾을 수 없습니다. 다른 질문을 해보시거나 관리자에게 문의해주세요.",
                     "sources": [],
                     "retrieved_chunks": 0,
-                    "question": question
+                    "question": question,
+                    "usage": self._record_request(timer, "answer", "no_results")
                 }
             
-            # 3. 프롬프트 생성
-            prompt = self.create_prompt(question, retrieved_chunks)
+            # 4. 프롬프트 생성
+            with timer.stage("prompt"):
+                prompt = self.create_prompt(question, retrieved_chunks)
             
-            # 4. Gemini API로 답변 생성 (OAuth 전용)
-            answer = self._generate_content_oauth(prompt).strip()
+            # 5. Gemini API로 답변 생성 (OAuth 전용)
+            gemini_usage = {}
+            with timer.stage("generate"):
+                answer = (await self._generate_content_oauth(prompt, gemini_usage)).strip()
             
             # 6. 소스 정보 정리
-            sources = []
-            for chunk_data in retrieved_chunks:
-                chunk = chunk_data["chunk"]
-                sources.append({
-                    "filename": "2025년도 2학기 대학생활 길라잡이.pdf",
-                    "page": chunk.get("page", "Unknown"),
-                    "chunk_id": chunk.get("chunk_id", "Unknown"),
-                    "score": chunk_data["score"],
-                    "content_preview": chunk["content"][:200] + "..." if len(chunk["content"]) > 200 else chunk["content"]
-                })
+            sources = self._format_sources(retrieved_chunks)
             
-            return {
+            result = {
                 "answer": answer,
                 "sources": sources,
                 "retrieved_chunks": len(retrieved_chunks),
                 "question": question
             }
             
+            if settings.ANSWER_CACHE_ENABLED:
+                answer_cache.store(question_embedding, cache_params, document_version, result)
+            
+            return {**result, "usage": self._record_request(timer, "answer", "answered", prompt, gemini_usage)}
+            
         except Exception as e:
+            self._record_request(timer, "answer", "error")
             return {
                 "answer": f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}",
                 "sources": [],
@@ -216,10 +421,138 @@ class QAChain:
                 "error": str(e)
             }
     
-    def test_connection(self) -> Dict[str, Any]:
+    async def stream_answer(
+        self, 
+        question: str, 
+        top_k: int = None, 
+        nprobe: int = None, 
+        ef_search: int = None, 
+        retrieval_mode: str = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        질문에 대한 답변을 스트리밍으로 생성합니다.
+        
+        검색 직후 sources 이벤트를 먼저 보내고, 이후 생성되는 텍스트를 token 이벤트로
+        전달한 뒤 done 이벤트로 끝납니다. 오류 시 error 이벤트를 보냅니다.
+        
+        Args:
+            question: 사용자 질문
+            top_k: 검색할 상위 문서 수
+            nprobe: IVF 인덱스의 탐색 클러스터 수
+            ef_search: HNSW 인덱스의 탐색 폭
+            retrieval_mode: 검색 방식 (dense, sparse, hybrid)
+            
+        Yields:
+            {"event": "sources" | "token" | "done" | "error", "data": ...}
+        """
+        timer = StageTimer()
+        try:
+            # 1. 질문을 임베딩으로 변환
+            with timer.stage("embed"):
+                question_embedding = await embedding_batcher.encode(question)
+            
+            # 캐시 적중 시 전체 답변을 한 번에 전달
+            cache_params = (top_k, nprobe, ef_search, retrieval_mode)
+            document_version = vector_registry.version
+            if settings.ANSWER_CACHE_ENABLED:
+                with timer.stage("cache_lookup"):
+                    cached = answer_cache.lookup(question_embedding, cache_params, document_version)
+                if cached is not None:
+                    usage = self._record_request(timer, "stream", "cache_hit")
+                    yield {
+                        "event": "sources",
+                        "data": {
+                            "sources": cached["sources"],
+                            "retrieved_chunks": cached["retrieved_chunks"],
+                            "question": question
+                        }
+                    }
+                    yield {"event": "token", "data": {"text": cached["answer"]}}
+                    yield {"event": "done", "data": {"usage": usage}}
+                    return
+            
+            # 2. 관련 문서 검색
+            retrieved_chunks = await self._retrieve(
+                question, question_embedding, top_k, nprobe, ef_search, retrieval_mode, timer
+            )
+            
+            # 3. 출처 정보는 검색 직후 바로 전송
+            yield {
+                "event": "sources",
+                "data": {
+                    "sources": self._format_sources(retrieved_chunks),
+                    "retrieved_chunks": len(retrieved_chunks),
+                    "question": question
+                }
+            }
+            
+            if not retrieved_chunks:
+                yield {"event": "token", "data": {"text": "죄송합니다. 현재 업로드된 문서에서 관련 정보를 찾을 수 없습니다. 다른 질문을 해보시거나 관리자에게 문의해주세요."}}
+                yield {"event": "done", "data": {"usage": self._record_request(timer, "stream", "no_results")}}
+                return
+            
+            # 4. 프롬프트 생성 후 Gemini 스트리밍 응답 전달
+            with timer.stage("prompt"):
+                prompt = self.create_prompt(question, retrieved_chunks)
+            
+            sources = self._format_sources(retrieved_chunks)
+            answer_parts = []
+            gemini_usage = {}
+            stream = self._stream_content_oauth(prompt, gemini_usage)
+            # 클라이언트로 전송하는 시간은 제외하고 Gemini 응답을 기다린 시간만 generate 단계로 측정
+            async for text in self._timed_stream(stream, timer, "generate"):
+                answer_parts.append(text)
+                yield {"event": "token", "data": {"text": text}}
+            
+            # 스트리밍이 끝까지 완료된 답변만 캐시에 저장
+            if settings.ANSWER_CACHE_ENABLED:
+                answer_cache.store(question_embedding, cache_params, document_version, {
+                    "answer": "".join(answer_parts).strip(),
+                    "sources": sources,
+                    "retrieved_chunks": len(retrieved_chunks),
+                    "question": question
+                })
+            
+            yield {"event": "done", "data": {"usage": self._record_request(timer, "stream", "answered", prompt, gemini_usage)}}
+            
+        except Exception as e:
+            self._record_request(timer, "stream", "error")
+            yield {
+                "event": "error",
+                "data": {"error": f"죄송합니다. 답변 생성 중 오류가 발생했습니다: {str(e)}"}
+            }
+    
+    @staticmethod
+    async def _timed_stream(stream: AsyncIterator[str], timer: StageTimer, stage: str) -> AsyncIterator[str]:
+        """비동기 이터레이터의 다음 항목을 기다리는 시간을 stage 단계에 누적합니다."""
+        while True:
+            with timer.stage(stage):
+                try:
+                    item = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+    
+    @staticmethod
+    def _format_sources(retrieved_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """검색된 청크를 응답용 출처 정보로 정리합니다."""
+        sources = []
+        for chunk_data in retrieved_chunks:
+            chunk = chunk_data["chunk"]
+            sources.append({
+                "filename": "2025년도 2학기 대학생활 길라잡이.pdf",
+                "page": chunk.get("page", "Unknown"),
+                "chunk_id": chunk.get("chunk_id", "Unknown"),
+                "score": chunk_data["score"],
+                "retrieval_mode": chunk_data.get("retrieval_mode", "dense"),
+                "content_preview": chunk["content"][:200] + "..." if len(chunk["content"]) > 200 else chunk["content"]
+            })
+        return sources
+    
+    async def test_connection(self) -> Dict[str, Any]:
         """Gemini API OAuth 연결을 테스트합니다."""
         try:
-            test_response = self._generate_content_oauth("안녕하세요. 테스트입니다.")
+            test_response = await self._generate_content_oauth("안녕하세요. 테스트입니다.")
             return {
                 "status": "success",
                 "message": "Gemini API OAuth 연결 성공",
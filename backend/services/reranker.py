@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from typing import List, Dict, Any, Optional
+from config import settings
+
+class CrossEncoderReranker:
+    """
+    벡터 검색 후보를 크로스 인코더로 다시 점수화하는 재정렬 단계
+    
+    벡터 검색으로 넓은 후보군(RERANK_CANDIDATES)을 가져온 뒤, 질문과 청크를 함께 입력받는
+    크로스 인코더로 CPU에서 배치 단위로 점수를 매겨 상위 청크만 프롬프트에 넣습니다.
+    시간 예산(RERANK_TIMEOUT_MS)을 넘기면 벡터 검색 순서를 그대로 사용합니다.
+    """
+    
+    def __init__(self, model_name: str = None, enabled: bool = None):
+        """
+        재정렬기를 초기화합니다. 모델은 최초 사용 시 로드됩니다.
+        
+        Args:
+            model_name: 크로스 인코더 모델 이름 (기본값: 설정에서 가져옴)
+            enabled: 사용 여부 (기본값: 설정에서 가져옴)
+        """
+        self.model_name = model_name or settings.RERANK_MODEL
+        self.enabled = enabled if enabled is not None else settings.RERANK_ENABLED
+        
+        self.model = None
+        self._load_lock = threading.Lock()
+        self._predict_lock = threading.Lock()  # CPU 추론은 한 번에 하나씩 (코어 과점유 방지)
+        self.reranked = 0
+        self.fallbacks = 0
+        self.total_ms = 0.0
+    
+    def load_model(self):
+        """크로스 인코더 모델을 로드합니다."""
+        if self.model is not None:
+            return
+        
+        with self._load_lock:
+            if self.model is not None:
+                return
+            try:
+                from sentence_transformers import CrossEncoder
+                self.model = CrossEncoder(self.model_name, max_length=settings.RERANK_MAX_LENGTH, device="cpu")
+                print(f"재정렬 모델 로드 완료: {self.model_name}")
+            except Exception as e:
+                raise Exception(f"재정렬 모델 로드 실패: {str(e)}")
+    
+    def candidate_count(self, top_k: int) -> int:
+        """재정렬 전에 벡터 검색으로 가져올 후보 수를 반환합니다."""
+        if not self.enabled:
+            return top_k
+        return max(settings.RERANK_CANDIDATES, top_k)
+    
+    def _score(self, question: str, contents: List[str], deadline: float) -> Optional[List[float]]:
+        """
+        배치 단위로 점수를 계산합니다. 마감 시각을 넘기면 None을 반환합니다.
+        
+        Args:
+            question: 사용자 질문
+            contents: 후보 청크 본문 리스트
+            deadline: time.perf_counter() 기준 마감 시각
+        
+        Returns:
+            후보별 점수 리스트 또는 None (시간 초과)
+        """
+        if not self._predict_lock.acquire(timeout=max(deadline - time.perf_counter(), 0)):
+            return None
+        
+        try:
+            scores: List[float] = []
+            batch_size = settings.RERANK_BATCH_SIZE
+            for start in range(0, len(contents), batch_size):
+                if time.perf_counter() >= deadline:
+                    return None
+                
+                pairs = [(question, content) for content in contents[start:start + batch_size]]
+                scores.extend(float(score) for score in self.model.predict(pairs, batch_size=batch_size, show_progress_bar=False))
+            return scores
+        finally:
+            self._predict_lock.release()
+    
+    async def rerank(self, question: str, retrieved_chunks: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        검색 결과를 크로스 인코더 점수로 재정렬하여 상위 top_k개를 반환합니다.
+        
+        Args:
+            question: 사용자 질문
+            retrieved_chunks: 벡터 검색 결과 (점수 내림차순)
+            top_k: 반환할 청크 수
+        
+        Returns:
+            재정렬된 검색 결과 (시간 초과/오류 시 벡터 검색 순서의 상위 top_k개)
+        """
+        if not self.enabled or len(retrieved_chunks) <= 1:
+            return retrieved_chunks[:top_k]
+        
+        started = time.perf_counter()
+        deadline = started + settings.RERANK_TIMEOUT_MS / 1000
+        
+        try:
+            await asyncio.to_thread(self.load_model)
+            contents = [result["chunk"]["content"] for result in retrieved_chunks]
+            scores = await asyncio.to_thread(self._score, question, contents, deadline)
+        except Exception as e:
+            print(f"재정렬 오류: {str(e)}")
+            scores = None
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.total_ms += elapsed_ms
+        
+        if scores is None:
+            self.fallbacks += 1
+            return retrieved_chunks[:top_k]
+        
+        self.reranked += 1
+        order = sorted(range(len(retrieved_chunks)), key=lambda i: scores[i], reverse=True)[:top_k]
+        
+        reranked = []
+        for rank, i in enumerate(order, 1):
+            reranked.append({**retrieved_chunks[i], "rerank_score": scores[i], "rank": rank})
+        return reranked
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """재정렬 통계 정보를 반환합니다."""
+        total = self.reranked + self.fallbacks
+        return {
+            "enabled": self.enabled,
+            "model": self.model_name,
+            "model_loaded": self.model is not None,
+            "reranked": self.reranked,
+            "fallbacks": self.fallbacks,
+            "average_ms": round(self.total_ms / total, 2) if total else 0.0
+        }
+
+# 글로벌 재정렬기 인스턴스
+reranker = CrossEncoderReranker()
\ No newline at end of file
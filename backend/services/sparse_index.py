@@ -0,0 +1,249 @@
+import math
+import os
+import re
+import unicodedata
+import numpy as np
+from collections import Counter, defaultdict
+from typing import List, Dict, Tuple, Iterable, Optional, Any
+from config import settings
+from utils.file_utils import FileManager
+
+class KoreanTokenizer:
+    """
+    형태소 분석기 없이 한국어 검색어를 맞추기 위한 문자 n-gram 토크나이저
+    
+    조사가 붙은 어절("별첨2를", "수강신청은")도 부분 일치하도록 어절을 문자 n-gram으로
+    나누고, 과목 코드나 서식 번호처럼 영문/숫자가 섞인 어절은 어절 전체도 토큰으로 추가합니다.
+    """
+    
+    WORD_PATTERN = re.compile(r"[^\W_]+")
+    
+    @staticmethod
+    def tokenize(text: str, ngram: int = None) -> List[str]:
+        """
+        텍스트를 검색 토큰 리스트로 변환합니다.
+        
+        Args:
+            text: 입력 텍스트
+            ngram: 문자 n-gram 크기 (기본값: 설정에서 가져옴)
+        
+        Returns:
+            토큰 리스트 (중복 포함)
+        """
+        if ngram is None:
+            ngram = settings.BM25_NGRAM
+        
+        text = unicodedata.normalize("NFC", text).lower()
+        tokens = []
+        for word in KoreanTokenizer.WORD_PATTERN.findall(text):
+            if len(word) <= ngram:
+                tokens.append(word)
+                continue
+            
+            tokens.extend(word[i:i + ngram] for i in range(len(word) - ngram + 1))
+            if any(char.isascii() for char in word):
+                tokens.append(word)  # 코드/번호 정확 일치
+        return tokens
+
+class DocumentPostings:
+    """
+    문서 하나의 BM25 역색인 (용어 → 청크 위치, 용어 빈도)
+    
+    수집 시점에 {doc_id}_bm25.npz로 저장되며, 용어별 포스팅이 연속 배열로 미리 정렬되어
+    있어 로드 후 추가 계산 없이 검색에 사용됩니다.
+    """
+    
+    def __init__(self, terms: np.ndarray, offsets: np.ndarray, positions: np.ndarray,
+                 frequencies: np.ndarray, lengths: np.ndarray):
+        self.offsets = offsets
+        self.positions = positions
+        self.frequencies = frequencies
+        self.lengths = lengths
+        self.term_ids = {str(term): i for i, term in enumerate(terms)}
+    
+    def postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """용어의 (청크 위치 배열, 용어 빈도 배열)을 반환합니다."""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return None
+        return self.term_postings(term_id)
+    
+    def term_postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """용어 ID의 (청크 위치 배열, 용어 빈도 배열)을 반환합니다."""
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.positions[start:end], self.frequencies[start:end]
+    
+    @staticmethod
+    def build(doc_id: str, contents: Iterable[str]) -> "DocumentPostings":
+        """
+        청크 본문으로 문서 역색인을 만들어 저장합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            contents: 인덱스 순서대로 나열된 청크 본문
+        
+        Returns:
+            생성된 문서 역색인
+        """
+        term_postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        lengths = []
+        for position, content in enumerate(contents):
+            counts = Counter(KoreanTokenizer.tokenize(content))
+            lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                term_postings[term].append((position, count))
+        
+        terms = sorted(term_postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        positions, frequencies = [], []
+        for i, term in enumerate(terms):
+            postings = term_postings[term]
+            offsets[i + 1] = offsets[i] + len(postings)
+            positions.extend(position for position, _ in postings)
+            frequencies.extend(count for _, count in postings)
+        
+        document = DocumentPostings(
+            np.array(terms, dtype=str),
+            offsets,
+            np.array(positions, dtype=np.int32),
+            np.array(frequencies, dtype=np.float32),
+            np.array(lengths, dtype=np.int32)
+        )
+        document.save(doc_id)
+        return document
+    
+    def save(self, doc_id: str):
+        """역색인을 파일로 저장합니다."""
+        terms = list(self.term_ids)  # 용어 ID 순서 (정렬됨)
+        path = FileManager.get_sparse_index_path(doc_id)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            np.savez(
+                f,
+                terms=np.array(terms, dtype=str),
+                offsets=self.offsets,
+                positions=self.positions,
+                frequencies=self.frequencies,
+                lengths=self.lengths
+            )
+        temp_path.replace(path)
+    
+    @staticmethod
+    def load(doc_id: str) -> Optional["DocumentPostings"]:
+        """저장된 역색인을 로드합니다 (없으면 None)."""
+        path = FileManager.get_sparse_index_path(doc_id)
+        if not path.exists():
+            return None
+        
+        with np.load(path, allow_pickle=False) as data:
+            return DocumentPostings(
+                data["terms"], data["offsets"], data["positions"], data["frequencies"], data["lengths"]
+            )
+
+class SparseIndex:
+    """
+    여러 문서의 역색인을 묶어 코퍼스 전체 BM25 점수를 계산하는 클래스
+    
+    IDF와 평균 청크 길이는 현재 등록된 모든 문서 기준으로 계산하며, 점수는
+    통합 벡터 인덱스와 같은 청크 ID 공간에 기록됩니다.
+    
+    코퍼스 수준의 용어 → 문서 목록을 함께 유지하므로 검색어 용어마다 그 용어가 있는
+    문서만 살펴보며, 점수는 일치한 청크에 대해서만 합산합니다.
+    """
+    
+    def __init__(self, k1: float = None, b: float = None):
+        self.k1 = k1 if k1 is not None else settings.BM25_K1
+        self.b = b if b is not None else settings.BM25_B
+        self._documents: Dict[str, DocumentPostings] = {}
+        self._term_documents: Dict[str, Dict[str, int]] = {}  # 용어 → {doc_id: 문서 내 용어 ID}
+        self._total_chunks = 0
+        self._total_length = 0
+    
+    def add(self, doc_id: str, document: DocumentPostings):
+        """문서 역색인을 등록합니다."""
+        self.remove(doc_id)
+        self._documents[doc_id] = document
+        for term, term_id in document.term_ids.items():
+            self._term_documents.setdefault(term, {})[doc_id] = term_id
+        self._total_chunks += len(document.lengths)
+        self._total_length += int(document.lengths.sum())
+    
+    def remove(self, doc_id: str):
+        """문서 역색인을 제거합니다."""
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+        
+        for term in document.term_ids:
+            documents = self._term_documents.get(term)
+            if documents is not None:
+                documents.pop(doc_id, None)
+                if not documents:
+                    del self._term_documents[term]
+        self._total_chunks -= len(document.lengths)
+        self._total_length -= int(document.lengths.sum())
+    
+    def clear(self):
+        """모든 역색인을 제거합니다."""
+        self._documents.clear()
+        self._term_documents.clear()
+        self._total_chunks = 0
+        self._total_length = 0
+    
+    def search(self, query: str, top_k: int, doc_ranges: Dict[str, Tuple[int, int]]) -> List[Tuple[int, float]]:
+        """
+        BM25로 상위 청크를 검색합니다.
+        
+        Args:
+            query: 검색어
+            top_k: 상위 k개 결과
+            doc_ranges: doc_id → (청크 ID 시작, 청크 수)
+        
+        Returns:
+            [(청크 ID, BM25 점수)] 점수 내림차순
+        """
+        terms = set(KoreanTokenizer.tokenize(query))
+        if not terms or self._total_chunks == 0:
+            return []
+        
+        average_length = self._total_length / self._total_chunks
+        matched_ids, matched_scores = [], []
+        
+        for term in terms:
+            matches = []
+            for doc_id, term_id in self._term_documents.get(term, {}).items():
+                if doc_id in doc_ranges:
+                    document = self._documents[doc_id]
+                    matches.append((doc_ranges[doc_id][0], document, *document.term_postings(term_id)))
+            
+            document_frequency = sum(len(positions) for _, _, positions, _ in matches)
+            if document_frequency == 0:
+                continue
+            
+            idf = math.log(1 + (self._total_chunks - document_frequency + 0.5) / (document_frequency + 0.5))
+            for start_id, document, positions, frequencies in matches:
+                length_norm = self.k1 * (1 - self.b + self.b * document.lengths[positions] / average_length)
+                matched_ids.append(positions.astype(np.int64) + start_id)
+                matched_scores.append(idf * frequencies * (self.k1 + 1) / (frequencies + length_norm))
+        
+        if not matched_ids:
+            return []
+        
+        # 여러 용어에 일치한 청크의 점수를 합산 (일치한 청크 수만큼만 메모리 사용)
+        chunk_ids, inverse = np.unique(np.concatenate(matched_ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(matched_scores))
+        
+        order = np.arange(len(chunk_ids))
+        if len(order) > top_k:
+            order = np.argpartition(-scores, top_k - 1)[:top_k]
+        order = order[np.argsort(-scores[order])]
+        return [(int(chunk_ids[i]), float(scores[i])) for i in order]
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """역색인 통계 정보를 반환합니다."""
+        return {
+            "documents": len(self._documents),
+            "chunks": self._total_chunks,
+            "terms": sum(len(document.term_ids) for document in self._documents.values()),
+            "average_chunk_length": round(self._total_length / self._total_chunks, 2) if self._total_chunks else 0.0
+        }
\ No newline at end of file
@@ -1,10 +1,100 @@
 import faiss
 import numpy as np
-import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Optional, Any, Iterable, Callable
 from config import settings
 from utils.file_utils import FileManager
+from services.chunk_store import ChunkStore, ChunkStoreWriter, write_metadata_header
+from services.sparse_index import DocumentPostings, SparseIndex
+
+class IndexFactory:
+    """설정에 따라 FAISS 인덱스(flat, hnsw, ivf_flat, ivf_pq)를 생성하는 클래스"""
+    
+    INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+    IVF_TYPES = ("ivf_flat", "ivf_pq")
+    
+    @staticmethod
+    def describe(index_type: str) -> str:
+        """인덱스 종류를 faiss.index_factory 문자열로 변환합니다."""
+        if index_type == "flat":
+            return "Flat"
+        if index_type == "hnsw":
+            return f"HNSW{settings.HNSW_M},Flat"
+        if index_type == "ivf_flat":
+            return f"IVF{settings.IVF_NLIST},Flat"
+        if index_type == "ivf_pq":
+            return f"IVF{settings.IVF_NLIST},PQ{settings.PQ_M}x{settings.PQ_NBITS}"
+        raise ValueError(f"지원하지 않는 인덱스 종류입니다: {index_type} (가능: {', '.join(IndexFactory.INDEX_TYPES)})")
+    
+    @staticmethod
+    def create(dimension: int, index_type: str) -> faiss.Index:
+        """
+        ID 기반 추가/검색이 가능한 인덱스를 생성합니다.
+        
+        IVF 계열은 자체적으로 ID를 지원하므로 그대로, 나머지는 IndexIDMap으로 감쌉니다.
+        IVF 계열 인덱스는 반환 시점에 학습되지 않은 상태입니다.
+        
+        Args:
+            dimension: 벡터 차원
+            index_type: 인덱스 종류
+            
+        Returns:
+            FAISS 인덱스 (내적 기준)
+        """
+        index = faiss.index_factory(dimension, IndexFactory.describe(index_type), faiss.METRIC_INNER_PRODUCT)
+        
+        if index_type == "hnsw":
+            index.hnsw.efConstruction = settings.HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = settings.HNSW_EF_SEARCH
+        
+        if index_type in IndexFactory.IVF_TYPES:
+            index.nprobe = settings.IVF_NPROBE
+            return index
+        
+        return faiss.IndexIDMap(index)
+    
+    @staticmethod
+    def min_training_vectors(index_type: str) -> int:
+        """인덱스 학습에 필요한 최소 벡터 수를 반환합니다 (학습이 필요 없으면 0)."""
+        if index_type not in IndexFactory.IVF_TYPES:
+            return 0
+        
+        required = settings.IVF_NLIST * settings.IVF_MIN_TRAIN_PER_LIST
+        if index_type == "ivf_pq":
+            required = max(required, (2 ** settings.PQ_NBITS) * settings.IVF_MIN_TRAIN_PER_LIST)
+        return required
+    
+    @staticmethod
+    def search_parameters(index_type: str, nprobe: int = None, ef_search: int = None, selector: faiss.IDSelector = None):
+        """요청별 검색 파라미터(nprobe / efSearch / HNSW 검색 대상 ID 필터)를 생성합니다."""
+        if index_type in IndexFactory.IVF_TYPES and nprobe:
+            params = faiss.SearchParametersIVF()
+            params.nprobe = nprobe
+            return params
+        
+        if index_type == "hnsw" and (ef_search or selector is not None):
+            params = faiss.SearchParametersHNSW()
+            params.efSearch = ef_search or settings.HNSW_EF_SEARCH
+            if selector is not None:
+                params.sel = selector
+            return params
+        
+        return None
+    
+    @staticmethod
+    def mmap_io_flags() -> int:
+        """
+        인덱스 파일을 메모리 매핑으로 읽기 위한 faiss.read_index 플래그를 반환합니다.
+        
+        flat 인덱스의 mmap 로드(IO_FLAG_MMAP_IFC)를 지원하지 않는 FAISS 버전에서는
+        IO_FLAG_MMAP(IVF 역색인만 매핑)으로 대체됩니다.
+        """
+        return getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
 
 class VectorStore:
     """FAISS 기반 벡터 저장소 클래스"""
@@ -20,7 +110,8 @@ class VectorStore:
         self.index_path = FileManager.get_vectorstore_path(doc_id)
         self.metadata_path = FileManager.get_metadata_path(doc_id)
         self.index = None
-        self.metadata = []
+        self.metadata = {}  # 청크를 제외한 헤더 (원본 파일명, 청크 수, 차원)
+        self.chunks = ChunkStore(doc_id)
         self.dimension = None
     
     def create_index(self, embeddings: np.ndarray, chunks: List[Dict[str, Any]], original_filename: str = None):
@@ -50,42 +141,55 @@ class VectorStore:
         # 벡터 추가
         self.index.add(normalized_embeddings.astype(np.float32))
         
-        # 메타데이터 저장 (원본 파일명 포함)
+        # 메타데이터 헤더 (원본 파일명 포함, 청크는 바이너리 청크 파일에 저장)
         self.metadata = {
             "original_filename": original_filename,
             "doc_id": self.doc_id,
             "total_chunks": len(chunks),
             "dimension": self.dimension,
-            "chunks": chunks
+            "format": ChunkStore.FORMAT
         }
         
         # 파일로 저장
+        ChunkStore.write(self.doc_id, chunks)
         self._save_to_disk()
+        self.chunks.open()
+        self.build_sparse_index()
         
         print(f"벡터 저장소 생성 완료: {len(embeddings)}개 벡터, 차원: {self.dimension}")
     
-    def load_index(self) -> bool:
+    def load_index(self, mmap: bool = None) -> bool:
         """
         디스크에서 인덱스를 로드합니다.
         
+        Args:
+            mmap: 인덱스 파일을 메모리 매핑으로 로드할지 여부 (기본값: 설정에서 가져옴)
+        
         Returns:
             로드 성공 여부
         """
+        if mmap is None:
+            mmap = settings.VECTOR_INDEX_MMAP
+        
         try:
             if not self.index_path.exists() or not self.metadata_path.exists():
                 return False
             
-            # FAISS 인덱스 로드
-            self.index = faiss.read_index(str(self.index_path))
+            # FAISS 인덱스 로드 (mmap이면 여러 워커가 OS 페이지 캐시를 공유, 읽기 전용)
+            io_flags = IndexFactory.mmap_io_flags() if mmap else 0
+            self.index = faiss.read_index(str(self.index_path), io_flags)
+            
+            # 메타데이터 헤더 로드 (구 JSON 형식이면 바이너리 청크 파일로 변환)
+            self.metadata = ChunkStore.migrate_json_metadata(self.doc_id)
             
-            # 메타데이터 로드
-            with open(self.metadata_path, 'r', encoding='utf-8') as f:
-                self.metadata = json.load(f)
+            # 청크 파일은 메모리 매핑으로 열기 (본문은 조회 시에만 디코딩)
+            if not self.chunks.open():
+                return False
             
             # 차원 정보 설정
             self.dimension = self.index.d
             
-            print(f"벡터 저장소 로드 완료: {len(self.metadata)}개 벡터")
+            print(f"벡터 저장소 로드 완료: {self.index.ntotal}개 벡터, {len(self.chunks)}개 청크")
             return True
             
         except Exception as e:
@@ -119,11 +223,10 @@ class VectorStore:
         
         # 결과 구성
         results = []
-        chunks = self.metadata.get("chunks", []) if isinstance(self.metadata, dict) else self.metadata
         for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-            if idx != -1 and idx < len(chunks):  # 유효한 인덱스인지 확인
+            if idx != -1 and idx < len(self.chunks):  # 유효한 인덱스인지 확인
                 results.append({
-                    "chunk": chunks[idx],
+                    "chunk": self.chunks[int(idx)],
                     "score": float(score),
                     "rank": i + 1
                 })
@@ -133,40 +236,197 @@ class VectorStore:
     def _save_to_disk(self):
         """인덱스와 메타데이터를 디스크에 저장합니다."""
         try:
-            # FAISS 인덱스 저장
-            faiss.write_index(self.index, str(self.index_path))
+            # FAISS 인덱스 저장 (mmap으로 읽고 있는 워커가 있을 수 있으므로 임시 파일 후 교체)
+            temp_index_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            faiss.write_index(self.index, str(temp_index_path))
+            temp_index_path.replace(self.index_path)
             
-            # 메타데이터 저장
-            with open(self.metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+            # 메타데이터 헤더 저장
+            write_metadata_header(self.metadata_path, self.metadata)
                 
         except Exception as e:
             raise Exception(f"벡터 저장소 저장 실패: {str(e)}")
     
+    def build_sparse_index(self) -> DocumentPostings:
+        """청크 파일로 BM25 역색인을 만들어 인덱스 파일 옆에 저장합니다."""
+        return DocumentPostings.build(self.doc_id, (chunk["content"] for chunk in self.chunks))
+    
+    def apply_update(
+        self, 
+        chunks: List[Dict[str, Any]], 
+        encode: Callable[[List[str]], np.ndarray]
+    ) -> Dict[str, int]:
+        """
+        개정된 문서의 청크로 인덱스를 증분 갱신합니다.
+        
+        기존 청크와 새 청크를 내용 해시로 비교하여, 바뀌었거나 새로 생긴 청크만 임베딩하고
+        사라진 청크는 ID 기반으로 인덱스에서 제거합니다. 내용이 같은 청크는 기존 벡터를
+        그대로 사용하며 페이지 번호 등 메타데이터만 새 값으로 갱신됩니다.
+        
+        Args:
+            chunks: 개정된 문서의 청크 리스트
+            encode: 텍스트 리스트를 임베딩 배열로 변환하는 함수 (추가 청크에만 호출)
+            
+        Returns:
+            {"reused_chunks", "embedded_chunks", "removed_chunks"}
+        """
+        if self.index is None and not self.load_index(mmap=False):
+            raise Exception("벡터 저장소를 로드할 수 없습니다.")
+        
+        # 기존 청크: 내용 해시 → 인덱스 내 위치 목록 (같은 내용이 여러 번 나올 수 있음)
+        old_positions: Dict[str, List[int]] = {}
+        for position, chunk in enumerate(self.chunks):
+            old_positions.setdefault(ChunkStore.content_hash(chunk["content"]), []).append(position)
+        
+        kept: Dict[int, Dict[str, Any]] = {}  # 재사용할 기존 위치 → 새 청크
+        added: List[Dict[str, Any]] = []
+        for chunk in chunks:
+            positions = old_positions.get(ChunkStore.content_hash(chunk["content"]))
+            if positions:
+                kept[positions.pop(0)] = chunk
+            else:
+                added.append(chunk)
+        
+        removed = [position for position in range(len(self.chunks)) if position not in kept]
+        
+        embeddings = None
+        if added:
+            embeddings = np.ascontiguousarray(encode([chunk["content"] for chunk in added]), dtype=np.float32)
+            if len(embeddings) != len(added) or embeddings.shape[1] != self.dimension:
+                raise ValueError("임베딩과 청크 수 또는 차원이 일치하지 않습니다.")
+        
+        # 사라진 청크를 ID로 제거 (flat 인덱스는 남은 벡터의 순서를 유지한 채 ID가 당겨짐)
+        if removed:
+            self.index.remove_ids(np.array(removed, dtype=np.int64))
+        
+        # 새 청크의 벡터를 뒤에 추가
+        if added:
+            faiss.normalize_L2(embeddings)
+            self.index.add(embeddings)
+        
+        # 인덱스 순서에 맞춰 메타데이터 재작성: 남은 기존 위치 순 + 추가 청크 순
+        ordered_chunks = [kept[position] for position in sorted(kept)] + added
+        self.chunks.close()
+        ChunkStore.write(self.doc_id, ordered_chunks)
+        self.metadata["total_chunks"] = len(ordered_chunks)
+        self._save_to_disk()
+        self.chunks.open()
+        self.build_sparse_index()
+        
+        print(f"벡터 저장소 증분 갱신 완료: 재사용 {len(kept)}개, 임베딩 {len(added)}개, 제거 {len(removed)}개")
+        
+        return {
+            "reused_chunks": len(kept),
+            "embedded_chunks": len(added),
+            "removed_chunks": len(removed)
+        }
+    
     def get_statistics(self) -> Dict[str, Any]:
         """벡터 저장소 통계 정보를 반환합니다."""
-        if self.index is None:
+        # 레지스트리가 문서별 인덱스를 해제한 경우 다시 로드하지 않고 로드 시점의 정보를 사용
+        if self.index is None and self.dimension is None:
             if not self.load_index():
                 return {"error": "벡터 저장소를 로드할 수 없습니다."}
         
-        # 메타데이터가 새 형식인지 확인
-        if isinstance(self.metadata, dict):
-            total_chunks = len(self.metadata.get("chunks", []))
-            original_filename = self.metadata.get("original_filename")
-        else:
-            total_chunks = len(self.metadata)
-            original_filename = None
-        
         return {
             "doc_id": self.doc_id,
-            "original_filename": original_filename,
-            "total_vectors": self.index.ntotal,
+            "original_filename": self.metadata.get("original_filename"),
+            "total_vectors": self.index.ntotal if self.index is not None else len(self.chunks),
             "dimension": self.dimension,
-            "total_chunks": total_chunks,
+            "total_chunks": len(self.chunks),
+            "chunk_store_bytes": self.chunks.size_bytes(),
             "index_file_exists": self.index_path.exists(),
             "metadata_file_exists": self.metadata_path.exists()
         }
 
+class VectorStoreWriter:
+    """
+    임베딩 배치를 받아 문서 인덱스와 메타데이터를 점진적으로 기록하는 클래스
+    
+    벡터는 FAISS 인덱스에 바로 추가하고 청크 본문은 청크 파일에 스트리밍으로 기록하므로,
+    메모리 사용량은 문서 크기가 아니라 배치 크기에 비례합니다.
+    """
+    
+    def __init__(self, doc_id: str, original_filename: str = None):
+        """
+        문서 인덱스 기록을 시작합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            original_filename: 원본 파일명
+        """
+        self.doc_id = doc_id
+        self.index_path = FileManager.get_vectorstore_path(doc_id)
+        self.metadata_path = FileManager.get_metadata_path(doc_id)
+        self.original_filename = original_filename
+        self.index = None
+        self.dimension = None
+        self.total_chunks = 0
+        self._chunk_writer = ChunkStoreWriter(doc_id)
+    
+    def append(self, embeddings: np.ndarray, chunks: List[Dict[str, Any]]):
+        """
+        임베딩 배치와 청크 메타데이터를 추가합니다.
+        
+        Args:
+            embeddings: 임베딩 벡터 배열
+            chunks: 청크 메타데이터 리스트
+        """
+        if len(embeddings) != len(chunks):
+            raise ValueError("임베딩과 청크 수가 일치하지 않습니다.")
+        
+        if len(embeddings) == 0:
+            return
+        
+        if self.index is None:
+            self.dimension = embeddings.shape[1]
+            self.index = faiss.IndexFlatIP(self.dimension)  # Inner Product (코사인 유사도)
+        
+        # 임베딩 정규화 (코사인 유사도를 위해, 제자리 연산으로 복사본 최소화)
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        self.index.add(vectors)
+        
+        self._chunk_writer.append(chunks)
+        self.total_chunks += len(chunks)
+    
+    def finalize(self) -> VectorStore:
+        """
+        기록을 마치고 인덱스와 메타데이터 파일을 확정합니다.
+        
+        Returns:
+            디스크에서 다시 로드된 벡터 저장소 인스턴스
+        """
+        if self.index is None or self.total_chunks == 0:
+            self.abort()
+            raise ValueError("임베딩 배열이 비어있습니다.")
+        
+        try:
+            self._chunk_writer.finalize()
+            faiss.write_index(self.index, str(self.index_path))
+            write_metadata_header(self.metadata_path, {
+                "original_filename": self.original_filename,
+                "doc_id": self.doc_id,
+                "total_chunks": self.total_chunks,
+                "dimension": self.dimension,
+                "format": ChunkStore.FORMAT
+            })
+        except Exception as e:
+            self.abort()
+            raise Exception(f"벡터 저장소 저장 실패: {str(e)}")
+        
+        print(f"벡터 저장소 생성 완료: {self.total_chunks}개 벡터, 차원: {self.dimension}")
+        
+        vector_store = VectorStore(self.doc_id)
+        if not vector_store.load_index():
+            raise Exception("벡터 저장소를 로드할 수 없습니다.")
+        vector_store.build_sparse_index()
+        return vector_store
+    
+    def abort(self):
+        """기록을 취소하고 임시 파일을 정리합니다."""
+        self._chunk_writer.abort()
+
 class VectorStoreManager:
     """여러 문서의 벡터 저장소를 관리하는 클래스"""
     
@@ -186,8 +446,99 @@ class VectorStoreManager:
         """
         vector_store = VectorStore(doc_id)
         vector_store.create_index(embeddings, chunks, original_filename)
+        
+        # 통합 코퍼스 인덱스에 증분 추가
+        vector_registry.register(vector_store, original_filename)
+        return vector_store
+    
+    @staticmethod
+    def create_document_index_from_batches(
+        doc_id: str, 
+        batches: Iterable[Tuple[np.ndarray, List[Dict[str, Any]]]], 
+        original_filename: str = None
+    ) -> VectorStore:
+        """
+        (임베딩, 청크) 배치 스트림으로 문서의 벡터 인덱스를 생성합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            batches: (임베딩 배열, 청크 메타데이터 리스트) 이터러블
+            original_filename: 원본 파일명
+            
+        Returns:
+            생성된 벡터 저장소 인스턴스
+        """
+        writer = VectorStoreWriter(doc_id, original_filename)
+        try:
+            for embeddings, chunks in batches:
+                writer.append(embeddings, chunks)
+        except Exception:
+            writer.abort()
+            raise
+        
+        vector_store = writer.finalize()
+        
+        # 통합 코퍼스 인덱스에 증분 추가
+        vector_registry.register(vector_store, original_filename)
+        return vector_store
+    
+    @staticmethod
+    def update_document_index(
+        doc_id: str, 
+        chunks: List[Dict[str, Any]], 
+        encode: Callable[[List[str]], np.ndarray]
+    ) -> Tuple[VectorStore, Dict[str, int]]:
+        """
+        기존 문서의 인덱스를 개정된 청크로 증분 갱신합니다 (doc_id 유지).
+        
+        Args:
+            doc_id: 갱신할 문서 ID
+            chunks: 개정된 문서의 청크 리스트
+            encode: 바뀐 청크만 임베딩하는 함수
+            
+        Returns:
+            (갱신된 벡터 저장소, 변경 통계)
+        """
+        vector_store = VectorStore(doc_id)
+        if not vector_store.load_index(mmap=False):
+            raise Exception("벡터 저장소를 로드할 수 없습니다.")
+        
+        diff = vector_store.apply_update(chunks, encode)
+        
+        # 통합 코퍼스 인덱스에서 문서 구간을 교체 (재임베딩 없이 문서 벡터만 다시 추가)
+        if settings.VECTOR_INDEX_MMAP:
+            vector_store.load_index()
+        vector_registry.register(vector_store, vector_store.metadata.get("original_filename"))
+        return vector_store, diff
+    
+    @staticmethod
+    def reload_document_index(doc_id: str) -> Optional[VectorStore]:
+        """
+        디스크의 현재 파일로 문서를 통합 코퍼스 인덱스에 다시 등록합니다 (파일 복구 후 사용).
+        
+        Args:
+            doc_id: 문서 ID
+        
+        Returns:
+            다시 로드된 벡터 저장소 또는 None
+        """
+        vector_store = VectorStore(doc_id)
+        if not vector_store.load_index():
+            return None
+        
+        vector_registry.register(vector_store, vector_store.metadata.get("original_filename"))
         return vector_store
     
+    @staticmethod
+    def remove_document_index(doc_id: str):
+        """
+        문서를 통합 코퍼스 인덱스와 레지스트리에서 제거합니다.
+        
+        Args:
+            doc_id: 문서 ID
+        """
+        vector_registry.remove(doc_id)
+    
     @staticmethod
     def get_document_store(doc_id: str) -> Optional[VectorStore]:
         """
@@ -199,19 +550,31 @@ class VectorStoreManager:
         Returns:
             벡터 저장소 인스턴스 또는 None
         """
-        vector_store = VectorStore(doc_id)
-        if vector_store.load_index():
-            return vector_store
-        return None
+        return vector_registry.get(doc_id)
     
     @staticmethod
-    def search_all_documents(query_embedding: np.ndarray, top_k: int = None) -> List[Dict[str, Any]]:
+    def search_all_documents(
+        query_embedding: np.ndarray, 
+        top_k: int = None, 
+        nprobe: int = None, 
+        ef_search: int = None, 
+        query_text: str = None, 
+        retrieval_mode: str = None
+    ) -> List[Dict[str, Any]]:
         """
         모든 문서에서 검색을 수행합니다.
         
+        모든 문서의 청크를 합친 단일 코퍼스 인덱스에 한 번의 FAISS 검색을 수행하며,
+        검색 시 파일 I/O가 발생하지 않습니다. sparse/hybrid 모드에서는 수집 시 만든
+        BM25 역색인을 함께 사용합니다.
+        
         Args:
             query_embedding: 쿼리 임베딩 벡터
-            top_k: 각 문서별 상위 k개 결과
+            top_k: 전체 코퍼스에서의 상위 k개 결과
+            nprobe: IVF 인덱스의 탐색 클러스터 수 (기본값: 설정에서 가져옴)
+            ef_search: HNSW 인덱스의 탐색 폭 (기본값: 설정에서 가져옴)
+            query_text: 원문 검색어 (sparse/hybrid 모드에 필요)
+            retrieval_mode: dense, sparse, hybrid (기본값: 설정에서 가져옴)
             
         Returns:
             전체 검색 결과 리스트
@@ -219,27 +582,717 @@ class VectorStoreManager:
         if top_k is None:
             top_k = settings.TOP_K_RESULTS
         
-        all_results = []
-        documents = FileManager.list_documents()
+        return vector_registry.search(
+            query_embedding, top_k, nprobe=nprobe, ef_search=ef_search, 
+            query_text=query_text, retrieval_mode=retrieval_mode
+        )
+
+class ReadWriteLock:
+    """
+    읽기는 여러 스레드가 동시에, 쓰기는 한 스레드만 단독으로 수행하게 하는 락
+    
+    쓰기가 대기 중이면 새 읽기를 막아 쓰기가 계속 밀리지 않게 합니다.
+    같은 스레드의 중첩 쓰기는 허용하지만, 읽기 안에서 쓰기(또는 그 반대)를 잡으면 안 됩니다.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+    
+    @contextmanager
+    def read(self):
+        """공유 읽기 구간"""
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self):
+        """단독 쓰기 구간 (같은 스레드에서 중첩 가능)"""
+        thread_id = threading.get_ident()
+        with self._condition:
+            if self._writer == thread_id:
+                self._write_depth += 1
+            else:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._waiting_writers -= 1
+                self._writer = thread_id
+                self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    self._writer = None
+                    self._condition.notify_all()
+
+class VectorStoreRegistry:
+    """
+    프로세스 전역 벡터 저장소 레지스트리
+    
+    문서별 청크 파일을 한 번만 메모리 매핑으로 열어 두고, 모든 문서의 벡터를
+    하나의 통합 코퍼스 인덱스로 관리합니다. 문서마다 연속된 청크 ID 구간을
+    할당하므로 청크 ID → (doc_id, chunk_idx) 매핑은 구간 시작점 배열만으로 조회합니다.
+    
+    검색어의 BM25 점수를 위한 문서별 역색인도 같은 청크 ID 공간으로 함께 관리합니다.
+    
+    통합 인덱스 종류는 VECTOR_INDEX_TYPE 설정을 따릅니다. IVF 계열은 학습에 충분한 벡터가
+    모일 때까지 flat 인덱스로 동작하다가 임계치를 넘으면 자동으로 학습 후 전환합니다.
+    학습처럼 인덱스 전체를 다시 만드는 작업은 백그라운드 스레드에서 락 없이 수행하고
+    완성된 인덱스만 락 안에서 교체하므로, 그동안에도 검색과 수집은 기존 인덱스로 진행됩니다.
+    문서별 인덱스 파일은 항상 flat으로 저장되어 정확한 원본 벡터 역할을 합니다.
+    
+    통합 인덱스와 역색인은 문서 추가/삭제 시 제자리에서 변경되므로 _rw_lock으로 보호합니다.
+    검색은 읽기 구간에서 서로 동시에 수행되고, 문서 추가/삭제만 쓰기 구간에서 단독으로 수행됩니다.
+    _lock은 레지스트리 필드를 짧게 읽고 쓸 때만 잡으며, 두 락을 함께 잡을 때는 항상
+    _rw_lock을 먼저 잡습니다. 백그라운드 재구성은 인덱스 참조만 교체하므로 _lock만 사용합니다.
+    
+    flat 인덱스에서 VECTOR_INDEX_MMAP이 켜져 있으면 벡터를 힙으로 복사하지 않고,
+    mmap으로 연 문서별 인덱스를 IndexShards로 묶어 통합 인덱스로 사용합니다.
+    이 경우 uvicorn 워커가 여러 개여도 같은 벡터 파일의 페이지 캐시를 공유합니다.
+    ANN 인덱스(hnsw, ivf_*)는 자체 구조를 메모리에 만들어야 하므로 mmap 대상이 아닙니다.
+    
+    HNSW는 개별 삭제를 지원하지 않으므로 문서 삭제/개정 시 청크 ID에 삭제 표시만 하고
+    검색에서 제외하며, 삭제 표시가 HNSW_COMPACT_RATIO를 넘으면 백그라운드에서 압축합니다.
+    """
+    
+    RETRIEVAL_MODES = ("dense", "sparse", "hybrid")
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rw_lock = ReadWriteLock()
+        self._stores: Dict[str, VectorStore] = {}
+        self._filenames: Dict[str, str] = {}
+        self._loaded = False
+        
+        # 통합 코퍼스 인덱스와 청크 ID 구간 테이블
+        self._index_type = settings.VECTOR_INDEX_TYPE
+        IndexFactory.describe(self._index_type)  # 잘못된 설정은 시작 시점에 오류
+        self._mmap = settings.VECTOR_INDEX_MMAP and self._index_type == "flat"
+        if settings.VECTOR_INDEX_MMAP and not self._mmap:
+            print(f"VECTOR_INDEX_MMAP은 flat 인덱스에서만 통합 인덱스에 적용됩니다 (현재: {self._index_type})")
+        self._active_type = None  # 현재 통합 인덱스의 실제 종류 (IVF 학습 전에는 flat)
+        self._index = None
+        self._dimension = None
+        self._next_id = 0
+        self._doc_ranges: Dict[str, Tuple[int, int]] = {}  # doc_id → (시작 ID, 청크 수)
+        self._range_starts: List[int] = []  # 오름차순 구간 시작 ID
+        self._range_docs: List[str] = []  # 구간 시작 ID에 대응하는 doc_id
+        
+        # BM25 역색인 (sparse/hybrid 검색용)
+        self._sparse = SparseIndex()
+        
+        # 문서 집합이 바뀔 때마다 증가 (답변 캐시 등 파생 데이터 무효화용)
+        self._version = 0
+        
+        # 통합 인덱스 내용이 바뀔 때마다 증가 (백그라운드 재구성 결과가 최신인지 확인용)
+        self._generation = 0
+        self._rebuild_thread: Optional[threading.Thread] = None
+        
+        # HNSW 삭제 표시 (압축 전까지 검색에서 제외할 청크 ID)
+        self._deleted_ids = np.empty(0, dtype=np.int64)
+        self._deleted_batch = None
+        self._live_selector = None
+    
+    def _ensure_loaded(self):
+        """최초 사용 시 디스크의 모든 문서를 로드합니다."""
+        if self._loaded:
+            return
+        
+        with self._rw_lock.write(), self._lock:
+            if self._loaded:
+                return
+            
+            for doc_info in FileManager.list_documents():
+                if doc_info["has_vector"]:
+                    self._load_document(doc_info["doc_id"], doc_info["filename"])
+            
+            self._loaded = True
+            print(f"벡터 저장소 레지스트리 로드 완료: {len(self._stores)}개 문서, "
+                  f"{self._index.ntotal if self._index is not None else 0}개 벡터")
+    
+    def _load_document(self, doc_id: str, filename: str = None) -> Optional[VectorStore]:
+        """디스크에서 문서 하나를 로드하여 레지스트리에 등록합니다."""
+        vector_store = VectorStore(doc_id)
+        if not vector_store.load_index():
+            return None
+        
+        self._add_document(vector_store, filename)
+        return vector_store
+    
+    def _add_document(self, vector_store: VectorStore, filename: str = None):
+        """문서의 벡터를 통합 인덱스에 추가하고 청크 ID 구간을 할당합니다."""
+        doc_id = vector_store.doc_id
+        if doc_id in self._doc_ranges:
+            self._remove_document(doc_id)
+        
+        if self._dimension is not None and vector_store.dimension != self._dimension:
+            print(f"문서 {doc_id} 차원 불일치로 통합 인덱스에서 제외: "
+                  f"{vector_store.dimension} != {self._dimension}")
+            return
+        
+        if self._index is None:
+            self._dimension = vector_store.dimension
+            self._active_type = "flat" if self._index_type in IndexFactory.IVF_TYPES else self._index_type
+            if self._mmap:
+                # 샤드 순서대로 연속 ID를 부여 (successive_ids)
+                self._index = faiss.IndexShards(self._dimension, False, True)
+            else:
+                self._index = IndexFactory.create(self._dimension, self._active_type)
+        
+        count = vector_store.index.ntotal
+        start_id = self._next_id
+        
+        if self._mmap:
+            # mmap된 문서 인덱스를 복사 없이 샤드로 연결 (문서별 인덱스를 계속 유지)
+            self._index.add_shard(vector_store.index)
+            self._generation += 1
+        else:
+            # 문서 인덱스의 (정규화된) 벡터를 꺼내 통합 인덱스에 연속 ID로 추가
+            vectors = vector_store.index.reconstruct_n(0, count)
+            ids = np.arange(start_id, start_id + count, dtype=np.int64)
+            self._index.add_with_ids(vectors, ids)
+            self._generation += 1
+            
+            # 검색은 통합 인덱스로 하므로 문서별 인덱스는 메모리에서 해제 (청크 파일 매핑만 유지)
+            vector_store.index = None
+        
+        self._next_id += count
+        self._doc_ranges[doc_id] = (start_id, count)
+        self._range_starts.append(start_id)
+        self._range_docs.append(doc_id)
+        
+        # 역색인은 수집 시 저장된 파일을 사용하고, 이전에 수집된 문서는 청크 파일로 생성
+        self._sparse.add(doc_id, DocumentPostings.load(doc_id) or vector_store.build_sparse_index())
+        
+        self._stores[doc_id] = vector_store
+        self._filenames[doc_id] = filename or self._filename_from_store(vector_store)
+        self._version += 1
+        
+        self._schedule_rebuild()
+    
+    def _remove_document(self, doc_id: str):
+        """문서의 청크 ID 구간을 통합 인덱스에서 제거합니다."""
+        vector_store = self._stores.pop(doc_id, None)
+        if vector_store is not None:
+            vector_store.chunks.close()
+        self._filenames.pop(doc_id, None)
+        self._sparse.remove(doc_id)
+        
+        id_range = self._doc_ranges.pop(doc_id, None)
+        if id_range is None:
+            return
+        
+        self._version += 1
+        start_id, count = id_range
+        position = self._range_starts.index(start_id)
+        del self._range_starts[position]
+        del self._range_docs[position]
+        
+        if self._mmap:
+            # 샤드를 빼면 뒤쪽 샤드의 ID가 당겨지므로 구간 테이블을 다시 계산
+            self._index.remove_shard(vector_store.index)
+            self._reassign_ranges()
+            self._generation += 1
+            return
+        
+        if count == 0:
+            return
+        
+        self._generation += 1
+        if self._active_type == "hnsw":
+            # HNSW는 개별 삭제를 지원하지 않으므로 삭제 표시 후 검색에서 제외 (압축은 백그라운드)
+            self._mark_deleted(np.arange(start_id, start_id + count, dtype=np.int64))
+            self._schedule_rebuild()
+        else:
+            self._index.remove_ids(faiss.IDSelectorRange(start_id, start_id + count))
+    
+    def _mark_deleted(self, ids: np.ndarray):
+        """청크 ID에 삭제 표시를 하고 검색용 ID 필터를 갱신합니다 (_lock 안에서 호출)."""
+        self._deleted_ids = np.concatenate([self._deleted_ids, ids])
         
-        for doc_info in documents:
-            if doc_info["has_vector"]:
-                doc_id = doc_info["doc_id"]
-                vector_store = VectorStoreManager.get_document_store(doc_id)
+        # IDSelectorNot은 내부 선택자를 참조만 하므로 두 객체를 함께 보관
+        self._deleted_batch = faiss.IDSelectorBatch(len(self._deleted_ids), faiss.swig_ptr(self._deleted_ids))
+        self._live_selector = faiss.IDSelectorNot(self._deleted_batch)
+    
+    def _clear_deleted(self):
+        """삭제 표시를 모두 지웁니다 (압축 또는 초기화 후, _lock 안에서 호출)."""
+        self._deleted_ids = np.empty(0, dtype=np.int64)
+        self._deleted_batch = None
+        self._live_selector = None
+    
+    def _reassign_ranges(self):
+        """샤드 순서(= 구간 등록 순서)대로 청크 ID 구간을 0부터 다시 할당합니다."""
+        start_id = 0
+        for position, doc_id in enumerate(self._range_docs):
+            count = self._doc_ranges[doc_id][1]
+            self._doc_ranges[doc_id] = (start_id, count)
+            self._range_starts[position] = start_id
+            start_id += count
+        self._next_id = start_id
+    
+    def _extract_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """IndexIDMap 기반 통합 인덱스(flat, hnsw)에서 삭제 표시되지 않은 (ID 배열, 벡터 배열)을 꺼냅니다."""
+        ids = faiss.vector_to_array(self._index.id_map).astype(np.int64)
+        vectors = self._index.index.reconstruct_n(0, self._index.ntotal)
+        if len(self._deleted_ids) > 0:
+            keep = ~np.isin(ids, self._deleted_ids)
+            ids, vectors = ids[keep], vectors[keep]
+        return ids, vectors
+    
+    @staticmethod
+    def _build_index(dimension: int, index_type: str, ids: np.ndarray, vectors: np.ndarray) -> faiss.Index:
+        """주어진 벡터로 새 인덱스를 생성합니다 (IVF 계열은 학습 포함, 레지스트리 상태는 바꾸지 않음)."""
+        index = IndexFactory.create(dimension, index_type)
+        
+        if not index.is_trained:
+            started = time.time()
+            index.train(vectors)
+            print(f"통합 인덱스 학습 완료 ({index_type}): {len(vectors)}개 벡터, "
+                  f"{time.time() - started:.2f}초")
+        
+        if len(ids) > 0:
+            index.add_with_ids(vectors, ids)
+        return index
+    
+    def _rebuild_target(self) -> Optional[str]:
+        """통합 인덱스를 다시 만들어야 하면 만들 인덱스 종류를 반환합니다 (_lock 안에서 호출)."""
+        if self._index is None or self._mmap:
+            return None
+        
+        # IVF 계열 설정에서 벡터가 충분히 모이면 flat 인덱스를 학습된 IVF로 전환
+        if (self._index_type in IndexFactory.IVF_TYPES and self._active_type == "flat"
+                and self._index.ntotal >= IndexFactory.min_training_vectors(self._index_type)):
+            return self._index_type
+        
+        # HNSW 삭제 표시가 충분히 쌓이면 남은 벡터로 압축
+        if self._active_type == "hnsw" and len(self._deleted_ids) > self._index.ntotal * settings.HNSW_COMPACT_RATIO:
+            return "hnsw"
+        return None
+    
+    def _schedule_rebuild(self):
+        """재구성이 필요하고 진행 중인 재구성이 없으면 백그라운드 스레드를 시작합니다 (_lock 안에서 호출)."""
+        if self._rebuild_thread is not None or self._rebuild_target() is None:
+            return
+        
+        self._rebuild_thread = threading.Thread(target=self._run_rebuild, name="vector-index-rebuild", daemon=True)
+        self._rebuild_thread.start()
+    
+    def _run_rebuild(self):
+        """
+        통합 인덱스를 락 밖에서 새로 만들고 락 안에서 교체합니다.
+        
+        락 안에서는 벡터 스냅샷만 복사하고, 학습과 인덱스 구성은 락 없이 수행합니다.
+        구성하는 동안 통합 인덱스가 바뀌었으면(_generation 변경) 결과를 버리고 바뀐 상태로
+        다시 만듭니다. 기존 인덱스는 교체 전까지 그대로 유효하므로 검색 결과는 항상 정확합니다.
+        """
+        while True:
+            with self._lock:
+                index_type = self._rebuild_target()
+                if index_type is None:
+                    self._rebuild_thread = None
+                    return
+                
+                generation = self._generation
+                dimension = self._dimension
+                ids, vectors = self._extract_vectors()
+            
+            try:
+                index = self._build_index(dimension, index_type, ids, vectors)
+            except Exception as e:
+                print(f"통합 인덱스 재구성 실패 ({index_type}): {e}")
+                with self._lock:
+                    self._rebuild_thread = None
+                return
+            
+            with self._lock:
+                if self._generation != generation:
+                    print(f"통합 인덱스 재구성 중 문서가 바뀌어 다시 구성합니다 ({index_type})")
+                    continue
                 
-                if vector_store:
-                    try:
-                        doc_results = vector_store.search(query_embedding, top_k)
-                        # 문서 정보 추가
-                        for result in doc_results:
-                            result["doc_id"] = doc_id
-                            result["filename"] = doc_info["filename"]
-                        all_results.extend(doc_results)
-                    except Exception as e:
-                        print(f"문서 {doc_id} 검색 오류: {str(e)}")
-        
-        # 점수 기준으로 정렬
-        all_results.sort(key=lambda x: x["score"], reverse=True)
-        
-        # 상위 top_k 결과만 반환
-        return all_results[:top_k] 
\ No newline at end of file
+                self._index = index
+                self._active_type = index_type
+                self._generation += 1
+                self._clear_deleted()
+    
+    def _lookup_chunk(self, chunk_id: int) -> Optional[Tuple[str, int]]:
+        """통합 인덱스의 청크 ID를 (doc_id, 문서 내 청크 인덱스)로 변환합니다."""
+        position = bisect_right(self._range_starts, chunk_id) - 1
+        if position < 0:
+            return None
+        
+        doc_id = self._range_docs[position]
+        start_id, count = self._doc_ranges[doc_id]
+        if chunk_id >= start_id + count:
+            return None
+        return doc_id, chunk_id - start_id
+    
+    @staticmethod
+    def _filename_from_store(vector_store: VectorStore) -> str:
+        """벡터 저장소 메타데이터에서 표시용 파일명을 가져옵니다."""
+        return vector_store.metadata.get("original_filename") or f"{vector_store.doc_id}.pdf"
+    
+    @staticmethod
+    def _dense_search(
+        index: Optional[faiss.Index], 
+        active_type: str, 
+        live_selector: Optional[faiss.IDSelector], 
+        query_embedding: np.ndarray, 
+        top_k: int, 
+        nprobe: int, 
+        ef_search: int
+    ) -> List[Tuple[int, float]]:
+        """통합 벡터 인덱스 스냅샷에서 [(청크 ID, 코사인 유사도)]를 검색합니다 (_rw_lock 읽기 구간에서 호출)."""
+        if index is None or index.ntotal == 0:
+            return []
+        
+        # 쿼리 벡터 정규화
+        query_embedding = query_embedding.reshape(1, -1)
+        normalized_query = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
+        
+        params = IndexFactory.search_parameters(active_type, nprobe, ef_search, live_selector)
+        scores, ids = index.search(normalized_query.astype(np.float32), top_k, params=params)
+        return [(int(chunk_id), float(score)) for score, chunk_id in zip(scores[0], ids[0]) if chunk_id != -1]
+    
+    @staticmethod
+    def _fuse_rankings(rankings: Dict[str, List[Tuple[int, float]]], top_k: int) -> List[Tuple[int, float, Dict[str, float]]]:
+        """
+        여러 검색 결과를 Reciprocal Rank Fusion으로 합칩니다.
+        
+        Returns:
+            [(청크 ID, RRF 점수, {검색 방식: 원래 점수})] RRF 점수 내림차순
+        """
+        fused: Dict[int, float] = {}
+        source_scores: Dict[int, Dict[str, float]] = {}
+        for name, hits in rankings.items():
+            for rank, (chunk_id, score) in enumerate(hits, 1):
+                fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (settings.RRF_K + rank)
+                source_scores.setdefault(chunk_id, {})[f"{name}_score"] = score
+        
+        ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(chunk_id, score, source_scores[chunk_id]) for chunk_id, score in ordered]
+    
+    def search(
+        self, 
+        query_embedding: Optional[np.ndarray], 
+        top_k: int, 
+        nprobe: int = None, 
+        ef_search: int = None, 
+        query_text: str = None, 
+        retrieval_mode: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        통합 코퍼스에서 검색합니다.
+        
+        - dense: 통합 벡터 인덱스에서 한 번의 FAISS 호출 (점수: 코사인 유사도)
+        - sparse: BM25 역색인 검색 (점수: BM25)
+        - hybrid: 두 결과를 RRF로 융합 (점수: RRF, dense_score/sparse_score 함께 제공)
+        
+        Args:
+            query_embedding: 쿼리 임베딩 벡터 (sparse 모드에서는 생략 가능)
+            top_k: 상위 k개 결과
+            nprobe: IVF 인덱스의 요청별 탐색 클러스터 수
+            ef_search: HNSW 인덱스의 요청별 탐색 폭
+            query_text: 원문 검색어 (sparse/hybrid 모드에 필요)
+            retrieval_mode: 검색 방식 (기본값: 설정에서 가져옴)
+            
+        Returns:
+            검색 결과 리스트 [{"chunk", "score", "rank", "doc_id", "filename", "retrieval_mode"}]
+            
+        Raises:
+            ValueError: 지원하지 않는 검색 방식이거나 해당 방식에 필요한 입력이 없는 경우
+        """
+        retrieval_mode = (retrieval_mode or settings.RETRIEVAL_MODE).lower()
+        if retrieval_mode not in self.RETRIEVAL_MODES:
+            raise ValueError(f"지원하지 않는 검색 방식입니다: {retrieval_mode} (가능: {', '.join(self.RETRIEVAL_MODES)})")
+        
+        # 검색 방식에 필요한 입력이 없으면 인덱스 내부 오류 대신 요청 오류로 알림
+        if retrieval_mode in ("dense", "hybrid") and query_embedding is None:
+            raise ValueError(f"{retrieval_mode} 검색에는 쿼리 임베딩이 필요합니다.")
+        if retrieval_mode in ("sparse", "hybrid") and not (query_text and query_text.strip()):
+            raise ValueError(f"{retrieval_mode} 검색에는 검색어 원문이 필요합니다.")
+        
+        self._ensure_loaded()
+        
+        # 읽기 구간에서는 문서 추가/삭제가 일어나지 않으므로 다른 검색과 동시에 _lock 없이 검색
+        with self._rw_lock.read():
+            with self._lock:
+                # 백그라운드 재구성이 교체할 수 있는 인덱스와 삭제 필터는 한 쌍으로 가져옴
+                index, active_type, live_selector = self._index, self._active_type, self._live_selector
+            
+            if retrieval_mode == "dense":
+                hits = [(chunk_id, score, {}) for chunk_id, score in
+                        self._dense_search(index, active_type, live_selector, query_embedding, top_k, nprobe, ef_search)]
+            elif retrieval_mode == "sparse":
+                hits = [(chunk_id, score, {}) for chunk_id, score in
+                        self._sparse.search(query_text, top_k, self._doc_ranges)]
+            else:
+                candidates = max(top_k, settings.HYBRID_CANDIDATES)
+                hits = self._fuse_rankings({
+                    "dense": self._dense_search(index, active_type, live_selector, query_embedding, candidates, nprobe, ef_search),
+                    "sparse": self._sparse.search(query_text, candidates, self._doc_ranges)
+                }, top_k)
+            
+            results = []
+            for chunk_id, score, source_scores in hits:
+                location = self._lookup_chunk(chunk_id)
+                if location is None:
+                    continue
+                
+                doc_id, chunk_idx = location
+                chunks = self._stores[doc_id].chunks
+                if chunk_idx >= len(chunks):
+                    continue
+                
+                results.append({
+                    "chunk": chunks[chunk_idx],
+                    "score": score,
+                    "rank": len(results) + 1,
+                    "doc_id": doc_id,
+                    "filename": self._filenames[doc_id],
+                    "retrieval_mode": retrieval_mode,
+                    **source_scores
+                })
+            
+            return results
+    
+    def get(self, doc_id: str) -> Optional[VectorStore]:
+        """
+        문서의 벡터 저장소를 반환합니다. 상주하지 않은 경우 디스크에서 로드합니다.
+        
+        반환된 저장소의 문서별 인덱스는 해제되어 있을 수 있으며, 필요 시 load_index로
+        디스크에서 다시 로드됩니다.
+        
+        Args:
+            doc_id: 문서 ID
+            
+        Returns:
+            벡터 저장소 인스턴스 또는 None
+        """
+        self._ensure_loaded()
+        
+        with self._lock:
+            vector_store = self._stores.get(doc_id)
+        if vector_store is not None:
+            return vector_store
+        
+        with self._rw_lock.write(), self._lock:
+            vector_store = self._stores.get(doc_id)
+            if vector_store is None:
+                vector_store = self._load_document(doc_id)
+            return vector_store
+    
+    def register(self, vector_store: VectorStore, filename: str = None):
+        """
+        새로 생성된 벡터 저장소를 통합 인덱스에 증분 추가합니다.
+        
+        Args:
+            vector_store: 인덱스가 생성된 벡터 저장소
+            filename: 표시용 원본 파일명
+        """
+        self._ensure_loaded()
+        
+        with self._rw_lock.write(), self._lock:
+            self._add_document(vector_store, filename)
+    
+    def remove(self, doc_id: str):
+        """문서를 레지스트리와 통합 인덱스에서 제거합니다."""
+        with self._rw_lock.write(), self._lock:
+            self._remove_document(doc_id)
+    
+    def rename(self, doc_id: str, filename: str):
+        """문서의 표시용 파일명을 갱신합니다."""
+        with self._lock:
+            if doc_id in self._stores:
+                self._filenames[doc_id] = filename
+                self._version += 1
+                self._stores[doc_id].metadata["original_filename"] = filename
+    
+    def invalidate(self):
+        """모든 상주 데이터를 버리고 다음 사용 시 디스크에서 다시 로드합니다."""
+        with self._rw_lock.write(), self._lock:
+            for vector_store in self._stores.values():
+                vector_store.chunks.close()
+            self._stores.clear()
+            self._filenames.clear()
+            self._index = None
+            self._active_type = None
+            self._dimension = None
+            self._next_id = 0
+            self._doc_ranges.clear()
+            self._range_starts.clear()
+            self._range_docs.clear()
+            self._sparse.clear()
+            self._clear_deleted()
+            self._version += 1
+            self._generation += 1
+            self._loaded = False
+    
+    @property
+    def version(self) -> int:
+        """문서 집합 버전을 반환합니다 (업로드/삭제/파일명 변경 시 증가)."""
+        return self._version
+    
+    @property
+    def is_loaded(self) -> bool:
+        """디스크의 문서를 이미 로드했는지 반환합니다 (조회만 하며 로드하지 않음)."""
+        return self._loaded
+    
+    @property
+    def total_vectors(self) -> int:
+        """통합 인덱스의 전체 벡터 수를 반환합니다 (삭제 표시된 벡터 제외)."""
+        return self._index.ntotal - len(self._deleted_ids) if self._index is not None else 0
+    
+    def index_info(self) -> Dict[str, Any]:
+        """통합 인덱스의 종류와 학습 상태를 반환합니다."""
+        self._ensure_loaded()
+        
+        return {
+            "configured_type": self._index_type,
+            "active_type": self._active_type,
+            "factory": IndexFactory.describe(self._active_type) if self._active_type else None,
+            "is_trained": self._index.is_trained if self._index is not None else False,
+            "total_vectors": self.total_vectors,
+            "deleted_vectors": len(self._deleted_ids),
+            "dimension": self._dimension,
+            "min_training_vectors": IndexFactory.min_training_vectors(self._index_type),
+            "mmap": self._mmap,
+            "retrieval_mode": settings.RETRIEVAL_MODE,
+            "sparse_index": self._sparse.get_statistics()
+        }
+    
+    def memory_info(self) -> Dict[str, Any]:
+        """
+        통합 인덱스와 청크 파일이 차지하는 메모리를 추정합니다.
+        
+        mmap 모드의 벡터와 청크 파일은 OS 페이지 캐시에 있어 워커 간에 공유되며,
+        힙 모드의 벡터는 워커마다 별도로 복사됩니다.
+        """
+        vector_bytes = self.total_vectors * (self._dimension or 0) * 4
+        
+        with self._lock:
+            chunk_bytes = sum(store.chunks.size_bytes() for store in self._stores.values())
+        
+        return {
+            "vector_mmap": self._mmap,
+            "vector_bytes": vector_bytes,
+            "vector_heap_bytes": 0 if self._mmap else vector_bytes,
+            "vector_shared_bytes": vector_bytes if self._mmap else 0,
+            "chunk_mapped_bytes": chunk_bytes
+        }
+    
+    def evaluate_recall(
+        self, 
+        num_queries: int = 100, 
+        top_k: int = 10, 
+        nprobe_values: List[int] = None, 
+        ef_search_values: List[int] = None
+    ) -> Dict[str, Any]:
+        """
+        현재 통합 인덱스의 recall@k를 flat(정확 검색) 결과와 비교합니다.
+        
+        정답은 디스크의 문서별 flat 인덱스에서 만든 정확 검색 결과이며, 코퍼스에서
+        무작위로 뽑은 청크 벡터를 쿼리로 사용합니다. 정답 인덱스 구성은 락 밖에서,
+        파라미터별 검색은 다른 검색과 같은 읽기 구간에서 수행합니다.
+        
+        Args:
+            num_queries: 평가에 사용할 쿼리 수
+            top_k: recall 계산 기준 k
+            nprobe_values: 비교할 IVF nprobe 값 목록
+            ef_search_values: 비교할 HNSW efSearch 값 목록
+            
+        Returns:
+            파라미터별 recall 및 평균 검색 지연 시간 리포트
+        """
+        self._ensure_loaded()
+        
+        with self._lock:
+            is_empty = self.total_vectors == 0
+            generation = self._generation
+            active_type = self._active_type
+            dimension = self._dimension
+            doc_ranges = dict(self._doc_ranges)
+        
+        # index_info는 _ensure_loaded에서 rw 락을 잡을 수 있으므로 _lock을 놓은 뒤 호출 (search와 같은 락 순서 유지)
+        if is_empty:
+            return {"index": self.index_info(), "results": []}
+        
+        # 문서별 flat 인덱스 파일에서 정확한 벡터로 정답 인덱스 구성
+        exact_index = faiss.IndexIDMap(faiss.IndexFlatIP(dimension))
+        for doc_id, (start_id, count) in doc_ranges.items():
+            doc_store = VectorStore(doc_id)
+            if count == 0 or not doc_store.load_index():
+                continue
+            vectors = doc_store.index.reconstruct_n(0, count)
+            doc_store.chunks.close()
+            exact_index.add_with_ids(vectors, np.arange(start_id, start_id + count, dtype=np.int64))
+        
+        # 디스크에서 문서별 인덱스를 하나도 읽지 못했으면 비교할 정답이 없음
+        if exact_index.ntotal == 0:
+            return {"index": self.index_info(), "results": []}
+        
+        # 쿼리 샘플링 (정답 인덱스 내부 위치 기준)
+        rng = np.random.default_rng(0)
+        positions = rng.choice(exact_index.ntotal, size=min(num_queries, exact_index.ntotal), replace=False)
+        queries = np.vstack([exact_index.index.reconstruct(int(position)) for position in positions])
+        
+        _, exact_ids = exact_index.search(queries, top_k)
+        
+        if active_type in IndexFactory.IVF_TYPES:
+            candidates = [{"nprobe": n} for n in (nprobe_values or [1, 4, 16, 64, settings.IVF_NLIST])]
+        elif active_type == "hnsw":
+            candidates = [{"ef_search": e} for e in (ef_search_values or [16, 32, 64, 128, 256])]
+        else:
+            candidates = [{}]
+        
+        results = []
+        for candidate in candidates:
+            with self._rw_lock.read():
+                with self._lock:
+                    # 정답을 만든 뒤 문서가 바뀌었으면 비교 결과가 의미 없으므로 중단
+                    if self._generation != generation:
+                        raise RuntimeError("평가 중 통합 인덱스가 변경되었습니다. 다시 시도하십시오.")
+                    index, live_selector = self._index, self._live_selector
+                
+                params = IndexFactory.search_parameters(
+                    active_type, candidate.get("nprobe"), candidate.get("ef_search"), live_selector
+                )
+                started = time.perf_counter()
+                _, approx_ids = index.search(queries, top_k, params=params)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            
+            hits = sum(
+                len(set(exact_row[exact_row != -1]) & set(approx_row[approx_row != -1]))
+                for exact_row, approx_row in zip(exact_ids, approx_ids)
+            )
+            expected = int((exact_ids != -1).sum())
+            
+            results.append({
+                **candidate,
+                f"recall_at_{top_k}": round(hits / max(expected, 1), 4),
+                "avg_latency_ms": round(elapsed_ms / len(queries), 4)
+            })
+        
+        return {
+            "index": self.index_info(),
+            "num_queries": len(queries),
+            "top_k": top_k,
+            "results": results
+        }
+
+# 글로벌 벡터 저장소 레지스트리 인스턴스
+vector_registry = VectorStoreRegistry()
@@ -0,0 +1,401 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from config import settings
+
+class DocumentCatalog:
+    """
+    업로드된 문서의 목록과 상태를 보관하는 SQLite 카탈로그
+    
+    문서 목록, 헬스 체크, 통계 조회가 PDF 디렉터리를 훑거나 메타데이터 JSON을 열지 않고
+    카탈로그 한 번 조회로 끝나도록, 업로드/개정/이름 변경/삭제 시점에 트랜잭션으로 갱신합니다.
+    카탈로그 파일이 처음 만들어질 때는 디스크의 기존 문서로 한 번 채웁니다
+    (기존 file_hashes.json 해시 인덱스도 함께 가져옵니다).
+    
+    벡터 수, 차원, 디스크 사용량 같은 통계도 수집 시점에 문서별로 기록해 두므로,
+    코퍼스 전체 통계는 인덱스 파일을 열지 않고 집계 쿼리 한 번으로 계산됩니다.
+    """
+    
+    COLUMNS = (
+        "doc_id", "filename", "file_size", "created_at", "updated_at", "file_hash",
+        "page_count", "chunk_count", "has_vector", "has_metadata", "status",
+        "vector_count", "dimension", "disk_bytes"
+    )
+    
+    # 이전 버전 카탈로그에 없던 통계 컬럼 (열 때 추가)
+    STATISTICS_COLUMNS = {
+        "vector_count": "INTEGER",
+        "dimension": "INTEGER",
+        "disk_bytes": "INTEGER"
+    }
+    
+    def __init__(self, db_path: Path = None):
+        """
+        문서 카탈로그를 초기화합니다.
+        
+        Args:
+            db_path: SQLite 파일 경로 (기본값: 설정에서 가져옴)
+        """
+        self.db_path = Path(db_path or settings.DOCUMENT_CATALOG_PATH)
+        self._lock = threading.Lock()
+        self._conn = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """최초 사용 시 DB에 연결하고, 새 카탈로그면 디스크의 문서로 채웁니다 (_lock 안에서 호출)."""
+        if self._conn is not None:
+            return self._conn
+        
+        # 여러 워커 프로세스가 같은 파일을 쓰므로 WAL 모드와 잠금 대기 시간 사용
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY,
+                filename TEXT,
+                file_size INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                file_hash TEXT,
+                page_count INTEGER,
+                chunk_count INTEGER,
+                has_vector INTEGER NOT NULL DEFAULT 0,
+                has_metadata INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                vector_count INTEGER,
+                dimension INTEGER,
+                disk_bytes INTEGER
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS documents_file_hash ON documents (file_hash)")
+        conn.execute("CREATE TABLE IF NOT EXISTS catalog_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+        
+        # 다른 워커가 동시에 초기화하지 않도록 쓰기 잠금을 잡은 뒤 다시 확인
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            initialized = conn.execute("SELECT value FROM catalog_meta WHERE key = 'initialized'").fetchone()
+            if initialized is None:
+                count = self._scan_documents(conn)
+                conn.execute("INSERT INTO catalog_meta (key, value) VALUES ('initialized', ?)", (str(time.time()),))
+                print(f"문서 카탈로그 생성 완료: {count}개 문서")
+            else:
+                self._migrate_statistics(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            conn.close()
+            raise
+        
+        self._conn = conn
+        return conn
+    
+    @staticmethod
+    def _read_statistics(doc_id: str) -> Dict[str, Any]:
+        """디스크의 메타데이터 헤더와 청크 파일에서 문서 통계를 읽습니다 (카탈로그 생성/변환 시)."""
+        from utils.file_utils import FileManager
+        
+        statistics = {
+            "filename": None,
+            "page_count": None,
+            "chunk_count": None,
+            "vector_count": None,
+            "dimension": None,
+            "disk_bytes": FileManager.get_document_disk_bytes(doc_id)
+        }
+        
+        metadata_path = FileManager.get_metadata_path(doc_id)
+        if metadata_path.exists():
+            try:
+                with open(metadata_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                if isinstance(metadata, dict):
+                    statistics["filename"] = metadata.get("original_filename")
+                    statistics["chunk_count"] = metadata.get("total_chunks", len(metadata.get("chunks", [])))
+                    statistics["dimension"] = metadata.get("dimension")
+                else:
+                    statistics["chunk_count"] = len(metadata)  # 구 형식 (청크 리스트)
+            except Exception:
+                pass
+        
+        # 문서 인덱스는 청크마다 벡터 하나를 가짐
+        if FileManager.get_vectorstore_path(doc_id).exists():
+            statistics["vector_count"] = statistics["chunk_count"]
+        
+        # 수집 시점(mark_indexed)과 같이 PDF의 전체 페이지 수를 사용 (텍스트 없는 끝 페이지 포함)
+        pdf_path = FileManager.get_pdf_path(doc_id)
+        if pdf_path.exists():
+            from services.pdf_processor import PDFProcessor
+            try:
+                statistics["page_count"] = PDFProcessor.get_page_count(pdf_path)
+            except Exception:
+                pass
+        
+        # PDF를 열 수 없으면 청크가 있는 마지막 페이지로 대신함
+        table_path = FileManager.get_chunk_table_path(doc_id)
+        if statistics["page_count"] is None and table_path.exists():
+            import numpy as np
+            records = np.load(table_path, mmap_mode='r')
+            if len(records):
+                statistics["page_count"] = int(records["page"].max())
+        
+        return statistics
+    
+    @staticmethod
+    def _scan_documents(conn: sqlite3.Connection) -> int:
+        """디스크의 PDF와 메타데이터로 카탈로그를 채웁니다 (트랜잭션 안에서 호출)."""
+        from utils.file_utils import FileManager
+        
+        # 이전 해시 인덱스가 있으면 재사용 (없는 문서만 새로 해시)
+        legacy_hashes: Dict[str, str] = {}
+        hash_index_path = FileManager.get_hash_index_path()
+        if hash_index_path.exists():
+            with open(hash_index_path, 'r', encoding='utf-8') as f:
+                legacy_hashes = {doc_id: file_hash for file_hash, doc_id in json.load(f).items()}
+        
+        rows = []
+        for pdf_file in settings.PDF_DIR.glob("*.pdf"):
+            doc_id = pdf_file.stem
+            stat = pdf_file.stat()
+            statistics = DocumentCatalog._read_statistics(doc_id)
+            has_vector = FileManager.get_vectorstore_path(doc_id).exists()
+            has_metadata = FileManager.get_metadata_path(doc_id).exists()
+            
+            rows.append((
+                doc_id, statistics["filename"], stat.st_size, stat.st_ctime, stat.st_mtime,
+                legacy_hashes.get(doc_id) or FileManager.compute_file_hash(pdf_file),
+                statistics["page_count"], statistics["chunk_count"], int(has_vector), int(has_metadata),
+                "indexed" if has_vector and has_metadata else "incomplete",
+                statistics["vector_count"], statistics["dimension"], statistics["disk_bytes"]
+            ))
+        
+        conn.execute("DELETE FROM documents")
+        conn.executemany(
+            f"INSERT INTO documents ({', '.join(DocumentCatalog.COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(DocumentCatalog.COLUMNS))})",
+            rows
+        )
+        return len(rows)
+    
+    @staticmethod
+    def _migrate_statistics(conn: sqlite3.Connection):
+        """통계 컬럼이 없는 이전 카탈로그에 컬럼을 추가하고 디스크에서 값을 채웁니다 (트랜잭션 안에서 호출)."""
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(documents)")}
+        missing = [column for column in DocumentCatalog.STATISTICS_COLUMNS if column not in existing]
+        if not missing:
+            return
+        
+        for column in missing:
+            conn.execute(f"ALTER TABLE documents ADD COLUMN {column} {DocumentCatalog.STATISTICS_COLUMNS[column]}")
+        
+        doc_ids = [row["doc_id"] for row in conn.execute("SELECT doc_id FROM documents")]
+        for doc_id in doc_ids:
+            statistics = DocumentCatalog._read_statistics(doc_id)
+            conn.execute(
+                "UPDATE documents SET vector_count = ?, dimension = ?, disk_bytes = ?, "
+                "page_count = COALESCE(page_count, ?), chunk_count = COALESCE(chunk_count, ?) "
+                "WHERE doc_id = ?",
+                (
+                    statistics["vector_count"], statistics["dimension"], statistics["disk_bytes"],
+                    statistics["page_count"], statistics["chunk_count"], doc_id
+                )
+            )
+        print(f"문서 카탈로그 통계 컬럼 추가 완료: {len(doc_ids)}개 문서")
+    
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """DB 행을 문서 정보 딕셔너리로 변환합니다."""
+        document = dict(row)
+        document["has_vector"] = bool(document["has_vector"])
+        document["has_metadata"] = bool(document["has_metadata"])
+        return document
+    
+    def add(self, doc_id: str, filename: str, file_size: int, file_hash: str = None):
+        """
+        새로 업로드되어 처리 대기 중인 문서를 등록합니다.
+        
+        Args:
+            doc_id: 문서 ID
+            filename: 원본 파일명
+            file_size: 파일 크기 (바이트)
+            file_hash: PDF의 SHA-256 해시
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._insert_processing(conn, doc_id, filename, file_size, file_hash)
+    
+    def claim_hash(self, doc_id: str, filename: str, file_size: int, file_hash: str) -> Optional[str]:
+        """
+        같은 해시의 문서가 없을 때만 새 문서를 처리 대기 상태로 등록합니다.
+        
+        조회와 등록을 한 쓰기 트랜잭션(BEGIN IMMEDIATE)에서 수행하므로, 여러 워커에 동시에
+        들어온 동일한 업로드 중 하나만 등록되고 나머지는 그 문서 ID를 받습니다.
+        인덱싱이 끝났거나 처리 중인 문서만 기존 문서로 인정합니다 (PDF가 사라진 문서 제외).
+        
+        Args:
+            doc_id: 새 문서 ID
+            filename: 원본 파일명
+            file_size: 파일 크기 (바이트)
+            file_hash: PDF의 SHA-256 해시
+            
+        Returns:
+            동일한 기존 문서 ID (없어서 새로 등록했으면 None)
+        """
+        from utils.file_utils import FileManager
+        
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT doc_id FROM documents WHERE file_hash = ? AND doc_id != ? "
+                    "AND status IN ('indexed', 'processing') ORDER BY created_at",
+                    (file_hash, doc_id)
+                ).fetchall()
+                existing = next(
+                    (row["doc_id"] for row in rows if FileManager.get_pdf_path(row["doc_id"]).exists()), None
+                )
+                if existing is None:
+                    self._insert_processing(conn, doc_id, filename, file_size, file_hash)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return existing
+    
+    @staticmethod
+    def _insert_processing(conn: sqlite3.Connection, doc_id: str, filename: str, file_size: int, file_hash: str):
+        """문서를 처리 대기 상태로 기록합니다 (트랜잭션 안에서 호출)."""
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO documents "
+            "(doc_id, filename, file_size, created_at, updated_at, file_hash, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'processing')",
+            (doc_id, filename, file_size, now, now, file_hash)
+        )
+    
+    def mark_indexed(
+        self,
+        doc_id: str,
+        page_count: int,
+        chunk_count: int,
+        vector_count: int,
+        dimension: int,
+        disk_bytes: int,
+        file_size: int = None,
+        file_hash: str = None
+    ):
+        """
+        인덱싱이 끝난 문서의 상태와 통계를 기록합니다 (개정본이면 크기/해시도 교체).
+        
+        Args:
+            doc_id: 문서 ID
+            page_count: 페이지 수
+            chunk_count: 청크 수
+            vector_count: 인덱스 벡터 수
+            dimension: 임베딩 차원
+            disk_bytes: 문서 관련 파일 전체 크기 (PDF, 인덱스, 청크, 역색인)
+            file_size: 새 파일 크기 (개정본 반영 시)
+            file_hash: 새 SHA-256 해시 (개정본 반영 시)
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE documents SET page_count = ?, chunk_count = ?, vector_count = ?, dimension = ?, "
+                    "disk_bytes = ?, has_vector = 1, has_metadata = 1, status = 'indexed', updated_at = ?, "
+                    "file_size = COALESCE(?, file_size), file_hash = COALESCE(?, file_hash) "
+                    "WHERE doc_id = ?",
+                    (
+                        page_count, chunk_count, vector_count, dimension, disk_bytes, time.time(),
+                        file_size, file_hash, doc_id
+                    )
+                )
+    
+    def rename(self, doc_id: str, filename: str):
+        """문서의 원본 파일명을 변경합니다."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE documents SET filename = ?, updated_at = ? WHERE doc_id = ?",
+                    (filename, time.time(), doc_id)
+                )
+    
+    def remove(self, doc_id: str):
+        """문서를 카탈로그에서 제거합니다."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+    
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """문서 정보를 반환합니다 (없으면 None)."""
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        return self._to_dict(row) if row else None
+    
+    def find_by_hash(self, file_hash: str) -> Optional[str]:
+        """같은 SHA-256 해시를 가진 문서 중 가장 먼저 업로드된 문서 ID를 반환합니다."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT doc_id FROM documents WHERE file_hash = ? ORDER BY created_at LIMIT 1",
+                (file_hash,)
+            ).fetchone()
+        return row["doc_id"] if row else None
+    
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """모든 문서 정보를 업로드 순서대로 반환합니다."""
+        with self._lock:
+            rows = self._connect().execute("SELECT * FROM documents ORDER BY created_at").fetchall()
+        return [self._to_dict(row) for row in rows]
+    
+    def summary(self) -> Dict[str, Any]:
+        """문서 수와 처리 상태를 집계합니다 (문서 목록을 읽지 않음)."""
+        with self._lock:
+            row = self._connect().execute("""
+                SELECT
+                    COUNT(*) AS total_documents,
+                    COALESCE(SUM(has_vector AND has_metadata), 0) AS processed_documents,
+                    COALESCE(SUM(has_vector), 0) AS documents_with_vectors,
+                    COALESCE(SUM(has_metadata), 0) AS documents_with_metadata,
+                    COALESCE(SUM(file_size), 0) AS total_size,
+                    COALESCE(SUM(chunk_count), 0) AS total_chunks,
+                    COALESCE(SUM(page_count), 0) AS total_pages,
+                    COALESCE(SUM(vector_count), 0) AS total_vectors,
+                    COALESCE(SUM(disk_bytes), 0) AS disk_bytes
+                FROM documents
+            """).fetchone()
+            dimensions = self._connect().execute(
+                "SELECT DISTINCT dimension FROM documents WHERE dimension IS NOT NULL ORDER BY dimension"
+            ).fetchall()
+        
+        summary = dict(row)
+        summary["embedding_dimensions"] = [dimension["dimension"] for dimension in dimensions]
+        return summary
+    
+    def rebuild(self) -> int:
+        """
+        디스크의 문서로 카탈로그를 다시 만듭니다 (파일을 직접 옮기거나 지운 경우).
+        
+        Returns:
+            등록된 문서 수
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return self._scan_documents(conn)
+    
+    def close(self):
+        """DB 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# 글로벌 문서 카탈로그 인스턴스
+document_catalog = DocumentCatalog()
\ No newline at end of file
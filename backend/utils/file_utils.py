@@ -1,8 +1,12 @@
+import hashlib
+import os
+import shutil
 import uuid
 import aiofiles
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple, Dict, Any, List
 from config import settings
+from utils.document_catalog import document_catalog
 
 class FileManager:
     """파일 저장 및 관리 유틸리티 클래스"""
@@ -17,6 +21,11 @@ class FileManager:
         """문서 ID로 PDF 파일 경로를 반환합니다."""
         return settings.PDF_DIR / f"{doc_id}.pdf"
     
+    @staticmethod
+    def get_pending_pdf_path(doc_id: str) -> Path:
+        """문서 ID로 개정본 처리 중인 PDF의 임시 경로를 반환합니다 (요청마다 다른 이름, 문서 목록에서 제외됨)."""
+        return settings.PDF_DIR / f"{doc_id}.{uuid.uuid4().hex}.pdf.part"
+    
     @staticmethod
     def get_vectorstore_path(doc_id: str) -> Path:
         """문서 ID로 벡터 저장소 경로를 반환합니다."""
@@ -27,6 +36,82 @@ class FileManager:
         """문서 ID로 메타데이터 파일 경로를 반환합니다."""
         return settings.VECTORSTORE_DIR / f"{doc_id}_metadata.json"
     
+    @staticmethod
+    def get_chunk_table_path(doc_id: str) -> Path:
+        """문서 ID로 청크 레코드(오프셋) 파일 경로를 반환합니다."""
+        return settings.VECTORSTORE_DIR / f"{doc_id}_chunks.npy"
+    
+    @staticmethod
+    def get_chunk_text_path(doc_id: str) -> Path:
+        """문서 ID로 청크 본문(UTF-8 블롭) 파일 경로를 반환합니다."""
+        return settings.VECTORSTORE_DIR / f"{doc_id}_chunks.bin"
+    
+    @staticmethod
+    def get_sparse_index_path(doc_id: str) -> Path:
+        """문서 ID로 BM25 역색인 파일 경로를 반환합니다."""
+        return settings.VECTORSTORE_DIR / f"{doc_id}_bm25.npz"
+    
+    @staticmethod
+    def get_document_paths(doc_id: str) -> List[Path]:
+        """문서와 관련된 모든 파일(PDF, 인덱스, 메타데이터, 청크, 역색인) 경로를 반환합니다."""
+        return [
+            FileManager.get_pdf_path(doc_id), 
+            FileManager.get_vectorstore_path(doc_id), 
+            FileManager.get_metadata_path(doc_id), 
+            FileManager.get_chunk_table_path(doc_id), 
+            FileManager.get_chunk_text_path(doc_id), 
+            FileManager.get_sparse_index_path(doc_id)
+        ]
+    
+    @staticmethod
+    def get_document_disk_bytes(doc_id: str) -> int:
+        """문서와 관련된 모든 파일(PDF, 인덱스, 메타데이터, 청크, 역색인)의 전체 크기를 반환합니다."""
+        total = 0
+        for path in FileManager.get_document_paths(doc_id):
+            if path.exists():
+                total += path.stat().st_size
+        return total
+    
+    @staticmethod
+    def backup_document_files(doc_id: str) -> Dict[Path, Path]:
+        """
+        문서 파일의 현재 내용을 보존합니다 (개정본 반영 실패 시 복구용).
+        
+        문서 파일은 모두 임시 파일에 쓴 뒤 교체되므로, 교체 전에 걸어 둔 하드 링크는
+        복사 없이 이전 내용을 그대로 가리킵니다 (하드 링크를 지원하지 않으면 복사).
+        
+        Returns:
+            {원래 경로: 백업 경로}
+        """
+        backups = {}
+        try:
+            for path in FileManager.get_document_paths(doc_id):
+                if not path.exists():
+                    continue
+                backup_path = path.with_name(f"{path.name}.bak")
+                backup_path.unlink(missing_ok=True)
+                try:
+                    os.link(path, backup_path)
+                except OSError:
+                    shutil.copy2(path, backup_path)
+                backups[path] = backup_path
+        except Exception:
+            FileManager.discard_backup(backups)
+            raise
+        return backups
+    
+    @staticmethod
+    def restore_backup(backups: Dict[Path, Path]):
+        """backup_document_files로 보존한 파일을 원래 경로로 되돌립니다."""
+        for path, backup_path in backups.items():
+            backup_path.replace(path)
+    
+    @staticmethod
+    def discard_backup(backups: Dict[Path, Path]):
+        """backup_document_files로 보존한 파일을 삭제합니다."""
+        for backup_path in backups.values():
+            backup_path.unlink(missing_ok=True)
+    
     @staticmethod
     async def save_uploaded_file(file_content: bytes, doc_id: str) -> Path:
         """업로드된 파일을 저장합니다."""
@@ -37,6 +122,46 @@ class FileManager:
         
         return file_path
     
+    @staticmethod
+    async def save_upload_stream(upload_file, doc_id: str, max_size: int, file_path: Path = None) -> Tuple[Path, int, str]:
+        """
+        업로드 본문을 메모리에 모두 올리지 않고 청크 단위로 디스크에 저장합니다.
+        
+        저장하면서 SHA-256 해시를 함께 계산하므로 중복 업로드 판별에 추가 읽기가 필요 없습니다.
+        
+        Args:
+            upload_file: FastAPI UploadFile
+            doc_id: 문서 ID
+            max_size: 허용 최대 크기 (바이트)
+            file_path: 저장 경로 (기본값: 문서의 PDF 경로)
+            
+        Returns:
+            (저장된 파일 경로, 파일 크기, SHA-256 해시)
+        """
+        file_path = file_path or FileManager.get_pdf_path(doc_id)
+        file_size = 0
+        digest = hashlib.sha256()
+        
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                while True:
+                    block = await upload_file.read(settings.UPLOAD_READ_CHUNK_SIZE)
+                    if not block:
+                        break
+                    
+                    file_size += len(block)
+                    if file_size > max_size:
+                        raise ValueError(f"파일 크기는 {max_size // (1024 * 1024)}MB를 초과할 수 없습니다.")
+                    
+                    digest.update(block)
+                    await f.write(block)
+        except Exception:
+            if file_path.exists():
+                file_path.unlink()
+            raise
+        
+        return file_path, file_size, digest.hexdigest()
+    
     @staticmethod
     def delete_document_files(doc_id: str) -> bool:
         """문서와 관련된 모든 파일을 삭제합니다."""
@@ -56,40 +181,84 @@ class FileManager:
             if metadata_path.exists():
                 metadata_path.unlink()
             
+            # 청크 파일 및 BM25 역색인 삭제
+            for chunk_path in (
+                FileManager.get_chunk_table_path(doc_id), 
+                FileManager.get_chunk_text_path(doc_id), 
+                FileManager.get_sparse_index_path(doc_id)
+            ):
+                if chunk_path.exists():
+                    chunk_path.unlink()
+            
+            # 문서 카탈로그에서 제거
+            document_catalog.remove(doc_id)
+            
+            # 공유 청크 임베딩의 참조 해제 (더 이상 참조되지 않는 임베딩은 제거)
+            from services.embedding_store import chunk_embedding_store
+            chunk_embedding_store.release_document(doc_id)
+            
             return True
         except Exception as e:
             print(f"파일 삭제 오류: {e}")
             return False
     
+    @staticmethod
+    def get_hash_index_path() -> Path:
+        """이전 버전의 파일 해시 인덱스 경로를 반환합니다 (카탈로그 생성 시 가져오기용)."""
+        return settings.DATA_DIR / "file_hashes.json"
+    
+    @staticmethod
+    def compute_file_hash(file_path: Path) -> str:
+        """파일의 SHA-256 해시를 계산합니다."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(settings.UPLOAD_READ_CHUNK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def find_document_by_hash(file_hash: str) -> Optional[str]:
+        """
+        같은 내용(SHA-256)의 PDF가 이미 업로드되어 있으면 그 문서 ID를 반환합니다.
+        
+        Args:
+            file_hash: 업로드 파일의 SHA-256 해시
+            
+        Returns:
+            기존 문서 ID 또는 None
+        """
+        doc_id = document_catalog.find_by_hash(file_hash)
+        
+        # 카탈로그에는 있지만 PDF가 사라진 경우 무시
+        if doc_id and FileManager.get_pdf_path(doc_id).exists():
+            return doc_id
+        return None
+    
     @staticmethod
     def list_documents() -> list[dict]:
-        """저장된 문서 목록을 반환합니다."""
+        """저장된 문서 목록을 반환합니다 (디렉터리를 훑지 않고 문서 카탈로그에서 조회)."""
         documents = []
         
-        for pdf_file in settings.PDF_DIR.glob("*.pdf"):
-            doc_id = pdf_file.stem
-            
-            # 메타데이터 파일 확인
-            metadata_path = FileManager.get_metadata_path(doc_id)
-            vector_path = FileManager.get_vectorstore_path(doc_id)
-            
-            # 원본 파일명 가져오기
-            original_filename = FileManager.get_original_filename(doc_id)
-            
+        for document in document_catalog.list_documents():
             documents.append({
-                "doc_id": doc_id,
-                "filename": original_filename or pdf_file.name,  # 원본 파일명이 있으면 사용, 없으면 UUID 파일명
-                "file_size": pdf_file.stat().st_size,
-                "created_at": pdf_file.stat().st_ctime,
-                "has_vector": vector_path.exists(),
-                "has_metadata": metadata_path.exists()
+                **document,
+                "filename": document["filename"] or f"{document['doc_id']}.pdf"  # 원본 파일명이 없으면 UUID 파일명
             })
         
         return documents
     
+    @staticmethod
+    def get_document_summary() -> Dict[str, Any]:
+        """문서 수와 처리 상태 집계를 반환합니다 (헬스 체크용)."""
+        return document_catalog.summary()
+    
     @staticmethod
     def get_original_filename(doc_id: str) -> Optional[str]:
         """문서의 원본 파일명을 반환합니다."""
+        document = document_catalog.get(doc_id)
+        if document and document["filename"]:
+            return document["filename"]
+        
         try:
             metadata_path = FileManager.get_metadata_path(doc_id)
             if metadata_path.exists():
@@ -0,0 +1,221 @@
+import bisect
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple, Any
+
+# 지연 시간 히스토그램 기본 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class _Metric(ABC):
+    """레이블별 값을 보관하는 메트릭 공통 클래스"""
+    
+    metric_type = ""
+    
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        """레이블 딕셔너리를 정해진 순서의 값 튜플로 변환합니다."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 레이블 불일치: {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def _format_labels(self, key: Tuple[str, ...], extra: Dict[str, str] = None) -> str:
+        """Prometheus 레이블 문자열을 만듭니다."""
+        pairs = list(zip(self.labelnames, key)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        escaped = (
+            f'{name}="{value.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), " ")}"'
+            for name, value in pairs
+        )
+        return "{" + ",".join(escaped) + "}"
+    
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """메트릭 값 줄 목록을 반환합니다 (HELP/TYPE 줄 제외)."""
+    
+    def render(self) -> List[str]:
+        """Prometheus 텍스트 형식의 줄 목록을 반환합니다."""
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self._samples()
+        ]
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    
+    metric_type = "counter"
+    
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = defaultdict(float)
+    
+    def inc(self, amount: float = 1, **labels):
+        """카운터를 증가시킵니다."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] += amount
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{self._format_labels(key)} {value}" for key, value in sorted(self._values.items())]
+
+class Histogram(_Metric):
+    """누적 구간 히스토그램 (합계/개수 포함)"""
+    
+    metric_type = "histogram"
+    
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = defaultdict(float)
+    
+    def observe(self, value: float, **labels):
+        """값을 기록합니다."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] += value
+    
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간을 초 단위로 기록합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key in sorted(self._counts):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), self._counts[key]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{self._format_labels(key, {'le': le})} {cumulative}")
+                lines.append(f"{self.name}_sum{self._format_labels(key)} {self._sums[key]}")
+                lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """
+    애플리케이션 메트릭을 모아 Prometheus 텍스트 형식으로 내보내는 레지스트리
+    
+    값은 워커 프로세스별로 유지되므로, 워커가 여러 개면 스크레이프마다 응답한 워커의
+    값이 반환됩니다 (Prometheus에서 instance/pid 기준으로 합산).
+    """
+    
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+    
+    def counter(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """카운터를 등록합니다."""
+        metric = Counter(name, description, labelnames)
+        self._metrics.append(metric)
+        return metric
+    
+    def histogram(self, name: str, description: str, labelnames: Tuple[str, ...] = (), buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        """히스토그램을 등록합니다."""
+        metric = Histogram(name, description, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self) -> str:
+        """등록된 모든 메트릭을 Prometheus 텍스트 형식으로 반환합니다."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+class StageTimer:
+    """
+    요청/작업 하나의 단계별 소요 시간을 배타적으로 누적하는 타이머
+    
+    단계가 중첩되면 안쪽 단계가 실행되는 동안 바깥 단계의 시간은 멈추므로, 제너레이터로
+    연결된 수집 파이프라인(추출 → 분할 → 임베딩 → 인덱스 기록)도 단계별로 나누어 측정됩니다.
+    """
+    
+    def __init__(self):
+        self.durations: Dict[str, float] = defaultdict(float)
+        self._stack: List[List[Any]] = []  # [단계 이름, 현재 구간 시작 시각]
+    
+    @contextmanager
+    def stage(self, name: str):
+        """블록 실행 시간을 name 단계에 누적합니다."""
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.durations[parent[0]] += now - parent[1]
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            current, started = self._stack.pop()
+            self.durations[current] += now - started
+            if self._stack:
+                self._stack[-1][1] = now
+    
+    def timed(self, iterable: Iterable[Any], name: str) -> Iterator[Any]:
+        """이터러블의 다음 항목을 만드는 시간을 name 단계에 누적합니다."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    
+    def observe(self, histogram: Histogram, **labels):
+        """누적된 단계별 시간을 히스토그램에 기록합니다 (stage 레이블 사용)."""
+        for name, seconds in self.durations.items():
+            histogram.observe(seconds, stage=name, **labels)
+    
+    def as_dict(self) -> Dict[str, float]:
+        """단계별 소요 시간을 밀리초 단위로 반환합니다."""
+        return {name: round(seconds * 1000, 2) for name, seconds in self.durations.items()}
+
+# 글로벌 메트릭 레지스트리 및 메트릭
+metrics = MetricsRegistry()
+
+http_request_seconds = metrics.histogram(
+    "asknou_http_request_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+)
+qa_stage_seconds = metrics.histogram(
+    "asknou_qa_stage_seconds", "QA 파이프라인 단계별 소요 시간", ("stage", "mode")
+)
+qa_requests_total = metrics.counter(
+    "asknou_qa_requests_total", "QA 요청 수 (결과별)", ("mode", "outcome")
+)
+prompt_chars = metrics.histogram(
+    "asknou_prompt_chars", "Gemini 프롬프트 길이 (문자 수)", (),
+    (500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+gemini_tokens_total = metrics.counter(
+    "asknou_gemini_tokens_total", "Gemini 사용 토큰 수 (usageMetadata 기준)", ("kind",)
+)
+gemini_request_tokens = metrics.histogram(
+    "asknou_gemini_request_tokens", "요청당 Gemini 사용 토큰 수", ("kind",),
+    (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+)
+ingest_stage_seconds = metrics.histogram(
+    "asknou_ingest_stage_seconds", "문서 수집 단계별 소요 시간", ("stage", "mode"),
+    (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+)
+ingest_documents_total = metrics.counter(
+    "asknou_ingest_documents_total", "문서 수집 작업 수 (결과별)", ("mode", "outcome")
+)
\ No newline at end of file
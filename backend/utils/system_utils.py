@@ -0,0 +1,48 @@
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Any
+
+class ProcessMonitor:
+    """현재 워커 프로세스의 자원 사용량을 조회하는 유틸리티 클래스"""
+    
+    # /proc/self/status에서 읽을 항목 (kB 단위)
+    PROC_STATUS_FIELDS = {
+        "VmRSS": "rss_bytes",
+        "VmHWM": "peak_rss_bytes",
+        "RssAnon": "anon_bytes",
+        "RssFile": "file_backed_bytes",
+        "RssShmem": "shared_memory_bytes"
+    }
+    
+    @staticmethod
+    def get_memory_usage() -> Dict[str, Any]:
+        """
+        현재 프로세스의 메모리 사용량을 반환합니다.
+        
+        Linux에서는 /proc/self/status를 읽어 익명(힙) 메모리와 파일 매핑(mmap) 메모리를
+        구분하며, 그 외 환경에서는 최대 RSS만 제공합니다.
+        
+        Returns:
+            {"pid": int, "rss_bytes": int, ...}
+        """
+        usage: Dict[str, Any] = {"pid": os.getpid()}
+        
+        status_path = Path("/proc/self/status")
+        if status_path.exists():
+            with open(status_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key in ProcessMonitor.PROC_STATUS_FIELDS:
+                        usage[ProcessMonitor.PROC_STATUS_FIELDS[key]] = int(value.split()[0]) * 1024
+            return usage
+        
+        try:
+            import resource
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # macOS는 바이트, 그 외는 kB 단위
+            usage["peak_rss_bytes"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+        except ImportError:
+            pass
+        
+        return usage
\ No newline at end of file
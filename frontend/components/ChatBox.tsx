@@ -76,21 +76,34 @@ const ChatBox = forwardRef<ChatBoxRef>((props, ref) => {
     setInputValue('');
     setIsLoading(true);
 
-    try {
-      const response = await apiService.askQuestion({
-        question: questionText
-      });
+    // 로딩 메시지를 스트리밍 응답으로 점진적으로 갱신
+    const updateBotMessage = (update: (msg: Message) => Message) => {
+      setMessages(prev => prev.map(msg => msg.id === loadingMessage.id ? update(msg) : msg));
+    };
 
-      setMessages(prev => {
-        const withoutLoading = prev.filter(msg => msg.id !== loadingMessage.id);
-        const botResponse: Message = {
-          id: (Date.now() + 2).toString(),
-          type: 'bot',
-          content: response.answer,
-          timestamp: new Date(),
-          sources: response.sources,
-        };
-        return [...withoutLoading, botResponse];
+    // 토큰 없이 스트림이 끝났을 때 로딩 표시를 대신할 안내 문구로 바꿈
+    let answer = '';
+    const finishBotMessage = () => {
+      updateBotMessage(msg => msg.isLoading
+        ? { ...msg, content: answer || '답변을 받지 못했습니다. 잠시 후 다시 시도해주세요.', isLoading: false }
+        : msg);
+    };
+
+    try {
+      await apiService.askQuestionStream({ question: questionText }, {
+        onSources: (data) => {
+          updateBotMessage(msg => ({ ...msg, sources: data.sources }));
+        },
+        onToken: (text) => {
+          answer += text;
+          updateBotMessage(msg => ({ ...msg, content: answer, isLoading: false, timestamp: new Date() }));
+        },
+        onDone: () => {
+          finishBotMessage();
+        },
+        onError: (errorText) => {
+          updateBotMessage(msg => ({ ...msg, content: errorText, isLoading: false, sources: undefined }));
+        },
       });
 
     } catch (error: any) {
@@ -105,6 +118,7 @@ const ChatBox = forwardRef<ChatBoxRef>((props, ref) => {
         return [...withoutLoading, errorMessage];
       });
     } finally {
+      finishBotMessage();
       setIsLoading(false);
     }
   };
@@ -171,7 +185,9 @@ const ChatBox = forwardRef<ChatBoxRef>((props, ref) => {
                             📄 {source.filename} (페이지 {source.page})
                           </div>
                           <div className="text-gray-600 mt-1">
-                            유사도: {(source.score * 100).toFixed(1)}%
+                            {source.retrieval_mode && source.retrieval_mode !== 'dense'
+                              ? `${source.retrieval_mode === 'hybrid' ? 'RRF' : 'BM25'} 점수: ${source.score.toFixed(3)}`
+                              : `유사도: ${(source.score * 100).toFixed(1)}%`}
                           </div>
                           <div className="text-gray-500 mt-1 text-xs">
                             {source.content_preview}
@@ -1,5 +1,20 @@
 import React, { useState, useRef } from 'react';
-import { apiService, UploadResponse } from '../lib/api';
+import { apiService, UploadResponse, IngestionStatus } from '../lib/api';
+
+// 처리 단계별 표시 문구
+const STAGE_LABELS: Record<IngestionStatus['stage'], string> = {
+  queued: '처리 대기 중',
+  extracting: '텍스트 추출 중',
+  embedding: '텍스트 추출 및 임베딩 생성 중',
+  indexing: '인덱스 저장 중',
+  completed: '처리 완료',
+  failed: '처리 실패',
+};
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+const STATUS_POLL_INTERVAL_MS = 1000;
+const STATUS_POLL_TIMEOUT_MS = 10 * 60 * 1000; // 처리 상태 확인을 포기하기까지의 시간
 
 interface UploadFormProps {
   onUploadSuccess?: (response: UploadResponse) => void;
@@ -10,6 +25,7 @@ const UploadForm: React.FC<UploadFormProps> = ({ onUploadSuccess, onUploadError
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
   const [isUploading, setIsUploading] = useState(false);
   const [uploadProgress, setUploadProgress] = useState(0);
+  const [uploadStage, setUploadStage] = useState('업로드 중...');
   const [dragOver, setDragOver] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
@@ -59,26 +75,41 @@ const UploadForm: React.FC<UploadFormProps> = ({ onUploadSuccess, onUploadError
 
     setIsUploading(true);
     setUploadProgress(0);
+    setUploadStage('업로드 중...');
 
     try {
-      // 프로그레스 시뮬레이션 (실제로는 axios에서 onUploadProgress 사용 가능)
-      const progressInterval = setInterval(() => {
-        setUploadProgress(prev => {
-          if (prev >= 90) {
-            clearInterval(progressInterval);
-            return 90;
-          }
-          return prev + 10;
-        });
-      }, 200);
-
       const response = await apiService.uploadPDF(selectedFile);
-      
-      clearInterval(progressInterval);
+
+      // 백그라운드 처리 진행 상황 폴링 (이미 처리된 동일 파일이면 바로 완료)
+      // 상태 조회 요청이 실패하면 예외로 폴링을 끝내고 오류를 표시
+      let status: IngestionStatus = { stage: response.status === 'completed' ? 'completed' : 'queued', percent: 0 };
+      const deadline = Date.now() + STATUS_POLL_TIMEOUT_MS;
+      while (status.stage !== 'completed' && status.stage !== 'failed') {
+        if (Date.now() > deadline) {
+          throw new Error('문서 처리가 너무 오래 걸리고 있습니다. 잠시 후 문서 목록에서 처리 상태를 확인해주세요.');
+        }
+
+        await sleep(STATUS_POLL_INTERVAL_MS);
+        const statusResponse = await apiService.getUploadStatus(response.doc_id);
+        if (!statusResponse.ingestion) {
+          throw new Error('문서 처리 상태를 확인할 수 없습니다.');
+        }
+        status = statusResponse.ingestion;
+
+        setUploadStage(STAGE_LABELS[status.stage] + (
+          status.stage === 'embedding' && status.total ? ` (${status.processed}/${status.total})` : ''
+        ));
+        setUploadProgress(Math.round(status.percent));
+      }
+
+      if (status.stage === 'failed') {
+        throw new Error(status.error || status.message || '파일 처리 중 오류가 발생했습니다.');
+      }
+
       setUploadProgress(100);
-      
+
       setTimeout(() => {
-        onUploadSuccess?.(response);
+        onUploadSuccess?.({ ...response, ...(status.result || {}) });
         setSelectedFile(null);
         setUploadProgress(0);
       }, 500);
@@ -182,7 +213,7 @@ const UploadForm: React.FC<UploadFormProps> = ({ onUploadSuccess, onUploadError
       {isUploading && (
         <div className="mt-4">
           <div className="flex justify-between text-sm text-gray-600 mb-1">
-            <span>업로드 중...</span>
+            <span>{uploadStage}</span>
             <span>{uploadProgress}%</span>
           </div>
           <div className="w-full bg-gray-200 rounded-full h-2">
@@ -42,14 +42,47 @@ export interface UploadResponse {
   doc_id: string;
   filename: string;
   file_size: number;
-  total_chunks: number;
-  total_pages: number;
-  embedding_dimension: number;
+  status?: IngestionStatus['stage'];
+  status_url?: string;
+  duplicate?: boolean;  // 동일한 파일이 이미 있어 기존 문서(doc_id)를 반환한 경우
+  // 처리 완료 후 채워지는 정보
+  total_chunks?: number;
+  total_pages?: number;
+  embedding_dimension?: number;
+}
+
+export interface IngestionStatus {
+  mode?: 'create' | 'update';
+  stage: 'queued' | 'extracting' | 'embedding' | 'indexing' | 'completed' | 'failed';
+  percent: number;
+  processed?: number;
+  total?: number;
+  message?: string;
+  error?: string | null;
+  result?: {
+    total_chunks: number;
+    total_pages: number;
+    embedding_dimension: number;
+    // 개정본 갱신(update) 작업에서만 제공
+    reused_chunks?: number;
+    embedded_chunks?: number;
+    removed_chunks?: number;
+  } | null;
+}
+
+export interface UploadStatusResponse {
+  doc_id: string;
+  filename?: string;
+  ingestion: IngestionStatus | null;
+  pdf_exists?: boolean;
+  vector_exists?: boolean;
+  metadata_exists?: boolean;
 }
 
 export interface QuestionRequest {
   question: string;
   top_k?: number;
+  retrieval_mode?: 'dense' | 'sparse' | 'hybrid';
 }
 
 export interface QuestionResponse {
@@ -59,11 +92,29 @@ export interface QuestionResponse {
     page: string | number;
     chunk_id: string | number;
     score: number;
+    retrieval_mode?: 'dense' | 'sparse' | 'hybrid';
     content_preview: string;
   }>;
   retrieved_chunks: number;
   question: string;
   error?: string;
+  usage?: QuestionUsage | null;
+}
+
+export interface QuestionUsage {
+  stages_ms: Record<string, number>;
+  prompt_chars?: number;
+  prompt_tokens_estimated?: number;
+  prompt_tokens?: number;
+  output_tokens?: number;
+  total_tokens?: number;
+}
+
+export interface QuestionStreamHandlers {
+  onSources?: (data: Pick<QuestionResponse, 'sources' | 'retrieved_chunks' | 'question'>) => void;
+  onToken?: (text: string) => void;
+  onDone?: (usage?: QuestionUsage) => void;
+  onError?: (error: string) => void;
 }
 
 export interface Document {
@@ -105,8 +156,22 @@ export const apiService = {
     return response.data;
   },
 
+  // 기존 문서를 개정된 PDF로 갱신 (바뀐 청크만 다시 임베딩)
+  async updatePDF(docId: string, file: File): Promise<UploadResponse> {
+    const formData = new FormData();
+    formData.append('file', file);
+    
+    const response = await api.put(`/upload/pdf/${docId}`, formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    });
+    
+    return response.data;
+  },
+
   // 업로드 상태 확인
-  async getUploadStatus(docId: string) {
+  async getUploadStatus(docId: string): Promise<UploadStatusResponse> {
     const response = await api.get(`/upload/status/${docId}`);
     return response.data;
   },
@@ -117,6 +182,55 @@ export const apiService = {
     return response.data;
   },
 
+  // 질문하기 (SSE 스트리밍) - POST 요청이므로 EventSource 대신 fetch 스트림을 직접 파싱
+  async askQuestionStream(request: QuestionRequest, handlers: QuestionStreamHandlers): Promise<void> {
+    const response = await fetch(`${API_BASE_URL}/ask/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Accept: 'text/event-stream',
+      },
+      body: JSON.stringify(request),
+    });
+
+    if (!response.ok || !response.body) {
+      const detail = await response.json().catch(() => null);
+      throw new Error(detail?.detail || `HTTP ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder('utf-8');
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+
+      // SSE 이벤트는 빈 줄로 구분됨
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        let eventName = 'message';
+        let dataText = '';
+        for (const line of rawEvent.split('\n')) {
+          if (line.startsWith('event:')) eventName = line.slice(6).trim();
+          else if (line.startsWith('data:')) dataText += line.slice(5).trim();
+        }
+        const data = dataText ? JSON.parse(dataText) : {};
+
+        if (eventName === 'sources') handlers.onSources?.(data);
+        else if (eventName === 'token') handlers.onToken?.(data.text);
+        else if (eventName === 'done') handlers.onDone?.(data.usage);
+        else if (eventName === 'error') handlers.onError?.(data.error);
+      }
+    }
+  },
+
   // 문서 검색 (답변 생성 없이)
   async searchDocuments(request: QuestionRequest) {
     const response = await api.post('/ask/search', request);
@@ -88,7 +88,7 @@ export default function Admin() {
   };
 
   const handleUploadSuccess = (response: UploadResponse) => {
-    showNotification('success', `${response.filename} 업로드 완료! (${response.total_chunks}개 청크 생성)`);
+    showNotification('success', `${response.filename} 업로드 완료! (${response.total_chunks ?? 0}개 청크 생성)`);
     loadData(); // 문서 목록 새로고침
   };
 